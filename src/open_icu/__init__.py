@@ -72,6 +72,7 @@ SOFTWARE.
 from open_icu.steps.concept.step import ConceptStep, concept_config_registry
 from open_icu.steps.extraction.step import ExtractionStep, dataset_config_registry
 from open_icu.steps.persistence.step import PersistenceStep
+from open_icu.steps.sharding.reader import ShardReader
 from open_icu.steps.sharding.step import ShardingStep, sharding_config_registry
 from open_icu.storage.project import OpenICUProject
 from open_icu.utils.loader import auto_load_configs
@@ -84,6 +85,7 @@ __all__ = [
     "ExtractionStep",
     "ConceptStep",
     "ShardingStep",
+    "ShardReader",
     "auto_load_configs",
     "dataset_config_registry",
     "concept_config_registry",
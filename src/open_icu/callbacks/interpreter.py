@@ -1,4 +1,5 @@
 import ast
+from functools import lru_cache
 from typing import Tuple
 
 from polars import LazyFrame
@@ -133,9 +134,34 @@ class ExprInterpreter(ast.NodeVisitor):
         raise ValueError(f"Unsupported syntax: {ast.dump(node)}")
 
 
+# Maximum number of distinct expression strings kept compiled.
+COMPILE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _compile_expr(expr: str, registry_version: int) -> AstValue:
+    return ExprInterpreter().eval(expr)
+
+
+def compile_expr(expr: str) -> AstValue:
+    """Compile an expression string into a reusable callback tree.
+
+    Compiled trees are memoized in a bounded LRU cache. Callbacks only bind to
+    a frame when called, so the same tree is shared by every frame the
+    expression is applied to. Registering or unregistering a callback
+    invalidates all previously compiled trees.
+
+    Args:
+        expr: Expression in the callback DSL, e.g. ``"col(subject_id)"``
+
+    Returns:
+        The compiled callback tree (or constant)
+    """
+    return _compile_expr(expr, registry.version)
+
+
 def parse_expr(lf: LazyFrame, expr: str) -> CallbackResult:
-    interpreter = ExprInterpreter()
-    callback = interpreter.eval(expr)
+    callback = compile_expr(expr)
 
     assert isinstance(callback, CallbackProtocol)
     pl_expr = callback(lf)
@@ -0,0 +1,223 @@
+"""Schema-propagating LazyFrame plan builder.
+
+Callbacks decide whether a string argument is a column or a literal by looking
+up the column names of the frame they are applied to. Resolving those names
+with ``LazyFrame.collect_schema`` re-analyses the whole plan, so resolving them
+after every ``with_columns`` makes planning quadratic in the number of
+expressions. The PlanBuilder carries the column names forward instead: each
+step derives them from the output names of the added expressions.
+
+The builder also keeps plans shallow. Consecutive ``with_columns`` calls are
+batched into a single node as long as no expression reads or overwrites a
+column produced earlier in the batch, and consecutive filters are combined
+into a single predicate.
+"""
+
+from collections.abc import Iterable
+
+import polars as pl
+from polars import LazyFrame
+
+from open_icu.callbacks.interpreter import compile_expr
+from open_icu.callbacks.proto import AstValue, CallbackProtocol, frame_columns, set_frame_columns
+
+
+def _output_names(exprs: Iterable[pl.Expr]) -> list[str] | None:
+    """Get the output column names of expressions, or None if they are not static."""
+    names = []
+    for expr in exprs:
+        try:
+            if expr.meta.has_multiple_outputs():
+                return None
+            names.append(expr.meta.output_name())
+        except pl.exceptions.ComputeError:
+            return None
+    return names
+
+
+class PlanBuilder:
+    """Immutable wrapper of a LazyFrame plan that tracks its column names.
+
+    Every operation returns a new builder. Column names are propagated from
+    the expressions where possible; after operations with a result that cannot
+    be derived statically (e.g. wildcard expressions or frame transformations)
+    they are resolved from Polars once, when they are first needed.
+
+    Column expressions and filters are not applied immediately but collected
+    into a pending ``with_columns`` batch followed by a pending filter:
+
+    - A column expression joins the batch unless it reads or writes a column
+      produced by the batch, or a filter is pending (its result may depend on
+      the rows, e.g. for window expressions). Otherwise the pending work is
+      applied first and a new batch is started.
+    - Filters are AND-combined into one predicate that is applied after the
+      batch.
+
+    Attributes:
+        lf: The LazyFrame plan built so far, including the pending work
+        columns: Names of the columns of the plan
+    """
+
+    def __init__(self, lf: LazyFrame, columns: Iterable[str] | None = None) -> None:
+        """Initialize the builder.
+
+        Args:
+            lf: The frame to build on
+            columns: Names of all columns of the frame, if known. Resolved from
+                the frame's schema when needed otherwise.
+        """
+        self._base = lf
+        self._pending_columns: tuple[pl.Expr, ...] = ()
+        self._pending_outputs: frozenset[str] = frozenset()
+        self._pending_filters: tuple[pl.Expr, ...] = ()
+        self._lf: LazyFrame | None = lf
+        self._columns = frozenset(columns) if columns is not None else None
+        if self._columns is not None:
+            set_frame_columns(lf, self._columns)
+
+    @classmethod
+    def _pending(
+        cls,
+        base: LazyFrame,
+        columns: frozenset[str] | None,
+        pending_columns: tuple[pl.Expr, ...],
+        pending_outputs: frozenset[str],
+        pending_filters: tuple[pl.Expr, ...] = (),
+    ) -> "PlanBuilder":
+        """Create a builder with pending work on top of a base frame."""
+        plan = cls.__new__(cls)
+        plan._base = base
+        plan._pending_columns = pending_columns
+        plan._pending_outputs = pending_outputs
+        plan._pending_filters = pending_filters
+        plan._lf = None
+        plan._columns = columns
+        return plan
+
+    def __repr__(self) -> str:
+        """Return string representation of the builder."""
+        return f"{self.__class__.__name__}(columns={sorted(self.columns)!r})"
+
+    @property
+    def lf(self) -> LazyFrame:
+        """Get the plan.
+
+        Returns:
+            The LazyFrame plan built so far, including the pending work
+        """
+        if self._lf is None:
+            lf = self._base
+            if self._pending_columns:
+                lf = lf.with_columns(*self._pending_columns)
+            if self._pending_filters:
+                lf = lf.filter(*self._pending_filters)
+            self._lf = lf
+            if self._columns is not None:
+                set_frame_columns(lf, self._columns)
+        return self._lf
+
+    @property
+    def columns(self) -> frozenset[str]:
+        """Get the column names of the plan.
+
+        Returns:
+            Names of all columns of the plan
+        """
+        if self._columns is None:
+            self._columns = frame_columns(self.lf)
+        return self._columns
+
+    def flush(self) -> "PlanBuilder":
+        """Apply the pending work.
+
+        Use this before building several plans on top of a shared plan, so the
+        shared part is a common subplan of all of them.
+
+        Returns:
+            Builder of the same plan without pending work
+        """
+        if not self._pending_columns and not self._pending_filters:
+            return self
+        return PlanBuilder(self.lf, self._columns)
+
+    def parse(self, expr: str) -> AstValue:
+        """Evaluate a callback expression against the plan.
+
+        Args:
+            expr: Expression in the callback DSL
+
+        Returns:
+            The result of the callback, usually a Polars expression or, for
+            frame transformations, a LazyFrame
+        """
+        callback = compile_expr(expr)
+
+        assert isinstance(callback, CallbackProtocol)
+        if self._columns is None:
+            # Resolve on the builder, so that derived builders inherit the names.
+            self._columns = frame_columns(self.lf)
+        return callback(self.lf)
+
+    def with_columns(self, *exprs: pl.Expr) -> "PlanBuilder":
+        """Add or replace columns.
+
+        Args:
+            *exprs: Expressions producing the columns
+
+        Returns:
+            Builder of the extended plan
+        """
+        names = _output_names(exprs)
+        if names is None or len(set(names)) < len(names):
+            return PlanBuilder(self.lf.with_columns(*exprs))
+
+        columns = self._columns.union(names) if self._columns is not None else None
+        reads = {name for expr in exprs for name in expr.meta.root_names()}
+        if self._pending_filters or not self._pending_outputs.isdisjoint(reads.union(names)):
+            return self._pending(self.lf, columns, exprs, frozenset(names))
+
+        return self._pending(
+            self._base,
+            columns,
+            self._pending_columns + exprs,
+            self._pending_outputs.union(names),
+        )
+
+    def filter(self, *predicates: pl.Expr) -> "PlanBuilder":
+        """Filter rows.
+
+        Args:
+            *predicates: Predicates that must all hold
+
+        Returns:
+            Builder of the filtered plan
+        """
+        return self._pending(
+            self._base,
+            self._columns,
+            self._pending_columns,
+            self._pending_outputs,
+            self._pending_filters + predicates,
+        )
+
+    def select(self, *exprs: pl.Expr) -> "PlanBuilder":
+        """Select columns.
+
+        Args:
+            *exprs: Expressions producing the selected columns
+
+        Returns:
+            Builder of the projected plan
+        """
+        return PlanBuilder(self.lf.select(*exprs), _output_names(exprs))
+
+    def pipe(self, lf: LazyFrame) -> "PlanBuilder":
+        """Continue with a frame derived from the plan, e.g. by a transformation.
+
+        Args:
+            lf: The derived frame, whose columns are resolved when needed
+
+        Returns:
+            Builder of the derived frame
+        """
+        return PlanBuilder(lf)
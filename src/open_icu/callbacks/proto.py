@@ -1,3 +1,5 @@
+import weakref
+from collections.abc import Iterable
 from typing import Any, Protocol, Union, runtime_checkable
 
 import polars as pl
@@ -15,11 +17,48 @@ class CallbackProtocol(Protocol):
     def __call__(self, lf: LazyFrame) -> CallbackResult: ...
 
 
+# Column names of frames whose schema is known, keyed by ``id(frame)``. Entries
+# are removed when the frame is garbage collected.
+_frame_columns: dict[int, frozenset[str]] = {}
+
+
+def set_frame_columns(lf: LazyFrame, columns: Iterable[str]) -> None:
+    """Record the column names of a frame, so they need not be resolved by Polars.
+
+    Args:
+        lf: The frame
+        columns: Names of all columns of the frame
+    """
+    key = id(lf)
+    if key not in _frame_columns:
+        weakref.finalize(lf, _frame_columns.pop, key, None)
+    _frame_columns[key] = frozenset(columns)
+
+
+def frame_columns(lf: LazyFrame) -> frozenset[str]:
+    """Get the column names of a frame.
+
+    Uses the names recorded with :func:`set_frame_columns`. Otherwise the schema
+    is resolved once and recorded for later lookups on the same frame.
+
+    Args:
+        lf: The frame
+
+    Returns:
+        Names of all columns of the frame
+    """
+    columns = _frame_columns.get(id(lf))
+    if columns is None:
+        columns = frozenset(lf.collect_schema().names())
+        set_frame_columns(lf, columns)
+    return columns
+
+
 def to_expr(lf: LazyFrame, value: AstValue) -> pl.Expr:
     if isinstance(value, pl.Expr):
         return value
 
-    if isinstance(value, str) and value in lf.collect_schema():
+    if isinstance(value, str) and value in frame_columns(lf):
         return pl.col(value)
 
     if isinstance(value, (int, float, bool, str)) or value is None:
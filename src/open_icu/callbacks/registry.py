@@ -11,6 +11,7 @@ class CallbackRegistry:
     def __init__(self) -> None:
         """Initialize the registry storage."""
         self._registry: dict[str, type[CallbackProtocol]] = {}
+        self._version = 0
 
     def __len__(self) -> int:
         """Return the number of registered items."""
@@ -24,6 +25,11 @@ class CallbackRegistry:
         """Return string representation of the registry."""
         return f"{self.__class__.__name__}(entries={len(self._registry)})"
 
+    @property
+    def version(self) -> int:
+        """Counter incremented on every change, used to invalidate compiled expressions."""
+        return self._version
+
     def register(self, key: str, value: type[CallbackProtocol], overwrite: bool = False) -> None:
         """Register a callbacks object.
 
@@ -34,6 +40,7 @@ class CallbackRegistry:
         """
         if overwrite or key not in self._registry:
             self._registry[key] = value
+            self._version += 1
 
     def unregister(self, key: str) -> bool:
         """Remove a callbacks by key.
@@ -46,6 +53,7 @@ class CallbackRegistry:
         """
         if key in self._registry:
             del self._registry[key]
+            self._version += 1
             return True
         return False
 
@@ -87,6 +95,7 @@ class CallbackRegistry:
     def clear(self) -> None:
         """Remove all entries from the registry."""
         self._registry.clear()
+        self._version += 1
 
 
 registry = CallbackRegistry()
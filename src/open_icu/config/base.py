@@ -7,11 +7,11 @@ and YAML serialization capabilities.
 
 from abc import ABCMeta
 from pathlib import Path
-from typing import ClassVar, Self
+from typing import Any, ClassVar, Self
 from uuid import NAMESPACE_DNS, UUID, uuid5
 
 import yaml
-from pydantic import BaseModel, Field, computed_field
+from pydantic import BaseModel, Field, PrivateAttr, computed_field
 
 
 class BaseConfig(BaseModel, metaclass=ABCMeta):
@@ -21,6 +21,11 @@ class BaseConfig(BaseModel, metaclass=ABCMeta):
     along with methods for loading from and saving to YAML files. All
     configuration classes should inherit from this base class.
 
+    The identifier, its components and the UUID are computed once per
+    instance and cached. Assigning a field or copying the configuration with
+    updated fields recomputes them. Subclasses define the identifier
+    components by overriding :meth:`_identifier_components`.
+
     Attributes:
         name: Human-readable name of the configuration
         version: Version string for the configuration
@@ -34,9 +39,51 @@ class BaseConfig(BaseModel, metaclass=ABCMeta):
     name: str = Field(..., description="Name of the configuration.")
     version: str = Field(..., description="Version of the configuration.")
 
+    _identity: tuple[tuple[str, ...], str, UUID] | None = PrivateAttr(default=None)
+
     def __str__(self) -> str:
         return self.identifier
 
+    def model_post_init(self, context: Any, /) -> None:
+        """Compute the cached identity of the configuration."""
+        self._identity = self._compute_identity()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._identity = self._compute_identity()
+
+    def model_copy(self, *, update: dict[str, Any] | None = None, deep: bool = False) -> Self:
+        """Copy the configuration, see :meth:`pydantic.BaseModel.model_copy`.
+
+        The cached identity of the copy is recomputed if fields are updated.
+        """
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            copied._identity = copied._compute_identity()
+        return copied
+
+    def _identifier_components(self) -> tuple[str, ...]:
+        """Get the components used to build the identifier.
+
+        Returns:
+            Tuple of (class_name, name, version)
+        """
+        return self.__open_icu_config_type__, self.name, self.version
+
+    def _compute_identity(self) -> tuple[tuple[str, ...], str, UUID]:
+        """Compute the identifier components, identifier and UUID."""
+        components = self._identifier_components()
+        identifier = self.build_identifier(components)
+        return components, identifier, uuid5(NAMESPACE_DNS, identifier)
+
+    def _cached_identity(self) -> tuple[tuple[str, ...], str, UUID]:
+        """Get the cached identifier components, identifier and UUID."""
+        identity = getattr(self, "_identity", None)
+        if identity is None:
+            identity = self._identity = self._compute_identity()
+        return identity
+
     @computed_field
     @property
     def config_type(self) -> str:
@@ -58,7 +105,7 @@ class BaseConfig(BaseModel, metaclass=ABCMeta):
         Returns:
             A dot-separated hierarchical identifier string
         """
-        return self.build_identifier(self.identifier_tuple)
+        return self._cached_identity()[1]
 
     @computed_field
     @property
@@ -68,7 +115,7 @@ class BaseConfig(BaseModel, metaclass=ABCMeta):
         Returns:
             Tuple of (class_name, version, name)
         """
-        return self.__open_icu_config_type__, self.name, self.version
+        return self._cached_identity()[0]
 
     @computed_field
     @property
@@ -81,7 +128,7 @@ class BaseConfig(BaseModel, metaclass=ABCMeta):
         Returns:
             A UUID uniquely identifying this configuration
         """
-        return uuid5(NAMESPACE_DNS, self.identifier)
+        return self._cached_identity()[2]
 
     @classmethod
     def build_identifier(cls, t: tuple[str, ...]) -> str:
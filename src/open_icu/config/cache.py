@@ -0,0 +1,202 @@
+"""Persistent cache of loaded configurations.
+
+Loading the configurations of a directory parses every YAML file, resolves the
+version inheritance chain and validates the resulting models. The ConfigCache
+stores the validated configurations of a source on disk, so that a later
+process (e.g. the next pipeline run) deserializes them instead of loading the
+YAML files again.
+
+Entries are keyed by a fingerprint of every file contributing to the source,
+including the ``extends.yml`` markers of its inheritance chain, and of the
+configuration model, including the source code of the packages defining it.
+Changing, adding or removing any of these files, or changing the model or its
+code (e.g. a validator), results in a different key, so outdated entries are
+never read.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+from functools import cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from uuid import uuid4
+
+import pydantic
+
+from open_icu.config.base import BaseConfig
+from open_icu.logging import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_DIR_ENV = "OPEN_ICU_CACHE_DIR"
+"""Environment variable overriding the default cache directory."""
+
+
+def default_cache_path() -> Path:
+    """Get the default directory of the configuration cache.
+
+    Returns:
+        ``$OPEN_ICU_CACHE_DIR/configs`` if set, otherwise ``configs`` in the
+        user cache directory (``$XDG_CACHE_HOME/open_icu`` or
+        ``~/.cache/open_icu``)
+    """
+    if cache_dir := os.environ.get(CACHE_DIR_ENV):
+        return Path(cache_dir) / "configs"
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "open_icu" / "configs"
+
+
+@cache
+def _source_hash(package: str) -> str | None:
+    """Hash of the Python source files of an imported package or module."""
+    module = sys.modules.get(package)
+    module_file = getattr(module, "__file__", None)
+    if module_file is None:
+        return None
+
+    root = Path(module_file).parent
+    source_files = sorted(root.rglob("*.py")) if hasattr(module, "__path__") else [Path(module_file)]
+
+    digest = hashlib.sha256()
+    for source_file in source_files:
+        digest.update(f"{source_file.relative_to(root)}\0".encode())
+        digest.update(source_file.read_bytes())
+    return digest.hexdigest()
+
+
+@cache
+def _model_fingerprint(config_type: type[BaseConfig]) -> str:
+    """Fingerprint of a configuration model, its code and the libraries deserializing it.
+
+    Validators change the loaded configurations without changing the schema,
+    so the source code of every package defining a class of the model's
+    hierarchy is part of the fingerprint.
+    """
+    try:
+        package_version = version("open-icu")
+    except PackageNotFoundError:
+        package_version = "unknown"
+
+    schema = config_type.model_json_schema()
+    packages = {cls.__module__.split(".")[0] for cls in config_type.__mro__ if issubclass(cls, BaseConfig)}
+    return json.dumps(
+        {
+            "type": f"{config_type.__module__}.{config_type.__qualname__}",
+            "open_icu": package_version,
+            "pydantic": pydantic.VERSION,
+            "schema": schema,
+            "private": sorted(config_type.__private_attributes__),
+            "sources": {package: _source_hash(package) for package in sorted(packages)},
+        },
+        sort_keys=True,
+    )
+
+
+class ConfigCache:
+    """On-disk cache of the configurations loaded from a source.
+
+    Directory structure:
+        <source hash>-<fingerprint hash>.pickle
+
+    Entries of a source whose fingerprint changed are removed when the source
+    is cached again.
+
+    Attributes:
+        path: Directory of the cache entries
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        """Initialize the cache.
+
+        Args:
+            path: Directory of the cache entries. Defaults to
+                :func:`default_cache_path`.
+        """
+        self.path = path if path is not None else default_cache_path()
+
+    def __repr__(self) -> str:
+        """Return string representation of the cache."""
+        return f"{self.__class__.__name__}(path={self.path!r})"
+
+    @staticmethod
+    def key(config_type: type[BaseConfig], source: str, files: list[Path]) -> str:
+        """Build the key of a cache entry.
+
+        Args:
+            config_type: The configuration class of the entry
+            source: Description of the source, e.g. its class and directories
+            files: All files contributing to the source
+
+        Returns:
+            Hash of the source, followed by a hash of the model fingerprint
+            and the resolved path, size and modification time of every file
+        """
+        digest = hashlib.sha256()
+        digest.update(_model_fingerprint(config_type).encode())
+        for file in files:
+            stat = file.stat()
+            digest.update(f"{file.resolve()}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+        source_hash = hashlib.sha256(source.encode()).hexdigest()[:16]
+        return f"{source_hash}-{digest.hexdigest()}"
+
+    def get[T: BaseConfig](self, key: str) -> list[T] | None:
+        """Read the configurations of a cache entry.
+
+        Args:
+            key: Key of the entry
+
+        Returns:
+            The cached configurations, or None on a cache miss or if the entry
+            cannot be read
+        """
+        entry = self.path / f"{key}.pickle"
+        if not entry.is_file():
+            return None
+
+        try:
+            with open(entry, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            logger.warning("Removing unreadable configuration cache entry %s", entry)
+            entry.unlink(missing_ok=True)
+            return None
+
+    def put(self, key: str, configs: list[BaseConfig]) -> None:
+        """Store configurations in a cache entry.
+
+        The entry is written to a temporary file first and moved into place, so
+        concurrent writers never expose a partially written entry. Entries of
+        an outdated version of the source are removed. Failures to write are
+        logged and ignored.
+
+        Args:
+            key: Key of the entry
+            configs: The configurations to store
+        """
+        entry = self.path / f"{key}.pickle"
+        tmp_entry = entry.with_suffix(f".{uuid4().hex}.tmp")
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            with open(tmp_entry, "wb") as f:
+                pickle.dump(configs, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_entry, entry)
+        except OSError as e:
+            logger.warning("Failed to write configuration cache entry %s: %s", entry, e)
+            tmp_entry.unlink(missing_ok=True)
+            return
+
+        logger.debug("Cached %d configuration(s) in %s", len(configs), entry)
+        source_hash = key.split("-", 1)[0]
+        for stale in self.path.glob(f"{source_hash}-*.pickle"):
+            if stale != entry:
+                logger.debug("Removing outdated configuration cache entry %s", stale)
+                stale.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove all cache entries."""
+        for entry in self.path.glob("*.pickle"):
+            entry.unlink(missing_ok=True)
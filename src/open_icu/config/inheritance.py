@@ -159,3 +159,28 @@ def resolve_effective_configs(subdir: Path) -> dict[str, dict[str, Any]]:
             effective[name] = data
 
     return effective
+
+
+def resolve_config_files(subdir: Path) -> list[Path]:
+    """Resolve all files contributing to the configurations of a directory.
+
+    Args:
+        subdir: A config directory, usually a subdirectory of a version
+            directory (e.g. ``.../<dataset>/<version>/tables``)
+
+    Returns:
+        The sorted files of the directory or, if the version directory has an
+        ``extends.yml`` marker, the markers and the files of the equally-named
+        subdirectories across the version chain (base first)
+    """
+    if not has_extends(subdir):
+        return sorted(file for file in subdir.rglob("*") if file.is_file()) if subdir.is_dir() else []
+
+    files = []
+    for version_dir in resolve_version_chain(subdir.parent):
+        if (marker := version_dir / EXTENDS_FILE).is_file():
+            files.append(marker)
+        directory = version_dir / subdir.name
+        if directory.is_dir():
+            files.extend(sorted(file for file in directory.rglob("*") if file.is_file()))
+    return files
@@ -3,6 +3,12 @@
 This module provides a generic registry class for storing, retrieving,
 and persisting configuration objects, with support for loading from
 and saving to YAML files.
+
+Configuration directories can also be added to a registry as sources that are
+loaded on demand: a source is only read when the registry is queried for
+configurations within its scope (e.g. the tables of one dataset version).
+Sources with a ConfigCache store the loaded configurations on disk, so later
+processes skip parsing and validating the YAML files.
 """
 
 from abc import ABC
@@ -12,13 +18,104 @@ from typing import cast
 from pydantic import ValidationError
 
 from open_icu.config.base import BaseConfig
-from open_icu.config.inheritance import has_extends, resolve_effective_configs
+from open_icu.config.cache import ConfigCache
+from open_icu.config.inheritance import has_extends, resolve_config_files, resolve_effective_configs
 from open_icu.logging import get_logger
 from open_icu.utils.type import get_generic_type
 
 logger = get_logger(__name__)
 
 
+class ConfigSource[T: BaseConfig]:
+    """A directory of configurations that is loaded on demand.
+
+    Attributes:
+        scope: Leading identifier components (after the configuration type)
+            shared by all configurations of the source, e.g. ``(dataset,
+            version)`` for table configurations. An empty scope matches every
+            query.
+        path: Directory the configurations are loaded from
+        cache: Cache of the loaded configurations. Without a cache, the
+            configurations are read from the YAML files on every load.
+    """
+
+    def __init__(self, scope: tuple[str, ...], path: Path, cache: ConfigCache | None = None) -> None:
+        """Initialize the source.
+
+        Args:
+            scope: Leading identifier components of the configurations
+            path: Directory the configurations are loaded from
+            cache: Cache of the loaded configurations
+        """
+        self.scope = tuple(part.lower() for part in scope)
+        self.path = path
+        self.cache = cache
+
+    def __repr__(self) -> str:
+        """Return string representation of the source."""
+        return f"{self.__class__.__name__}(scope={self.scope!r}, path={self.path!r})"
+
+    def matches(self, scope: tuple[str, ...]) -> bool:
+        """Check whether the source may hold configurations within a scope.
+
+        Scopes are compared as dot-separated strings, since components such as
+        versions may contain dots themselves.
+
+        Args:
+            scope: Leading identifier components of a query
+
+        Returns:
+            True if one of both scopes is a prefix of the other
+        """
+        own, other = ".".join(self.scope), ".".join(scope).lower()
+        if not own or not other or own == other:
+            return True
+        return own.startswith(f"{other}.") or other.startswith(f"{own}.")
+
+    def files(self) -> list[Path]:
+        """Get all files contributing to the configurations of the source.
+
+        Returns:
+            The files of the source directory and, for a version subdirectory
+            with an inheritance chain, the ``extends.yml`` markers and files of
+            the equally-named subdirectories of all base versions
+        """
+        return resolve_config_files(self.path)
+
+    def read(self, config_type: type[T]) -> list[T]:
+        """Read the configurations from the YAML files of the source.
+
+        Args:
+            config_type: The configuration class to instantiate
+
+        Returns:
+            List of successfully loaded configuration objects
+        """
+        return load_configs(self.path, config_type)
+
+    def load(self, config_type: type[T]) -> list[T]:
+        """Load the configurations of the source, through the cache if set.
+
+        Args:
+            config_type: The configuration class to instantiate
+
+        Returns:
+            List of successfully loaded configuration objects
+        """
+        if self.cache is None:
+            return self.read(config_type)
+
+        key = self.cache.key(config_type, repr(self), self.files())
+        configs = self.cache.get(key)
+        if configs is not None:
+            logger.debug("Loaded configuration source %r from cache", self)
+            return configs
+
+        configs = self.read(config_type)
+        self.cache.put(key, configs)
+        return configs
+
+
 class BaseConfigRegistry[T: BaseConfig](ABC):
     """Generic registry for configuration objects.
 
@@ -26,6 +123,12 @@ class BaseConfigRegistry[T: BaseConfig](ABC):
     Provides methods for registration, retrieval, and batch loading/saving
     from/to YAML files.
 
+    Sources added with :meth:`add_source` are loaded when the registry is
+    first queried within their scope: looking up or filtering by identifier
+    components only loads the matching sources, while listing all
+    configurations loads all of them. Configurations loaded from a source
+    never replace configurations that are already registered.
+
     Type Parameters:
         T: The type of configuration objects to store (must inherit from BaseConfig)
     """
@@ -33,14 +136,17 @@ class BaseConfigRegistry[T: BaseConfig](ABC):
     def __init__(self) -> None:
         """Initialize the registry storage."""
         self._registry: dict[str, T] = {}
+        self._index: dict[tuple[str, ...], dict[str, T]] = {}
+        self._sources: list[ConfigSource[T]] = []
 
     def __len__(self) -> int:
         """Return the number of registered items."""
+        self._load_sources()
         return len(self._registry)
 
     def __contains__(self, identifiers: tuple[str, ...] | str) -> bool:
         """Check if key exists using 'in' operator."""
-        return self.get_identifier(identifiers) in self._registry
+        return self.get(identifiers) is not None
 
     def __repr__(self) -> str:
         """Return string representation of the registry."""
@@ -69,6 +175,95 @@ class BaseConfigRegistry[T: BaseConfig](ABC):
             return self._config_type.ensure_prefix(identifiers)
         return self._config_type.build_identifier(identifiers)
 
+    @property
+    def sources(self) -> list[ConfigSource[T]]:
+        """Get the sources that have not been loaded yet.
+
+        Returns:
+            List of pending sources
+        """
+        return list(self._sources)
+
+    def add_source(self, source: ConfigSource[T]) -> None:
+        """Add a source of configurations that is loaded on demand.
+
+        Args:
+            source: The source to add
+        """
+        logger.debug("Adding configuration source %r", source)
+        self._sources.append(source)
+
+    def load_scope(self, *scope: str) -> None:
+        """Load all pending sources that may hold configurations within a scope.
+
+        Args:
+            *scope: Leading identifier components (after the configuration
+                type), e.g. dataset and version. Loads all sources if empty.
+        """
+        self._load_sources(scope)
+
+    def _query_scope(self, identifier: str) -> tuple[str, ...]:
+        """Get the scope of the sources that may hold a configuration.
+
+        Args:
+            identifier: Full identifier of the configuration
+
+        Returns:
+            The part of the identifier after the configuration type
+        """
+        prefix = self._config_type.prefix()
+        return (identifier.removeprefix(prefix).lstrip("."),)
+
+    def _load_sources(self, scope: tuple[str, ...] = ()) -> None:
+        """Load the pending sources matching a scope."""
+        matching = [source for source in self._sources if source.matches(scope)]
+        if not matching:
+            return
+
+        self._sources = [source for source in self._sources if source not in matching]
+        for source in matching:
+            logger.debug("Loading configuration source %r", source)
+            self._load_source(source)
+
+    def _load_source(self, source: ConfigSource[T]) -> None:
+        """Load a source and register its configurations."""
+        for config in source.load(self._config_type):
+            self._register_loaded(config)
+
+    def _register_loaded(self, config: T) -> None:
+        """Register a configuration loaded from a source, unless it is already registered."""
+        if config.identifier not in self._registry:
+            logger.debug("Loaded configuration: %s", config.identifier)
+            self._store(config)
+
+    @staticmethod
+    def _components(config: T) -> tuple[str, ...]:
+        """Get the identifier components of a configuration after its type."""
+        return tuple(part.lower() for part in config.identifier_tuple[1:])
+
+    def _store(self, config: T) -> None:
+        """Store a configuration and index it by every prefix of its identifier components."""
+        previous = self._registry.get(config.identifier)
+        if previous is not None and self._components(previous) != self._components(config):
+            self._discard(previous)
+
+        self._registry[config.identifier] = config
+        components = self._components(config)
+        for n in range(1, len(components) + 1):
+            self._index.setdefault(components[:n], {})[config.identifier] = config
+
+    def _discard(self, config: T) -> None:
+        """Remove a configuration from the store and the index."""
+        self._registry.pop(config.identifier, None)
+        components = self._components(config)
+        for n in range(1, len(components) + 1):
+            entries = self._index.get(components[:n])
+            if entries is None:
+                continue
+            entries.pop(config.identifier, None)
+            if not entries:
+                del self._index[components[:n]]
+
     def register(self, value: T, overwrite: bool = False) -> None:
         """Register a configuration object.
 
@@ -78,7 +273,7 @@ class BaseConfigRegistry[T: BaseConfig](ABC):
         """
         if overwrite or value.identifier not in self._registry:
             logger.info("Loaded configuration: %s", value.identifier)
-            self._registry[value.identifier] = value
+            self._store(value)
 
     def unregister(self, identifiers: tuple[str, ...] | str) -> bool:
         """Remove a configuration by identifier.
@@ -90,8 +285,9 @@ class BaseConfigRegistry[T: BaseConfig](ABC):
             True if the configuration was removed, False if not found
         """
         identifier = self.get_identifier(identifiers)
+        self._load_sources(self._query_scope(identifier))
         if identifier in self._registry:
-            del self._registry[identifier]
+            self._discard(self._registry[identifier])
             return True
         return False
 
@@ -106,6 +302,8 @@ class BaseConfigRegistry[T: BaseConfig](ABC):
             The configuration object or default if not found
         """
         identifier = self.get_identifier(identifiers)
+        if identifier not in self._registry:
+            self._load_sources(self._query_scope(identifier))
         return self._registry.get(identifier, default)
 
     def keys(self) -> list[str]:
@@ -114,6 +312,7 @@ class BaseConfigRegistry[T: BaseConfig](ABC):
         Returns:
             List of configuration identifier strings
         """
+        self._load_sources()
         return list(self._registry.keys())
 
     def values(self) -> list[T]:
@@ -122,6 +321,7 @@ class BaseConfigRegistry[T: BaseConfig](ABC):
         Returns:
             List of configuration instances
         """
+        self._load_sources()
         return list(self._registry.values())
 
     def items(self) -> list[tuple[str, T]]:
@@ -130,11 +330,14 @@ class BaseConfigRegistry[T: BaseConfig](ABC):
         Returns:
             List of (identifier, configuration) tuples
         """
+        self._load_sources()
         return list(self._registry.items())
 
     def clear(self) -> None:
-        """Remove all entries from the registry."""
+        """Remove all entries and pending sources from the registry."""
         self._registry.clear()
+        self._index.clear()
+        self._sources.clear()
 
     def load(
         self,
@@ -173,7 +376,8 @@ class BaseConfigRegistry[T: BaseConfig](ABC):
         """Save all registered configurations to YAML files.
 
         Creates a directory hierarchy under path and saves each configuration
-        to a separate YAML file based on its identifier components.
+        to a separate YAML file based on its identifier components. Pending
+        sources are not loaded, so only the configurations in use are saved.
 
         Args:
             path: Base directory path for saving configurations
@@ -192,29 +396,30 @@ class BaseConfigRegistry[T: BaseConfig](ABC):
     ) -> list[T]:
         """Filter configurations by identifier components.
 
+        Looks up the configurations whose leading identifier components (after
+        the configuration type) equal the given components, e.g. dataset and
+        version for table configurations. Components are compared exactly,
+        so ``filter("mimic-iv")`` does not match ``mimic-iv-demo``.
+
         Args:
-            *args: Identifier components to filter by (e.g., class_name, version, name)
+            *args: Leading identifier components to filter by (e.g., dataset, version, name)
             includes: If specified, only include configurations with these identifiers
             excludes: If specified, skip configurations with these identifiers
 
         Returns:
             List of configuration objects matching the filter criteria
         """
-        term = self.get_identifier(".".join(args))
-        _excludes = [self.get_identifier(id) for id in excludes or []]
-        _includes = [self.get_identifier(id) for id in includes or []]
-
-        filtered_configs = []
-        for config in self._registry.values():
-            if term not in config.identifier:
-                continue
-
-            if (_excludes and config.identifier in _excludes) or (_includes and config.identifier not in _includes):
-                continue
-
-            filtered_configs.append(config)
-
-        return filtered_configs
+        self._load_sources(self._query_scope(self.get_identifier(".".join(args))))
+        prefix = tuple(arg.lower() for arg in args)
+        candidates = self._index.get(prefix, {}) if prefix else self._registry
+        _excludes = {self.get_identifier(id) for id in excludes or []}
+        _includes = {self.get_identifier(id) for id in includes or []}
+
+        return [
+            config
+            for identifier, config in candidates.items()
+            if identifier not in _excludes and (not _includes or identifier in _includes)
+        ]
 
 
 def load_configs[T: BaseConfig](
@@ -6,8 +6,10 @@ settings.
 """
 
 from abc import ABCMeta
+from pathlib import Path
 
-from pydantic import BaseModel, Field
+import polars as pl
+from pydantic import BaseModel, ByteSize, Field
 
 from open_icu.config.base import BaseConfig
 
@@ -28,6 +30,62 @@ class DatasetConfig(BaseModel):
     )
 
 
+class ExecutionConfig(BaseModel):
+    """Configuration for running independent units of a step in parallel.
+
+    Attributes:
+        jobs: Number of worker processes. ``1`` runs everything sequentially
+            in the current process.
+        threads_per_job: Size of the Polars thread pool of each worker
+        memory_budget: Upper bound for the summed estimated memory of all
+            concurrently running tasks
+        memory_factor: Estimated peak memory of a task as a multiple of the
+            size of its source files on disk
+    """
+
+    jobs: int = Field(default=1, ge=1, description="Number of worker processes.")
+    threads_per_job: int | None = Field(
+        default=None,
+        ge=1,
+        description="Number of Polars threads per worker process. Defaults to the Polars default.",
+    )
+    memory_budget: ByteSize | None = Field(
+        default=None,
+        description="Global memory budget shared by all workers (e.g. '32GB'). Unlimited if not set.",
+    )
+    memory_factor: float = Field(
+        default=4.0,
+        gt=0,
+        description="Estimated peak memory of a task relative to the on-disk size of its sources.",
+    )
+
+
+class CohortConfig(BaseModel):
+    """Configuration of the subjects a step is restricted to.
+
+    Subjects can be listed explicitly, read from the ``subject_id`` column of a
+    Parquet file, or both, in which case the cohort is their union.
+
+    Attributes:
+        subjects: Subject IDs of the cohort
+        path: Parquet file with a ``subject_id`` column listing the cohort
+    """
+
+    subjects: list[int] = Field(default_factory=list, description="Subject IDs of the cohort.")
+    path: Path | None = Field(None, description="Parquet file with a subject_id column listing the cohort.")
+
+    def subject_ids(self) -> list[int]:
+        """Resolve the subject IDs of the cohort.
+
+        Returns:
+            Sorted, unique subject IDs
+        """
+        subject_ids = set(self.subjects)
+        if self.path is not None:
+            subject_ids.update(pl.read_parquet(self.path, columns=["subject_id"])["subject_id"].cast(pl.Int64))
+        return sorted(subject_ids)
+
+
 class BaseStepConfig[T: BaseModel](BaseConfig, metaclass=ABCMeta):
     """Abstract base configuration for processing steps.
 
@@ -41,6 +99,8 @@ class BaseStepConfig[T: BaseModel](BaseConfig, metaclass=ABCMeta):
         overwrite: Whether to overwrite existing workspace and dataset directories
         config: Step-specific configuration object
         dataset: Dataset metadata configuration
+        cohort: Subjects the step is restricted to. Processes all subjects if
+            not set.
     """
 
     overwrite: bool = Field(False, description="Whether to overwrite the workspace dir if it already exists.")
@@ -49,3 +109,7 @@ class BaseStepConfig[T: BaseModel](BaseConfig, metaclass=ABCMeta):
         default_factory=DatasetConfig,
         description="Configuration for the dataset produced by the step.",
     )
+    cohort: CohortConfig | None = Field(
+        None,
+        description="Subjects the step is restricted to. All subjects are processed if not set.",
+    )
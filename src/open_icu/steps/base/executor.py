@@ -0,0 +1,254 @@
+"""Process-based task execution for processing steps.
+
+This module provides a small scheduler that runs units of work of a step (e.g.
+the tables of the extraction step) in worker processes. Each task carries an
+estimated memory cost, and tasks are only started while the sum of the costs of
+the running tasks stays within the configured memory budget. Tasks may depend on
+each other (e.g. derived concepts on their input concepts), in which case a task
+is started once its dependencies have finished.
+"""
+
+import logging
+import multiprocessing
+import os
+import pickle
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from graphlib import TopologicalSorter
+from typing import Any
+
+from open_icu.logging import LOGGER_NAME, configure_logging, get_logger
+from open_icu.steps.base.config import ExecutionConfig
+from open_icu.utils.process import WORKER_ENV
+
+logger = get_logger(__name__)
+
+# Environment variable read by Polars on import to size its thread pool.
+POLARS_MAX_THREADS = "POLARS_MAX_THREADS"
+
+# State shared by all tasks of a worker process, set once by the pool initializer.
+_worker_state: Any = None
+
+
+class Task:
+    """A unit of work that can be scheduled by :func:`run_tasks`.
+
+    Attributes:
+        key: Identifier of the task, used for logging
+        args: Positional arguments passed to the task function
+        cost: Estimated peak memory of the task in bytes
+    """
+
+    def __init__(self, key: Hashable, args: tuple[Any, ...], cost: int = 0) -> None:
+        self.key = key
+        self.args = args
+        self.cost = cost
+
+    def __repr__(self) -> str:
+        """Return string representation of the task."""
+        return f"{self.__class__.__name__}(key={self.key!r}, cost={self.cost})"
+
+
+def _init_worker(state: bytes, log_level: int) -> None:
+    """Initialize a worker process with the shared state and log level."""
+    global _worker_state
+
+    configure_logging(level=logging.getLevelName(log_level))
+    _worker_state = pickle.loads(state)
+
+
+def _run_in_worker(func: Callable[..., Any], args: tuple[Any, ...]) -> Any:
+    """Run a task function with the state of the current worker process."""
+    return func(_worker_state, *args)
+
+
+def _select_task(pending: list[Task], available: int | None, running: int) -> Task | None:
+    """Select the next task to start.
+
+    Picks the most expensive pending task that fits into the available budget.
+    If nothing is running, the most expensive task is started even if it exceeds
+    the budget, so an oversized task runs alone instead of blocking forever.
+    """
+    for task in pending:
+        if available is None or task.cost <= available:
+            return task
+    if running == 0 and pending:
+        return pending[0]
+    return None
+
+
+def run_tasks(
+    func: Callable[..., Any],
+    tasks: Iterable[Task],
+    state: Any,
+    execution: ExecutionConfig,
+) -> None:
+    """Run tasks in worker processes within a memory budget.
+
+    ``func`` is called as ``func(state, *task.args)``. It must be a module-level
+    function and ``state`` must be picklable, since both are sent to spawned
+    worker processes. The state is transferred once per worker, not per task.
+
+    Tasks are started in order of decreasing cost: large tasks start first, while
+    the remaining budget is filled with smaller tasks, so cheap tables run
+    alongside the expensive ones instead of queueing behind them.
+
+    With ``execution.jobs == 1`` the tasks run sequentially in the current
+    process, in the given order.
+
+    Args:
+        func: Function executing a single task
+        tasks: Tasks to execute
+        state: State shared by all tasks (typically the step)
+        execution: Parallelism and memory budget settings
+
+    Raises:
+        Exception: Re-raises the first exception raised by a task. Tasks that
+            have not been started yet are cancelled.
+    """
+    tasks = list(tasks)
+
+    if execution.jobs == 1 or len(tasks) <= 1:
+        for task in tasks:
+            func(state, *task.args)
+        return
+
+    run_task_graph(func, tasks, {}, state, execution)
+
+
+def run_task_graph(
+    func: Callable[..., Any],
+    tasks: Iterable[Task],
+    dependencies: Mapping[Hashable, Iterable[Hashable]],
+    state: Any,
+    execution: ExecutionConfig,
+) -> None:
+    """Run tasks that depend on each other in worker processes.
+
+    Like :func:`run_tasks`, but a task is only started once all tasks it
+    depends on have finished. The graph is walked with
+    ``TopologicalSorter.prepare()/get_ready()/done()``: every task that becomes
+    ready joins the pending tasks, which are started in order of decreasing
+    cost within the memory budget. Independent branches of the graph therefore
+    run concurrently.
+
+    With ``execution.jobs == 1`` the tasks run sequentially in the current
+    process, in topological order.
+
+    Args:
+        func: Function executing a single task
+        tasks: Tasks to execute; their keys must be unique
+        dependencies: Keys of the tasks each task depends on. Dependencies on
+            keys without a task are ignored.
+        state: State shared by all tasks (typically the step)
+        execution: Parallelism and memory budget settings
+
+    Raises:
+        graphlib.CycleError: If the dependencies contain a cycle
+        Exception: Re-raises the first exception raised by a task. Tasks that
+            have not been started yet are cancelled.
+    """
+    by_key = {task.key: task for task in tasks}
+    sorter: TopologicalSorter[Hashable] = TopologicalSorter()
+    for key in by_key:
+        sorter.add(key, *(dependency for dependency in dependencies.get(key, ()) if dependency in by_key))
+
+    if execution.jobs == 1 or len(by_key) <= 1:
+        for key in sorter.static_order():
+            func(state, *by_key[key].args)
+        return
+
+    logger.info(
+        "Running %d tasks in %d worker processes (memory budget: %s)",
+        len(by_key),
+        execution.jobs,
+        execution.memory_budget.human_readable() if execution.memory_budget is not None else "unlimited",
+    )
+
+    with _worker_environment(execution):
+        _run_pool(func, by_key, sorter, state, execution)
+
+
+@contextmanager
+def _worker_environment(execution: ExecutionConfig) -> Iterator[None]:
+    """Set the environment inherited by the worker processes started in this context.
+
+    Polars sizes its thread pool when it is imported, which in a spawned worker
+    happens while unpickling the task function, before any initializer runs. The
+    same holds for :func:`open_icu.utils.loader.auto_load_configs`, which must
+    not load the bundled configs in workers. Both settings are therefore passed
+    through the environment the workers inherit when they are started (on
+    demand, while tasks are submitted).
+    """
+    variables = {WORKER_ENV: str(os.getpid())}
+    if execution.threads_per_job is not None:
+        variables[POLARS_MAX_THREADS] = str(execution.threads_per_job)
+
+    previous = {name: os.environ.get(name) for name in variables}
+    os.environ.update(variables)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _run_pool(
+    func: Callable[..., Any],
+    tasks: dict[Hashable, Task],
+    sorter: TopologicalSorter[Hashable],
+    state: Any,
+    execution: ExecutionConfig,
+) -> None:
+    """Schedule the tasks on a process pool as they become ready, ordered by decreasing cost."""
+    budget = execution.memory_budget
+    pending: list[Task] = []
+    running: dict[Future[Any], Task] = {}
+    used = 0
+
+    sorter.prepare()
+    with ProcessPoolExecutor(
+        max_workers=min(execution.jobs, len(tasks)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(
+            pickle.dumps(state),
+            logging.getLogger(LOGGER_NAME).getEffectiveLevel(),
+        ),
+    ) as pool:
+        try:
+            while sorter.is_active():
+                ready = sorter.get_ready()
+                if ready:
+                    pending.extend(tasks[key] for key in ready)
+                    pending.sort(key=lambda task: task.cost, reverse=True)
+
+                while pending and len(running) < execution.jobs:
+                    task = _select_task(
+                        pending,
+                        budget - used if budget is not None else None,
+                        len(running),
+                    )
+                    if task is None:
+                        break
+
+                    pending.remove(task)
+                    used += task.cost
+                    logger.debug("Starting task %s", task)
+                    running[pool.submit(_run_in_worker, func, task.args)] = task
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    used -= task.cost
+                    future.result()
+                    logger.debug("Finished task %s", task)
+                    sorter.done(task.key)
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
@@ -5,10 +5,15 @@ data pipeline, providing a template for extraction, transformation, and
 dataset generation workflows.
 """
 
+import hashlib
+import json
 import shutil
 from abc import ABCMeta, abstractmethod
+from functools import cached_property
 from pathlib import Path
 
+import polars as pl
+
 from open_icu.config.base import BaseConfig
 from open_icu.config.registry import BaseConfigRegistry
 from open_icu.logging import get_logger
@@ -40,8 +45,13 @@ class ConfigurableBaseStep[SCT: BaseStepConfig, CT: BaseConfig](metaclass=ABCMet
         _workspace_dir: Workspace directory for intermediate files
         _dataset: Output dataset for final results
         _step_name: Normalized name of this step (lowercase)
+        incremental: Whether the step detects outdated outputs itself. An
+            incremental step is not skipped when its outputs exist, but run
+            to recompute what is outdated.
     """
 
+    incremental: bool = False
+
     def __init__(self, project: OpenICUProject, config: SCT, registry: BaseConfigRegistry[CT]) -> None:
         """Initialize the processing step.
 
@@ -71,6 +81,61 @@ class ConfigurableBaseStep[SCT: BaseStepConfig, CT: BaseConfig](metaclass=ABCMet
         """
         pass
 
+    @cached_property
+    def cohort(self) -> list[int] | None:
+        """Get the subjects the step is restricted to.
+
+        Returns:
+            Sorted subject IDs of the configured cohort, or None if all
+            subjects are processed
+        """
+        if self._config.cohort is None:
+            return None
+        subject_ids = self._config.cohort.subject_ids()
+        logger.info("Restricting step '%s' to a cohort of %d subject(s)", self._step_name, len(subject_ids))
+        return subject_ids
+
+    @cached_property
+    def cohort_hash(self) -> str | None:
+        """Get a hash of the cohort, to be included in fingerprints of outputs.
+
+        Returns:
+            Hex digest of the cohort's subject IDs, or None without a cohort
+        """
+        if self.cohort is None:
+            return None
+        return hashlib.sha256(json.dumps(self.cohort).encode()).hexdigest()
+
+    def cohort_predicate(self, column: str = "subject_id") -> pl.Expr | None:
+        """Build a predicate selecting the rows of the cohort.
+
+        Args:
+            column: Name of the subject ID column
+
+        Returns:
+            The predicate, or None without a cohort
+        """
+        if self.cohort is None:
+            return None
+        return pl.col(column).cast(pl.Int64, strict=False).is_in(self.cohort)
+
+    def filter_cohort(self, lf: pl.LazyFrame, column: str = "subject_id") -> pl.LazyFrame:
+        """Restrict a frame to the rows of the cohort.
+
+        The predicate is added to the plan, so Polars pushes it down into the
+        scans of the frame.
+
+        Args:
+            lf: The frame to filter
+            column: Name of the subject ID column
+
+        Returns:
+            The rows of the cohort's subjects, or the frame unchanged without a
+            cohort
+        """
+        predicate = self.cohort_predicate(column)
+        return lf if predicate is None else lf.filter(predicate)
+
     @abstractmethod
     def extract(self) -> None:
         """Execute the core data extraction logic.
@@ -94,10 +159,12 @@ class ConfigurableBaseStep[SCT: BaseStepConfig, CT: BaseConfig](metaclass=ABCMet
             The workspace directory containing intermediate results
 
         Note:
-            Skip execution if overwrite=False and both workspace and dataset exist
+            Skip execution if overwrite=False and both workspace and dataset
+            exist, unless the step is incremental
         """
         skip = (
             not self._config.overwrite
+            and not self.incremental
             and (self._project.workspace_path / self._step_name).exists()
             and (self._project.datasets_path / self._step_name).exists()
         )
@@ -133,14 +200,28 @@ class ConfigurableBaseStep[SCT: BaseStepConfig, CT: BaseConfig](metaclass=ABCMet
         logger.debug("Step '%s': finished successfully", self._step_name)
         return self._workspace_dir
 
+    @property
+    def registry_scopes(self) -> list[tuple[str, ...]]:
+        """Get the registry scopes the step reads configurations from.
+
+        Returns:
+            Leading identifier components (e.g. dataset name and version) of
+            the configurations in use. Empty for steps without registry
+            configurations.
+        """
+        return []
+
     def setup_config(self) -> None:
         """Load external configuration files into the registry.
 
         Processes each ConfigFileConfig from the step configuration, loading
         YAML files into the registry with specified filtering and overwrite
-        behavior. Saves the consolidated configuration to the project's
-        configs directory.
+        behavior. Loads the registry sources of the step's scopes (see
+        :attr:`registry_scopes`) and saves the consolidated configuration to
+        the project's configs directory.
         """
+        for scope in self.registry_scopes:
+            self._registry.load_scope(*scope)
 
         logger.info(
             "Saving merged configuration to %s",
@@ -189,8 +270,9 @@ class ConfigurableBaseStep[SCT: BaseStepConfig, CT: BaseConfig](metaclass=ABCMet
         """Collect workspace results into the final MEDS dataset.
 
         Copies all Parquet files from the workspace directory to the dataset's
-        data directory, then writes dataset metadata and code vocabulary files
-        to complete the MEDS-compliant output.
+        data directory (see :meth:`collect_files`), then writes dataset
+        metadata and code vocabulary files to complete the MEDS-compliant
+        output. The code vocabulary is only rewritten if a file was copied.
         """
         if self._workspace_dir is None or self._dataset is None:
             logger.debug(
@@ -205,19 +287,46 @@ class ConfigurableBaseStep[SCT: BaseStepConfig, CT: BaseConfig](metaclass=ABCMet
             self._dataset.data_path,
         )
 
-        for file_path in self._workspace_dir.content:
-            relative_path = file_path.relative_to(self._workspace_dir._path)
-            dest_path = self._dataset.data_path / relative_path
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
-
-            logger.debug("Copying %s -> %s", file_path, dest_path)
-
-            shutil.copy(file_path, dest_path)
+        copied = self.collect_files(self._workspace_dir.content)
 
         self._dataset.write_metadata(self._config.dataset.metadata)
-        self._dataset.write_codes()
+        if copied or not (self._dataset.metadata_path / "codes.parquet").exists():
+            self._dataset.write_codes()
 
         logger.info(
             "Finished collecting results for step '%s'",
             self._step_name,
         )
+
+    def collect_files(self, files: list[Path]) -> int:
+        """Copy workspace files to the same relative paths in the dataset.
+
+        Files are copied with their modification times. A file whose copy in
+        the dataset has the same size and modification time is not copied
+        again, so collecting unchanged results rewrites nothing.
+
+        Args:
+            files: Files below the workspace directory
+
+        Returns:
+            Number of files copied
+        """
+        assert self._workspace_dir is not None and self._dataset is not None
+
+        copied = 0
+        for file_path in files:
+            relative_path = file_path.relative_to(self._workspace_dir._path)
+            dest_path = self._dataset.data_path / relative_path
+
+            stat = file_path.stat()
+            if dest_path.exists():
+                dest_stat = dest_path.stat()
+                if (dest_stat.st_size, dest_stat.st_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                    continue
+
+            logger.debug("Copying %s -> %s", file_path, dest_path)
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(file_path, dest_path)
+            copied += 1
+
+        return copied
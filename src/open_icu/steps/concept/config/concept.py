@@ -1,20 +1,24 @@
+from collections.abc import Sequence
 from pathlib import Path
-from typing import Annotated, Self
+from typing import Annotated, Any, Self
 
 import yaml
-from pydantic import BaseModel, Field, TypeAdapter, ValidationError, computed_field, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter, ValidationError, computed_field, model_validator
 
 from open_icu.config.base import BaseConfig
-from open_icu.config.inheritance import has_extends, resolve_effective_configs
+from open_icu.config.inheritance import has_extends
 from open_icu.logging import logger
 from open_icu.steps.concept.config.complex import ComplexDatasetConceptConfig
 from open_icu.steps.concept.config.derived import DerivedDatasetConceptConfig
+from open_icu.steps.concept.config.mapping import MappingIndex
 from open_icu.steps.concept.config.simple import SimpleDatasetConceptConfig
 
 DatasetConceptConfigUnion = Annotated[
     SimpleDatasetConceptConfig | DerivedDatasetConceptConfig | ComplexDatasetConceptConfig, Field(discriminator="type")
 ]
 
+_dataset_concept_adapter: TypeAdapter[DatasetConceptConfigUnion] = TypeAdapter(DatasetConceptConfigUnion)
+
 
 class ConceptLimits(BaseModel):
     """Configuration for concept limits.
@@ -40,7 +44,9 @@ class ConceptConfig(BaseConfig):
         unit: Unit of measurement for the concept values
         extension_columns: Dictionary of extension columns to include in the concept table
         limits: Configuration for concept limits
-        dataset_concepts: List of DatasetConceptConfig objects defining how to extract concept data per dataset
+        dataset_concepts: DatasetConceptConfig objects defining how to extract concept data per dataset.
+            The tuple is indexed by dataset version; add configurations with
+            :meth:`add_dataset_concept` or by assigning a new tuple.
     """
 
     __open_icu_config_type__ = "concept"
@@ -52,11 +58,28 @@ class ConceptConfig(BaseConfig):
         description="Dictionary of extension columns to include in the concept table.",
     )
 
-    dataset_concepts: list[DatasetConceptConfigUnion] = Field(
-        default_factory=list,
+    dataset_concepts: tuple[DatasetConceptConfigUnion, ...] = Field(
+        default=(),
         description="List of dataset-specific concepts that this concept depends on (for dependent concepts).",
     )
 
+    _dataset_concept_index: dict[tuple[str, str], DatasetConceptConfigUnion] = PrivateAttr(default_factory=dict)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "dataset_concepts":
+            self._index_dataset_concepts()
+
+    def model_copy(self, *, update: dict[str, Any] | None = None, deep: bool = False) -> Self:
+        """Copy the configuration, see :meth:`pydantic.BaseModel.model_copy`.
+
+        The dataset concepts of the copy are indexed again if they are updated.
+        """
+        copied = super().model_copy(update=update, deep=deep)
+        if update and "dataset_concepts" in update:
+            copied._index_dataset_concepts()
+        return copied
+
     @computed_field
     @property
     def code(self) -> str:
@@ -66,12 +89,15 @@ class ConceptConfig(BaseConfig):
         return f"{self.name}//{self.unit}"
 
     @classmethod
-    def load(cls, file_path: Path, dataset_paths: list[Path] | None = None, **kwargs) -> Self:
+    def load(cls, file_path: Path, dataset_paths: Sequence[Path | MappingIndex] | None = None, **kwargs) -> Self:
         """Load configuration from a YAML file.
 
         Args:
             file_path: Path to the YAML configuration file
-            dataset_paths: List of paths to dataset directories
+            dataset_paths: Mappings directories of dataset versions, or their
+                MappingIndex. Pass indexes when loading several concepts, so
+                that directories with an inheritance chain are resolved once
+                instead of once per concept.
             **kwargs: Additional keyword arguments for configuration initialization
 
         Returns:
@@ -84,38 +110,22 @@ class ConceptConfig(BaseConfig):
         with open(file_path, "r") as f:
             data = yaml.safe_load(f)
 
-        name = data.get("name")
-        paths = dataset_paths or []
-        adapter = TypeAdapter(DatasetConceptConfigUnion)
-        for path in paths:
-            if has_extends(path):
+        name = str(data.get("name"))
+        for path in dataset_paths or []:
+            if isinstance(path, MappingIndex) or has_extends(path):
                 # Resolve the dataset's inheritance chain; the mapping may be
                 # inherited from (or merged with) a base version's config.
-                sub_data = resolve_effective_configs(path).get(str(name))
-                if sub_data is None:
-                    continue
+                index = path if isinstance(path, MappingIndex) else MappingIndex(path)
+                dataset_concept = cls.load_dataset_concept(name, index)
             else:
                 sub_file_path = path / f"{name}.yml"
                 if not sub_file_path.exists():
                     continue
                 with open(sub_file_path, "r") as f:
-                    sub_data = yaml.safe_load(f)
-
-            try:
-                # Identity always comes from the dataset directory itself,
-                # never from where an inherited file physically lives.
-                sub_data.update(
-                    {
-                        "dataset": path.parent.parent.name,
-                        "version": path.parent.name,
-                        "name": name,
-                    }
-                )
-
-                dataset_concept = adapter.validate_python(sub_data)
+                    dataset_concept = cls._validate_dataset_concept(name, yaml.safe_load(f), path)
+
+            if dataset_concept is not None:
                 data.setdefault("dataset_concepts", []).append(dataset_concept)
-            except ValidationError:
-                logger.warning("failed to load dataset concept config for %s from %s", name, path)
 
         for k, v in kwargs.items():
             if k not in data:
@@ -123,6 +133,40 @@ class ConceptConfig(BaseConfig):
 
         return cls(**data)
 
+    @classmethod
+    def load_dataset_concept(cls, name: str, index: MappingIndex) -> DatasetConceptConfigUnion | None:
+        """Load the dataset-specific configuration of a concept from a dataset version's mappings.
+
+        Args:
+            name: Name of the concept
+            index: Mappings of the dataset version
+
+        Returns:
+            The dataset-specific concept configuration, or None if the dataset
+            version has no valid mapping for the concept
+        """
+        data = index.get(name)
+        if data is None:
+            return None
+        return cls._validate_dataset_concept(name, data, index.path)
+
+    @staticmethod
+    def _validate_dataset_concept(name: str, data: dict, path: Path) -> DatasetConceptConfigUnion | None:
+        try:
+            # Identity always comes from the dataset directory itself,
+            # never from where an inherited file physically lives.
+            data.update(
+                {
+                    "dataset": path.parent.parent.name,
+                    "version": path.parent.name,
+                    "name": name,
+                }
+            )
+            return _dataset_concept_adapter.validate_python(data)
+        except ValidationError:
+            logger.warning("failed to load dataset concept config for %s from %s", name, path)
+            return None
+
     def get_dataset_concept(self, dataset_name: str, version: str) -> DatasetConceptConfigUnion | None:
         """Get the dataset-specific concept configuration for a given dataset name.
 
@@ -132,14 +176,26 @@ class ConceptConfig(BaseConfig):
         Returns:
             The DatasetConceptConfig instance for the specified dataset, or None if not found
         """
+        return self._dataset_concept_index.get((dataset_name, version))
+
+    def add_dataset_concept(self, dataset_concept: DatasetConceptConfigUnion) -> None:
+        """Add the dataset-specific configuration of a dataset version.
+
+        Args:
+            dataset_concept: The dataset-specific concept configuration
+        """
+        self.dataset_concepts = (*self.dataset_concepts, dataset_concept)
+
+    def _index_dataset_concepts(self) -> None:
+        """Link complex dataset concepts to this concept and index all by dataset version."""
+        index: dict[tuple[str, str], DatasetConceptConfigUnion] = {}
         for dataset_concept in self.dataset_concepts:
-            if dataset_concept.dataset == dataset_name and dataset_concept.version == version:
-                return dataset_concept
-        return None
+            if isinstance(dataset_concept, ComplexDatasetConceptConfig):
+                dataset_concept._parent_concept = self
+            index.setdefault((dataset_concept.dataset, dataset_concept.version), dataset_concept)
+        self._dataset_concept_index = index
 
     @model_validator(mode="after")
     def _link_complex_concepts_to_parent(self) -> "ConceptConfig":
-        for dc in self.dataset_concepts:
-            if isinstance(dc, ComplexDatasetConceptConfig):
-                dc._parent_concept = self
+        self._index_dataset_concepts()
         return self
@@ -0,0 +1,82 @@
+"""Index of the concept mappings of a dataset version.
+
+The mappings directory of a dataset version (``<dataset>/<version>/mappings``)
+holds one file per concept. With an ``extends.yml`` marker, the effective
+mappings are resolved across the version's inheritance chain. The MappingIndex
+resolves a directory once and serves the mappings of all concepts from memory,
+instead of resolving the chain again for every concept.
+"""
+
+import copy
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+from open_icu.config.inheritance import resolve_effective_configs
+
+
+class MappingIndex:
+    """Effective concept mappings of a dataset version, resolved once.
+
+    The directory is resolved on first access. Works for directories without
+    an ``extends.yml`` marker as well, in which case only the directory's own
+    files are indexed.
+
+    Example:
+        >>> index = MappingIndex(Path("configs/datasets/mimic-iv-demo/2.2/mappings"))
+        >>> index.get("heart_rate")
+
+    Attributes:
+        path: The mappings directory
+        dataset: Name of the dataset the mappings belong to
+        version: Version of the dataset
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the index.
+
+        Args:
+            path: Mappings directory of a dataset version
+                (``<dataset>/<version>/mappings``)
+        """
+        self.path = path
+        self.dataset = path.parent.parent.name
+        self.version = path.parent.name
+
+    def __repr__(self) -> str:
+        """Return string representation of the index."""
+        return f"{self.__class__.__name__}(path={self.path!r})"
+
+    def __contains__(self, name: str) -> bool:
+        """Check whether the dataset version has a mapping for a concept."""
+        return name in self._mappings
+
+    def __len__(self) -> int:
+        """Return the number of mapped concepts."""
+        return len(self._mappings)
+
+    @cached_property
+    def _mappings(self) -> dict[str, dict[str, Any]]:
+        return resolve_effective_configs(self.path)
+
+    @property
+    def names(self) -> list[str]:
+        """Get the names of the mapped concepts.
+
+        Returns:
+            Sorted concept names
+        """
+        return sorted(self._mappings)
+
+    def get(self, name: str) -> dict[str, Any] | None:
+        """Get the effective mapping data of a concept.
+
+        Args:
+            name: Name of the concept
+
+        Returns:
+            A copy of the mapping data, which the caller may modify, or None if
+            the dataset version has no mapping for the concept
+        """
+        data = self._mappings.get(name)
+        return copy.deepcopy(data) if data is not None else None
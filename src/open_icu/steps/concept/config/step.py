@@ -6,7 +6,7 @@ including dataset-specific concept configuration paths and extraction step refer
 
 from pydantic import BaseModel, Field
 
-from open_icu.steps.base.config import BaseStepConfig
+from open_icu.steps.base.config import BaseStepConfig, ExecutionConfig
 
 
 class DatasetConfig(BaseModel):
@@ -28,10 +28,15 @@ class CustomConfig(BaseModel):
 
     Attributes:
         extraction_step: Name of the extraction step
+        execution: Parallel execution settings
         mapping_configs: List of dataset-specific concept configuration values
     """
 
     extraction_step: str = Field(description="Name of the extraction step.")
+    execution: ExecutionConfig = Field(
+        default_factory=ExecutionConfig,
+        description="Settings for extracting independent concepts in parallel worker processes.",
+    )
     mapping_configs: list[DatasetConfig] = Field(
         default_factory=list, description="List of mapping-specific concept configuration values."
     )
@@ -5,8 +5,60 @@ used in the concept step. The global concept_config_registry instance
 stores all loaded concept configurations.
 """
 
-from open_icu.config.registry import BaseConfigRegistry
-from open_icu.steps.concept.config.concept import ConceptConfig
+from pathlib import Path
+
+from open_icu.config.base import BaseConfig, BaseDatasetConfig
+from open_icu.config.cache import ConfigCache
+from open_icu.config.registry import BaseConfigRegistry, ConfigSource
+from open_icu.logging import get_logger
+from open_icu.steps.concept.config.concept import ConceptConfig, DatasetConceptConfigUnion
+from open_icu.steps.concept.config.mapping import MappingIndex
+
+logger = get_logger(__name__)
+
+
+class ConceptMappingSource(ConfigSource[BaseDatasetConfig]):
+    """The concept mappings of a single dataset version.
+
+    The source only holds the dataset-specific concept configurations. The
+    concepts themselves are loaded once for all dataset versions by a source
+    of the concepts directory, and the ConceptConfigRegistry adds the mappings
+    of each dataset version to them.
+
+    Attributes:
+        scope: Dataset name and version of the mappings
+        path: Mappings directory of the dataset version
+            (``<dataset>/<version>/mappings``)
+        cache: Cache of the loaded configurations
+    """
+
+    def __init__(self, path: Path, cache: ConfigCache | None = None) -> None:
+        """Initialize the source.
+
+        Args:
+            path: Mappings directory of a dataset version
+                (``<dataset>/<version>/mappings``)
+            cache: Cache of the loaded configurations
+        """
+        super().__init__((path.parent.parent.name, path.parent.name), path, cache)
+
+    def read(self, config_type: type[BaseConfig]) -> list[BaseDatasetConfig]:
+        """Load the dataset-specific concept configurations of the dataset version.
+
+        Args:
+            config_type: Ignored; the class of each configuration is selected
+                by its ``type`` field
+
+        Returns:
+            List of successfully loaded dataset-specific concept configurations,
+            including those inherited through the version chain
+        """
+        index = MappingIndex(self.path)
+        return [
+            dataset_concept
+            for name in index.names
+            if (dataset_concept := ConceptConfig.load_dataset_concept(name, index)) is not None
+        ]
 
 
 class ConceptConfigRegistry(BaseConfigRegistry[ConceptConfig]):
@@ -15,9 +67,78 @@ class ConceptConfigRegistry(BaseConfigRegistry[ConceptConfig]):
     Specialized registry for storing and retrieving ConceptConfig instances
     that define how to extract data from source tables and transform them
     into MEDS events.
+
+    Concepts and their mappings are loaded from separate sources: a source of
+    the concepts directory (without scope) and a ConceptMappingSource per
+    dataset version. Concept identifiers do not contain a dataset, so looking
+    up a concept only loads the concepts, while :meth:`load_dataset` also
+    loads the mappings of a dataset version. Loaded mappings are added to all
+    registered concepts of the same name that lack a mapping of the dataset
+    version, regardless of the order in which the sources are loaded.
     """
 
-    pass
+    def __init__(self) -> None:
+        """Initialize the registry storage."""
+        super().__init__()
+        self._mappings: dict[str, list[DatasetConceptConfigUnion]] = {}
+
+    def clear(self) -> None:
+        """Remove all entries, loaded mappings and pending sources from the registry."""
+        super().clear()
+        self._mappings.clear()
+
+    def _load_source(self, source: ConfigSource) -> None:
+        if not isinstance(source, ConceptMappingSource):
+            super()._load_source(source)
+            return
+
+        for dataset_concept in source.load(BaseDatasetConfig):
+            name = dataset_concept.name.lower()
+            self._mappings.setdefault(name, []).append(dataset_concept)
+            for concept in self._index.get((name,), {}).values():
+                self._add_mapping(concept, dataset_concept)
+
+    def _register_loaded(self, config: ConceptConfig) -> None:
+        existing = self._registry.get(config.identifier)
+        if existing is None:
+            super()._register_loaded(config)
+            existing = config
+        else:
+            for dataset_concept in config.dataset_concepts:
+                self._add_mapping(existing, dataset_concept)
+
+        for dataset_concept in self._mappings.get(config.name.lower(), []):
+            self._add_mapping(existing, dataset_concept)
+
+    @staticmethod
+    def _add_mapping(concept: ConceptConfig, dataset_concept: DatasetConceptConfigUnion) -> None:
+        """Add a copy of a mapping to a concept, unless it has one for the dataset version."""
+        if concept.get_dataset_concept(dataset_concept.dataset, dataset_concept.version) is not None:
+            return
+        logger.debug(
+            "Adding mapping of %s for dataset %s (version %s)",
+            concept.identifier,
+            dataset_concept.dataset,
+            dataset_concept.version,
+        )
+        concept.add_dataset_concept(dataset_concept.model_copy(deep=True))
+
+    def load_dataset(self, dataset: str, version: str) -> list[ConceptConfig]:
+        """Load the concepts and the concept mappings of a dataset version.
+
+        Only the pending sources of the dataset version and the concepts are
+        loaded.
+
+        Args:
+            dataset: Name of the dataset
+            version: Version of the dataset
+
+        Returns:
+            All loaded concepts, including those without a mapping for the
+            dataset version
+        """
+        self.load_scope(dataset, version)
+        return list(self._registry.values())
 
 
 concept_config_registry = ConceptConfigRegistry()
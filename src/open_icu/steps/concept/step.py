@@ -6,38 +6,114 @@ code patterns, and outputs MEDS-compliant Parquet files.
 """
 
 import gc
+import hashlib
+import inspect
+import json
+from collections.abc import Hashable
 from functools import cached_property
-from graphlib import TopologicalSorter
 from pathlib import Path
-from uuid import uuid4
+from typing import Any
 
 import polars as pl
 
-from open_icu.callbacks.interpreter import parse_expr
+from open_icu.callbacks.plan import PlanBuilder
 from open_icu.logging import get_logger
+from open_icu.steps.base.executor import Task, run_task_graph
 from open_icu.steps.base.step import ConfigurableBaseStep
 from open_icu.steps.concept.config.concept import (
     ComplexDatasetConceptConfig,
     ConceptConfig,
+    DatasetConceptConfigUnion,
     DerivedDatasetConceptConfig,
     SimpleDatasetConceptConfig,
 )
 from open_icu.steps.concept.config.derived import BaseConceptTable
+from open_icu.steps.concept.config.simple import MappingConfig
 from open_icu.steps.concept.config.step import ConceptStepConfig
-from open_icu.steps.concept.registry import concept_config_registry
+from open_icu.steps.concept.registry import ConceptConfigRegistry, concept_config_registry
+from open_icu.steps.extraction.step import FINGERPRINT_FILE
+from open_icu.storage.partitioned import data_files, list_sources, resolve_source, scan_source, source_name
 from open_icu.storage.project import OpenICUProject
+from open_icu.utils.importer import import_callable
 
 logger = get_logger(__name__)
 
 
+def _extract_concepts(step: "ConceptStep", dataset: str, version: str, identifiers: list[str]) -> None:
+    """Extract the outdated concepts of a group; simple concepts are extracted together."""
+    simple_concepts: list[tuple[ConceptConfig, SimpleDatasetConceptConfig, str]] = []
+    for identifier in identifiers:
+        concept = step._registry.get(identifier)
+        assert concept is not None, f"concept {identifier} not found in registry"
+
+        dataset_concept = concept.get_dataset_concept(dataset, version)
+        assert dataset_concept is not None, f"concept {identifier} has no config for dataset {dataset}"
+
+        fingerprint = step.concept_fingerprint(concept, dataset_concept)
+        if step.is_up_to_date(concept, dataset, fingerprint):
+            logger.info("Concept %s for dataset %s is up to date", concept.identifier, dataset)
+            continue
+        step.clear_fingerprint(concept, dataset)
+
+        if isinstance(dataset_concept, SimpleDatasetConceptConfig):
+            simple_concepts.append((concept, dataset_concept, fingerprint))
+
+        if isinstance(dataset_concept, DerivedDatasetConceptConfig):
+            logger.debug(
+                "Extracting derived concept %s for dataset %s",
+                concept.identifier,
+                dataset,
+            )
+            step.extract_derived_concept(concept, dataset_concept)
+            step.record_fingerprint(concept, dataset, fingerprint)
+
+        if isinstance(dataset_concept, ComplexDatasetConceptConfig):
+            logger.debug(
+                "Running complex concept %s for dataset %s",
+                concept.identifier,
+                dataset,
+            )
+            step.extract_complex_concept(concept, dataset_concept)
+            step.record_fingerprint(concept, dataset, fingerprint)
+
+    if simple_concepts:
+        step.extract_simple_concepts([(concept, dataset_concept) for concept, dataset_concept, _ in simple_concepts])
+        for concept, dataset_concept, fingerprint in simple_concepts:
+            step.record_fingerprint(concept, dataset, fingerprint)
+
+
+def _strip_event_name(code: pl.Expr, event_name: str) -> pl.Expr:
+    """Remove the event name component from MEDS codes."""
+    return (
+        code.str.replace(f"//{event_name}//", "//", literal=True)
+        .str.strip_prefix(f"{event_name}//")
+        .str.strip_suffix(f"//{event_name}")
+    )
+
+
+def _source_hash(obj: Any) -> str | None:
+    """Hash the source code of a class or function, if it is available."""
+    try:
+        return hashlib.sha256(inspect.getsource(obj).encode()).hexdigest()
+    except (OSError, TypeError):
+        return None
+
+
 class ConceptStep(ConfigurableBaseStep[ConceptStepConfig, ConceptConfig]):
     """Concept step for extracting MEDS concept events from ICU data.
 
     Reads extracted MEDS data specified in ConceptConfig objects, applies
     mappings based on code patterns, and writes MEDS-compliant Parquet files
     to the workspace directory.
+
+    The step is incremental: every concept output records a fingerprint of
+    everything it was computed from (see :meth:`concept_fingerprint`), and
+    re-running the step only recomputes concepts whose fingerprint changed.
     """
 
+    incremental = True
+    _registry: ConceptConfigRegistry
+
     @classmethod
     def load(cls, project: OpenICUProject, config_path: Path) -> "ConceptStep":
         """Load a concept step from a configuration file.
@@ -52,85 +128,287 @@ class ConceptStep(ConfigurableBaseStep[ConceptStepConfig, ConceptConfig]):
         config = ConceptStepConfig.load(config_path)
         return cls(project, config, concept_config_registry)
 
+    @property
+    def registry_scopes(self) -> list[tuple[str, ...]]:
+        """Get the dataset versions with concept mappings in use.
+
+        Returns:
+            Sorted (dataset name, version) pairs of the mapping configurations
+        """
+        return sorted(
+            {(dataset_config.name, dataset_config.version) for dataset_config in self._config.config.mapping_configs}
+        )
+
     def extract(self) -> None:
-        datasets = {
-            (dataset_config.name, dataset_config.version) for dataset_config in self._config.config.mapping_configs
-        }
+        """Execute the concept extraction workflow.
+
+        The concepts of all datasets are extracted as one task graph (see
+        :func:`~open_icu.steps.base.executor.run_task_graph`):
+
+        - Simple concepts form the first wave. Concepts reading the same
+          extraction tables are extracted together in one task, so every event
+          file is still scanned once (see :meth:`extract_simple_concepts`),
+          while concepts on unrelated tables run concurrently.
+        - Every derived or complex concept is a task that starts as soon as the
+          tasks producing its dependencies have finished, so independent
+          branches of the dependency graph run concurrently.
+
+        Datasets write disjoint output files and have no dependencies on each
+        other, so their tasks share the worker pool and are interleaved instead
+        of processing one dataset after the other. With ``execution.jobs > 1``
+        the tasks run in worker processes, otherwise sequentially in dependency
+        order.
+        """
+        tasks: list[Task] = []
+        dependencies: dict[Hashable, list[Hashable]] = {}
+        for dataset, version in self.registry_scopes:
+            dataset_tasks, dataset_dependencies = self._dataset_tasks(dataset, version)
+            tasks.extend(dataset_tasks)
+            dependencies.update(dataset_dependencies)
+
+        run_task_graph(_extract_concepts, tasks, dependencies, self, self._config.config.execution)
+
+    def _dataset_tasks(self, dataset: str, version: str) -> tuple[list[Task], dict[Hashable, list[Hashable]]]:
+        """Build the concept tasks of a dataset and their dependencies.
+
+        Task keys are prefixed with the dataset and version, so the graphs of
+        several datasets can be combined.
+
+        Args:
+            dataset: Name of the dataset
+            version: Version of the dataset
+
+        Returns:
+            The tasks and, for each derived or complex concept task, the keys
+            of the tasks it depends on
+        """
+        logger.info("Processing concepts for dataset %s (version %s)", dataset, version)
+        depend_concepts = dict()
+        simple_concepts: list[tuple[ConceptConfig, SimpleDatasetConceptConfig]] = []
 
-        for dataset, version in datasets:
-            logger.info("Processing concepts for dataset %s (version %s)", dataset, version)
-            depend_concepts = dict()
-
-            for concept in self._registry.values():
-                dataset_concept = concept.get_dataset_concept(dataset, version)
-                if dataset_concept is None:
-                    logger.warning(
-                        "skipping concept %s for dataset %s (version %s): no dataset-specific config found",
-                        concept.name,
-                        dataset,
-                        version,
-                    )
-                    continue
-
-                if isinstance(dataset_concept, SimpleDatasetConceptConfig):
-                    logger.debug(
-                        "Extracting simple concept %s for dataset %s",
-                        concept.identifier,
-                        dataset,
-                    )
-                    self.extract_simple_concept(
-                        concept,
-                        dataset_concept,
-                    )
-
-                if isinstance(dataset_concept, (DerivedDatasetConceptConfig, ComplexDatasetConceptConfig)):
-                    logger.debug(
-                        "Registering dependent concept %s for dataset %s",
-                        concept.identifier,
-                        dataset,
-                    )
-                    depend_concepts[concept.identifier] = dataset_concept.dependencies
-
-            for concept_id in TopologicalSorter(depend_concepts).static_order():
+        for concept in self._registry.load_dataset(dataset, version):
+            dataset_concept = concept.get_dataset_concept(dataset, version)
+            if dataset_concept is None:
+                logger.warning(
+                    "skipping concept %s for dataset %s (version %s): no dataset-specific config found",
+                    concept.name,
+                    dataset,
+                    version,
+                )
+                continue
+
+            if isinstance(dataset_concept, SimpleDatasetConceptConfig):
+                simple_concepts.append((concept, dataset_concept))
+
+            if isinstance(dataset_concept, (DerivedDatasetConceptConfig, ComplexDatasetConceptConfig)):
                 logger.debug(
-                    "Processing dependent concept %s for dataset %s",
-                    concept_id,
+                    "Registering dependent concept %s for dataset %s",
+                    concept.identifier,
                     dataset,
                 )
-                concept = self._registry.get(concept_id)
-                assert concept is not None, f"concept {concept_id} not found in registry"
-
-                dataset_concept = concept.get_dataset_concept(dataset, version)
-                if dataset_concept is None:
-                    logger.warning(
-                        "skipping concept %s for dataset %s (version %s): no dataset-specific config found",
-                        concept.name,
-                        dataset,
-                        version,
-                    )
-                    continue
-
-                if isinstance(dataset_concept, DerivedDatasetConceptConfig):
-                    logger.debug(
-                        "Extracting derived concept %s for dataset %s",
-                        concept.identifier,
-                        dataset,
-                    )
-                    self.extract_derived_concept(
-                        concept,
-                        dataset_concept,
-                    )
-
-                if isinstance(dataset_concept, ComplexDatasetConceptConfig):
-                    logger.debug(
-                        "Running complex concept %s for dataset %s",
-                        concept.identifier,
-                        dataset,
-                    )
-                    self.extract_complex_concept(
-                        concept,
-                        dataset_concept,
-                    )
+                depend_concepts[concept.identifier] = dataset_concept.dependencies
+
+        tasks: list[Task] = []
+        producers: dict[str, Hashable] = {}
+        for group in self._simple_concept_groups(simple_concepts):
+            identifiers = [concept.identifier for concept, _ in group]
+            key = (dataset, version, *identifiers)
+            tasks.append(Task(key, (dataset, version, identifiers), self._estimate_cost(group)))
+            producers.update((identifier, key) for identifier in identifiers)
+
+        for identifier in depend_concepts:
+            key = (dataset, version, identifier)
+            tasks.append(Task(key, (dataset, version, [identifier])))
+            producers[identifier] = key
+
+        dependencies: dict[Hashable, list[Hashable]] = {
+            producers[identifier]: [producers[dependency] for dependency in deps if dependency in producers]
+            for identifier, deps in depend_concepts.items()
+        }
+        return tasks, dependencies
+
+    def _simple_concept_groups(
+        self,
+        concepts: list[tuple[ConceptConfig, SimpleDatasetConceptConfig]],
+    ) -> list[list[tuple[ConceptConfig, SimpleDatasetConceptConfig]]]:
+        """Split simple concepts into groups that read disjoint extraction tables.
+
+        Two concepts are in the same group if they are connected through
+        mappings reading the same table, directly or via other concepts.
+        """
+        parent = list(range(len(concepts)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        readers: dict[tuple[str, str, str], int] = {}
+        for i, (_, dataset_concept) in enumerate(concepts):
+            for mapping in dataset_concept.mappings:
+                table = (dataset_concept.dataset, dataset_concept.version, mapping.pattern.table)
+                parent[find(i)] = find(readers.setdefault(table, i))
+
+        groups: dict[int, list[tuple[ConceptConfig, SimpleDatasetConceptConfig]]] = {}
+        for i, pair in enumerate(concepts):
+            groups.setdefault(find(i), []).append(pair)
+        return list(groups.values())
+
+    def _estimate_cost(self, concepts: list[tuple[ConceptConfig, SimpleDatasetConceptConfig]]) -> int:
+        """Estimate the peak memory needed to extract a group of simple concepts.
+
+        The estimate is the on-disk size of the extraction tables read by the
+        concepts, scaled by ``execution.memory_factor``.
+        """
+        if not self.extraction_dataset:
+            return 0
+
+        tables = {
+            self._table_path(dataset_concept, mapping.pattern.table)
+            for _, dataset_concept in concepts
+            for mapping in dataset_concept.mappings
+        }
+        size = sum(file.stat().st_size for table in tables for file in data_files(table))
+        return int(size * self._config.config.execution.memory_factor)
+
+    def concept_fingerprint(self, concept: ConceptConfig, dataset_concept: DatasetConceptConfigUnion) -> str:
+        """Compute the fingerprint of a concept's output for a dataset.
+
+        The fingerprint covers the resolved concept config, its dataset-specific
+        mapping, the source code of a complex concept's transformer, and the
+        inputs: the extraction tables read by a simple concept (see
+        :meth:`table_fingerprint`) or the recorded fingerprints of the concepts
+        a derived or complex concept depends on, and the step's cohort. A change
+        therefore also changes the fingerprints of all downstream concepts.
+
+        Args:
+            concept: The concept configuration
+            dataset_concept: The dataset-specific mapping configuration
+
+        Returns:
+            Hex digest identifying the concept output
+        """
+        dataset = dataset_concept.dataset
+        if isinstance(dataset_concept, SimpleDatasetConceptConfig):
+            tables = {self._table_path(dataset_concept, mapping.pattern.table) for mapping in dataset_concept.mappings}
+            inputs = {str(table): self.table_fingerprint(table) for table in tables}
+        else:
+            inputs = {}
+            for identifier in dataset_concept.dependencies:
+                dependency = self._registry.get(identifier)
+                inputs[identifier] = self.recorded_fingerprint(dependency, dataset) if dependency else None
+
+        transformer = None
+        if isinstance(dataset_concept, ComplexDatasetConceptConfig):
+            transformer_cls = import_callable(dataset_concept.concept_transformer)
+            transformer = [dataset_concept.concept_transformer, _source_hash(transformer_cls)]
+
+        payload = {
+            "cohort": self.cohort_hash,
+            "concept": concept.model_dump(mode="json", exclude={"dataset_concepts"}),
+            "mapping": dataset_concept.model_dump(mode="json", exclude={"dependencies"}),
+            "transformer": transformer,
+            "inputs": inputs,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    @cached_property
+    def _table_fingerprints(self) -> dict[Path, str | None]:
+        return {}
+
+    def table_fingerprint(self, table: Path) -> str | None:
+        """Identify the contents of an extraction table.
+
+        Uses the fingerprint the extraction step collected with the table's
+        events, which changes whenever the table is extracted differently but
+        not when its files are merely copied. Tables without a collected
+        fingerprint are identified by a hash of the contents of their files.
+
+        Args:
+            table: Directory of the table in the extraction dataset
+
+        Returns:
+            Hex digest identifying the table, or None if it has no files
+        """
+        if table not in self._table_fingerprints:
+            recorded = table / FINGERPRINT_FILE
+            if recorded.is_file():
+                with open(recorded, "r") as f:
+                    fingerprint = json.load(f)["fingerprint"]
+            elif files := data_files(table):
+                digest = hashlib.sha256()
+                for file in files:
+                    with open(file, "rb") as f:
+                        digest.update(f"{file.relative_to(table)}\0".encode())
+                        digest.update(hashlib.file_digest(f, "sha256").digest())
+                fingerprint = digest.hexdigest()
+            else:
+                fingerprint = None
+            self._table_fingerprints[table] = fingerprint
+        return self._table_fingerprints[table]
+
+    def _fingerprint_path(self, concept: ConceptConfig, dataset: str) -> Path:
+        return self.concept_output_dir(concept) / f"{dataset}.fingerprint.json"
+
+    def recorded_fingerprint(self, concept: ConceptConfig, dataset: str) -> str | None:
+        """Get the fingerprint recorded for a concept output.
+
+        Args:
+            concept: The concept configuration
+            dataset: Name of the dataset
+
+        Returns:
+            The fingerprint of the existing output, or None if there is none
+        """
+        path = self._fingerprint_path(concept, dataset)
+        if not path.exists():
+            return None
+        with open(path, "r") as f:
+            return json.load(f)["fingerprint"]
+
+    def is_up_to_date(self, concept: ConceptConfig, dataset: str, fingerprint: str) -> bool:
+        """Check whether a concept output exists and was computed with the fingerprint.
+
+        Args:
+            concept: The concept configuration
+            dataset: Name of the dataset
+            fingerprint: The current fingerprint of the concept output
+
+        Returns:
+            True if the output does not need to be recomputed
+        """
+        output_file = self.concept_output_dir(concept) / f"{dataset}.parquet"
+        return output_file.exists() and self.recorded_fingerprint(concept, dataset) == fingerprint
+
+    def record_fingerprint(self, concept: ConceptConfig, dataset: str, fingerprint: str) -> None:
+        """Record the fingerprint of a concept output that has been written.
+
+        Nothing is recorded if the output was not written (e.g. because its
+        inputs are missing), so it is computed again on the next run.
+
+        Args:
+            concept: The concept configuration
+            dataset: Name of the dataset
+            fingerprint: The fingerprint the output was computed with
+        """
+        if not (self.concept_output_dir(concept) / f"{dataset}.parquet").exists():
+            return
+
+        path = self._fingerprint_path(concept, dataset)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"fingerprint": fingerprint}, f, indent=4)
+        tmp_path.replace(path)
+
+    def clear_fingerprint(self, concept: ConceptConfig, dataset: str) -> None:
+        """Remove the recorded fingerprint before a concept output is recomputed.
+
+        Args:
+            concept: The concept configuration
+            dataset: Name of the dataset
+        """
+        self._fingerprint_path(concept, dataset).unlink(missing_ok=True)
 
     def concept_output_dir(self, concept: ConceptConfig) -> Path:
         """Return the workspace directory a concept's per-dataset parquet files are written to.
@@ -162,6 +440,49 @@ class ConceptStep(ConfigurableBaseStep[ConceptStepConfig, ConceptConfig]):
             return pl.DataFrame()
         return pl.read_parquet(codes_path)
 
+    @cached_property
+    def _matching_codes_cache(self) -> dict[tuple[str, str], pl.Series]:
+        return {}
+
+    def matching_codes(self, pattern: str, data_path: Path) -> pl.Series | None:
+        """Resolve a code pattern against the extraction's code vocabulary.
+
+        A code matches if the pattern is found in the code itself or in the code
+        with the event name component removed. Resolving the pattern once
+        against ``codes.parquet`` lets event files be filtered by exact lookups
+        instead of evaluating the regular expression for every row.
+
+        The vocabulary is only used for event files that have not been modified
+        after it was written, since it may not contain their codes otherwise.
+
+        Args:
+            pattern: Regular expression of the mapping
+            data_path: Event file (or partitioned event dataset) to look up
+
+        Returns:
+            The matching codes, or None if no up-to-date code vocabulary is
+            available for the event file
+        """
+        if "code" not in self.codes_df.columns:
+            return None
+
+        codes_mtime = (self.extraction_dataset.metadata_path / "codes.parquet").stat().st_mtime_ns
+        files = data_files(data_path) if data_path.is_dir() else [data_path]
+        # Files with the same timestamp may have been written after the vocabulary
+        # within the resolution of the file system clock.
+        if any(file.stat().st_mtime_ns >= codes_mtime for file in files):
+            logger.debug("Code vocabulary is older than %s, matching codes by pattern", data_path)
+            return None
+
+        event_name = source_name(data_path)
+        key = (pattern, event_name)
+        if key not in self._matching_codes_cache:
+            code = pl.col("code")
+            self._matching_codes_cache[key] = self.codes_df.filter(
+                code.str.contains(pattern) | _strip_event_name(code, event_name).str.contains(pattern)
+            )["code"]
+        return self._matching_codes_cache[key]
+
     def apply_limits(self, concept: ConceptConfig, lf: pl.LazyFrame) -> pl.LazyFrame:
         if concept.limits.min is not None:
             lf = lf.with_columns(
@@ -186,143 +507,211 @@ class ConceptStep(ConfigurableBaseStep[ConceptStepConfig, ConceptConfig]):
         concept: ConceptConfig,
         dataset_concept: SimpleDatasetConceptConfig,
     ) -> None:
-        logger.debug(
-            "Extracting simple concept %s for dataset %s",
-            concept.identifier,
-            dataset_concept.dataset,
-        )
+        """Extract a single simple concept.
+
+        Args:
+            concept: The concept configuration to extract
+            dataset_concept: The dataset-specific simple mapping configuration
+        """
+        self.extract_simple_concepts([(concept, dataset_concept)])
+
+    def extract_simple_concepts(
+        self,
+        concepts: list[tuple[ConceptConfig, SimpleDatasetConceptConfig]],
+    ) -> None:
+        """Extract simple concepts with one pass over every event file they read.
+
+        The mappings of all concepts are grouped by the event file they read, so
+        an event file shared by many concepts (e.g. chart events) is scanned once
+        instead of once per concept (see :meth:`_event_file_plans`). The plans of
+        all mappings of a concept are concatenated lazily and sunk directly to
+        the concept's ``<dataset>.parquet``. All sinks run in one
+        ``pl.collect_all`` call, which evaluates every shared event file scan
+        only once.
+
+        Args:
+            concepts: Pairs of concept configuration and dataset-specific simple
+                mapping configuration
+        """
         assert self._workspace_dir is not None
-        output_data_path = self.concept_output_dir(concept)
-        output_dataset_path = output_data_path / dataset_concept.dataset
-        output_dataset_path.mkdir(parents=True, exist_ok=True)
 
-        for mapping in dataset_concept.mappings:
-            dataset = dataset_concept.dataset
-            version = dataset_concept.version
-            table = mapping.pattern.table
-            event = mapping.pattern.event
+        groups: dict[Path, list[tuple[ConceptConfig, SimpleDatasetConceptConfig, MappingConfig]]] = {}
+        for concept, dataset_concept in concepts:
+            logger.debug(
+                "Extracting simple concept %s for dataset %s",
+                concept.identifier,
+                dataset_concept.dataset,
+            )
+            for mapping in dataset_concept.mappings:
+                for data_path in self._mapping_sources(concept, dataset_concept, mapping):
+                    groups.setdefault(data_path, []).append((concept, dataset_concept, mapping))
+
+        plans: dict[tuple[str, str], list[pl.LazyFrame]] = {}
+        for data_path, mappings in groups.items():
+            for (concept, dataset_concept, _), lf in zip(mappings, self._event_file_plans(data_path, mappings)):
+                plans.setdefault((concept.identifier, dataset_concept.dataset), []).append(lf)
+
+        sinks: list[pl.LazyFrame] = []
+        for concept, dataset_concept in concepts:
+            lfs = plans.get((concept.identifier, dataset_concept.dataset))
+            if not lfs:
+                continue
 
-            table_path = self.extraction_dataset.data_path / dataset / version / table
+            output_data_path = self.concept_output_dir(concept)
+            output_data_path.mkdir(parents=True, exist_ok=True)
+            output_file = output_data_path / f"{dataset_concept.dataset}.parquet"
+            logger.info(
+                "Writing simple concept %s from %d mapping plan(s) to %s",
+                concept.identifier,
+                len(lfs),
+                output_file,
+            )
+            sinks.append(pl.concat(lfs, how="vertical").sink_parquet(output_file, lazy=True))
 
-            if event is None:
-                data_paths = sorted(table_path.glob("*.parquet"))
-            else:
-                data_paths = [table_path / f"{event}.parquet"]
+        if sinks:
+            pl.collect_all(sinks, engine="streaming")
+
+        del plans, sinks
+        gc.collect()
 
-            if not data_paths:
+    def _table_path(self, dataset_concept: SimpleDatasetConceptConfig, table: str) -> Path:
+        """Return the extraction output directory of a table of the concept's dataset."""
+        return self.extraction_dataset.data_path / dataset_concept.dataset / dataset_concept.version / table
+
+    def _mapping_sources(
+        self,
+        concept: ConceptConfig,
+        dataset_concept: SimpleDatasetConceptConfig,
+        mapping: MappingConfig,
+    ) -> list[Path]:
+        """Resolve the event files a mapping reads, skipping missing ones."""
+        table_path = self._table_path(dataset_concept, mapping.pattern.table)
+
+        if mapping.pattern.event is None:
+            data_paths = list_sources(table_path)
+        else:
+            data_paths = [resolve_source(table_path, mapping.pattern.event)]
+
+        if not data_paths:
+            logger.warning(
+                "skipping mapping for concept %s: no event files found in %s",
+                concept.name,
+                table_path,
+            )
+
+        sources = []
+        for data_path in data_paths:
+            if not data_path.exists():
                 logger.warning(
-                    "skipping mapping for concept %s: no event files found in %s",
+                    "skipping mapping for concept %s: file not found (%s)",
                     concept.name,
-                    table_path,
+                    data_path,
                 )
                 continue
+            sources.append(data_path)
+        return sources
+
+    def _code_filter(self, patterns: list[str], data_path: Path) -> pl.Expr:
+        """Build a predicate selecting the events matching any of the code patterns."""
+        code = pl.col("code").cast(pl.String)
+
+        resolved = [self.matching_codes(pattern, data_path) for pattern in patterns]
+        if all(codes is not None for codes in resolved):
+            return code.is_in(pl.concat(resolved).unique().implode())
+
+        event_name = source_name(data_path)
+        return pl.any_horizontal(
+            *(
+                code.str.contains(pattern) | _strip_event_name(code, event_name).str.contains(pattern)
+                for pattern in patterns
+            )
+        )
 
-            for data_path in data_paths:
-                if not data_path.exists():
-                    logger.warning(
-                        "skipping mapping for concept %s: file not found (%s)",
-                        concept.name,
-                        data_path,
-                    )
-                    continue
+    def _event_file_plans(
+        self,
+        data_path: Path,
+        mappings: list[tuple[ConceptConfig, SimpleDatasetConceptConfig, MappingConfig]],
+    ) -> list[pl.LazyFrame]:
+        """Build the concept plans of all mappings reading an event file.
 
-                event_name = data_path.stem
+        The event file is scanned into a shared subplan that keeps the rows
+        matching any of the mappings. On top of it, every mapping selects its
+        own rows, derives the value columns and applies the limits of its
+        concept. When the plans are executed together, the shared subplan is
+        evaluated only once.
 
-                logger.debug(
-                    "Loading source event %s/%s/%s/%s for concept %s",
-                    dataset,
-                    version,
-                    table,
-                    event_name,
-                    concept.identifier,
-                )
+        Args:
+            data_path: Event file (or partitioned event dataset) to read
+            mappings: Concept, dataset-specific config and mapping of every
+                mapping reading the event file
 
-                code = pl.col("code").cast(pl.String)
-                code_without_event_name = (
-                    code.str.replace(f"//{event_name}//", "//", literal=True)
-                    .str.strip_prefix(f"{event_name}//")
-                    .str.strip_suffix(f"//{event_name}")
-                )
+        Returns:
+            One MEDS concept plan per mapping, in the order of ``mappings``
+        """
+        event_name = source_name(data_path)
+        logger.debug(
+            "Loading source event %s for %d concept mapping(s)",
+            data_path,
+            len(mappings),
+        )
 
-                lf = pl.scan_parquet(data_path).filter(
-                    code.str.contains(mapping.pattern.code)
-                    | code_without_event_name.str.contains(mapping.pattern.code)
-                )
+        patterns = list(dict.fromkeys(mapping.pattern.code for _, _, mapping in mappings))
+        events = self.filter_cohort(scan_source(data_path)).filter(self._code_filter(patterns, data_path))
 
-                for col_name, pattern in mapping.pattern.extensions.items():
-                    lf = lf.filter(pl.col(col_name).str.contains(pattern))
-
-                # extension columns
-                lf = lf.with_columns(pl.lit(dataset).alias("dataset"))
-                lf = lf.with_columns(pl.lit(version).alias("version"))
-                lf = lf.with_columns(pl.lit(table).alias("table"))
-                lf = lf.with_columns(pl.lit(event_name).alias("event"))
-                for col_name, col_expr in concept.extension_columns.items():
-                    lf = lf.with_columns(parse_expr(lf, col_expr).alias(col_name))
-
-                # value columns
-                if mapping.columns.text_value is None:
-                    lf = lf.with_columns(pl.lit(None).alias("text_value"))
-                else:
-                    lf = lf.with_columns(parse_expr(lf, mapping.columns.text_value).alias("text_value"))
-
-                if mapping.columns.numeric_value is None:
-                    lf = lf.with_columns(pl.lit(None).alias("numeric_value"))
-                else:
-                    expr = parse_expr(lf, mapping.columns.numeric_value)
-
-                    lf = lf.with_columns(expr.cast(pl.Float64, strict=False).alias("numeric_value"))
-
-                # code column
-                lf = lf.with_columns(pl.lit(concept.code).alias("code"))
-
-                for expr in mapping.filters:
-                    lf = lf.filter(parse_expr(lf, expr))
-
-                lf = lf.select(
-                    [
-                        pl.col("subject_id").cast(pl.Int64),
-                        pl.col("time").cast(pl.Datetime(time_unit="us")),
-                        pl.col("code").cast(pl.String),
-                        pl.col("numeric_value").cast(pl.Float32),
-                        pl.col("text_value").cast(pl.String),
-                    ]
-                    + [pl.col(col).cast(pl.String) for col in concept.extension_columns.keys()]
-                )
+        plans: list[pl.LazyFrame] = []
+        for concept, dataset_concept, mapping in mappings:
+            dataset = dataset_concept.dataset
+            version = dataset_concept.version
+            table = mapping.pattern.table
 
-                lf = self.apply_limits(concept, lf)
+            lf = events
+            if len(patterns) > 1:
+                lf = lf.filter(self._code_filter([mapping.pattern.code], data_path))
 
-                output_file = output_dataset_path / f"{str(uuid4())}.parquet"
-                logger.debug(
-                    "Writing temporary concept file for %s to %s",
-                    concept.identifier,
-                    output_file,
-                )
-                lf.sink_parquet(
-                    output_file,
-                )
+            for col_name, pattern in mapping.pattern.extensions.items():
+                lf = lf.filter(pl.col(col_name).str.contains(pattern))
 
-                del lf
-                gc.collect()
+            plan = PlanBuilder(lf)
 
-        files = list(output_dataset_path.glob("*.parquet"))
-        if files:
-            logger.info(
-                "Writing merged concept file for %s to %s",
-                concept.identifier,
-                output_data_path / f"{dataset_concept.dataset}.parquet",
-            )
-            pl.scan_parquet(files).sink_parquet(output_data_path / f"{dataset_concept.dataset}.parquet")
+            # extension columns
+            plan = plan.with_columns(pl.lit(dataset).alias("dataset"))
+            plan = plan.with_columns(pl.lit(version).alias("version"))
+            plan = plan.with_columns(pl.lit(table).alias("table"))
+            plan = plan.with_columns(pl.lit(event_name).alias("event"))
+            for col_name, col_expr in concept.extension_columns.items():
+                plan = plan.with_columns(plan.parse(col_expr).alias(col_name))
 
-        logger.debug(
-            "Cleaning up temporary concept files for %s in %s",
-            concept.identifier,
-            output_dataset_path,
-        )
-        for file in files:
-            file.unlink()
+            # value columns
+            if mapping.columns.text_value is None:
+                plan = plan.with_columns(pl.lit(None).alias("text_value"))
+            else:
+                plan = plan.with_columns(plan.parse(mapping.columns.text_value).alias("text_value"))
+
+            if mapping.columns.numeric_value is None:
+                plan = plan.with_columns(pl.lit(None).alias("numeric_value"))
+            else:
+                expr = plan.parse(mapping.columns.numeric_value)
 
-        output_dataset_path.rmdir()
+                plan = plan.with_columns(expr.cast(pl.Float64, strict=False).alias("numeric_value"))
+
+            # code column
+            plan = plan.with_columns(pl.lit(concept.code).alias("code"))
+
+            for expr in mapping.filters:
+                plan = plan.filter(plan.parse(expr))
+
+            lf = plan.select(
+                pl.col("subject_id").cast(pl.Int64),
+                pl.col("time").cast(pl.Datetime(time_unit="us")),
+                pl.col("code").cast(pl.String),
+                pl.col("numeric_value").cast(pl.Float32),
+                pl.col("text_value").cast(pl.String),
+                *[pl.col(col).cast(pl.String) for col in concept.extension_columns.keys()],
+            ).lf
+
+            plans.append(self.apply_limits(concept, lf))
+
+        return plans
 
     def get_path_for_concept_table(self, table: BaseConceptTable, dataset: str) -> Path:
         concept = self._registry.get(table.concept)
@@ -351,18 +740,18 @@ class ConceptStep(ConfigurableBaseStep[ConceptStepConfig, ConceptConfig]):
                 table.concept,
                 file_path,
             )
-            lf = pl.scan_parquet(
-                file_path,
-                low_memory=True,
-            ).select(table.columns)
+            lf = pl.scan_parquet(file_path, low_memory=True).select(table.columns)
+            if "subject_id" in table.columns:
+                lf = self.filter_cohort(lf)
+            plan = PlanBuilder(lf, table.columns)
 
             for expr in table.pre_callbacks:
-                lf = lf.with_columns(parse_expr(lf, expr))
+                plan = plan.with_columns(plan.parse(expr))
 
             for expr in table.callbacks:
-                lf = lf.with_columns(parse_expr(lf, expr))
+                plan = plan.with_columns(plan.parse(expr))
 
-            return lf
+            return plan.lf
 
         try:
             lf = _read_table(
@@ -392,8 +781,9 @@ class ConceptStep(ConfigurableBaseStep[ConceptStepConfig, ConceptConfig]):
             logger.warning("skipping table %s: %s", dataset_concept.table.concept, e)
             return
 
+        plan = PlanBuilder(lf)
         for expr in post_callbacks:
-            lf = lf.with_columns(parse_expr(lf, expr))
+            plan = plan.with_columns(plan.parse(expr))
 
         columns = dataset_concept.event.model_dump()
         extension = concept.extension_columns.copy()
@@ -405,30 +795,28 @@ class ConceptStep(ConfigurableBaseStep[ConceptStepConfig, ConceptConfig]):
         } | {col_expr: col_name for col_name, col_expr in extension.items() if col_expr is not None}
 
         if dataset_concept.event.text_value is None:
-            lf = lf.with_columns(pl.lit(None, dtype=pl.String).alias("text_value"))
+            plan = plan.with_columns(pl.lit(None, dtype=pl.String).alias("text_value"))
         if dataset_concept.event.numeric_value is None:
-            lf = lf.with_columns(pl.lit(None, dtype=pl.Float32).alias("numeric_value"))
+            plan = plan.with_columns(pl.lit(None, dtype=pl.Float32).alias("numeric_value"))
 
         for col_expr, col_name in mapping.items():
-            lf = lf.with_columns(parse_expr(lf, col_expr).alias(col_name))
+            plan = plan.with_columns(plan.parse(col_expr).alias(col_name))
 
         # code column
-        lf = lf.with_columns(pl.lit(concept.code).alias("code"))
+        plan = plan.with_columns(pl.lit(concept.code).alias("code"))
 
         for expr in dataset_concept.filters:
-            lf = lf.filter(parse_expr(lf, expr))
+            plan = plan.filter(plan.parse(expr))
 
         # Reorder columns
-        lf = lf.select(
-            [
-                pl.col("subject_id").cast(pl.Int64),
-                pl.col("time").cast(pl.Datetime(time_unit="us")),
-                pl.col("code").cast(pl.String),
-                pl.col("numeric_value").cast(pl.Float32),
-                pl.col("text_value").cast(pl.String),
-            ]
-            + [pl.col(col).cast(pl.String) for col in extension.keys()]
-        )
+        lf = plan.select(
+            pl.col("subject_id").cast(pl.Int64),
+            pl.col("time").cast(pl.Datetime(time_unit="us")),
+            pl.col("code").cast(pl.String),
+            pl.col("numeric_value").cast(pl.Float32),
+            pl.col("text_value").cast(pl.String),
+            *[pl.col(col).cast(pl.String) for col in extension.keys()],
+        ).lf
 
         lf = self.apply_limits(concept, lf)
 
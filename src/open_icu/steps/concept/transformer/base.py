@@ -22,7 +22,7 @@ from typing import TYPE_CHECKING
 
 import polars as pl
 
-from open_icu.callbacks.interpreter import parse_expr
+from open_icu.callbacks.plan import PlanBuilder
 from open_icu.logging import get_logger
 from open_icu.steps.concept.config.complex import ComplexDatasetConceptConfig, ConceptTransformerProtocol
 
@@ -139,10 +139,11 @@ class BaseConceptTransformer(ConceptTransformerProtocol, metaclass=ABCMeta):
             numeric_value=pl.coalesce(pl.col("^numeric_value$"), pl.lit(None, dtype=pl.Float32)),
         )
 
+        plan = PlanBuilder(lf)
         for col_name, col_expr in self._concept.extension_columns.items():
-            lf = lf.with_columns(parse_expr(lf, col_expr).alias(col_name))
+            plan = plan.with_columns(plan.parse(col_expr).alias(col_name))
 
-        lf = lf.select(
+        lf = plan.lf.select(
             [
                 pl.col("subject_id").cast(pl.Int64),
                 pl.col("time").cast(pl.Datetime(time_unit="us")),
@@ -168,8 +169,9 @@ class BaseConceptTransformer(ConceptTransformerProtocol, metaclass=ABCMeta):
 
         Returns:
             The dependency's unversioned name paired with a lazy scan of its
-            parquet for this dataset, or ``None`` when it cannot be resolved
-            and :attr:`strict_dependencies` is False.
+            parquet for this dataset (restricted to the step's cohort), or
+            ``None`` when it cannot be resolved and :attr:`strict_dependencies`
+            is False.
 
         Raises:
             ValueError: The identifier is not in the step's concept registry
@@ -198,7 +200,7 @@ class BaseConceptTransformer(ConceptTransformerProtocol, metaclass=ABCMeta):
             )
             return None
 
-        return concept.name, pl.scan_parquet(concept_path)
+        return concept.name, self._step.filter_cohort(pl.scan_parquet(concept_path))
 
     @abstractmethod
     def transform(self, dependencies: dict[str, pl.LazyFrame]) -> pl.LazyFrame:
@@ -0,0 +1,138 @@
+"""In-memory cache for materialized join tables.
+
+Many table configurations join the same small dimension tables (e.g. item
+dictionaries or stay tables). This module provides a process-wide LRU cache
+that keeps those tables materialized, so repeated joins reuse the parsed frame
+instead of reading and converting the source again.
+"""
+
+from collections import OrderedDict
+from collections.abc import Hashable
+
+import polars as pl
+
+from open_icu.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class JoinTableCache:
+    """LRU cache of materialized join tables bounded by a byte budget.
+
+    The size of an entry is the estimated in-memory size of its frame. When an
+    insert exceeds the budget, the least recently used entries are evicted.
+    Frames larger than the whole budget are not cached.
+
+    Attributes:
+        max_bytes: Byte budget of all cached frames. ``0`` disables caching.
+        size: Summed estimated size of the cached frames in bytes
+    """
+
+    def __init__(self, max_bytes: int = 0) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_bytes: Byte budget of all cached frames
+        """
+        self._max_bytes = max_bytes
+        self._frames: OrderedDict[Hashable, pl.DataFrame] = OrderedDict()
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached frames."""
+        return len(self._frames)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check whether a frame is cached under the key."""
+        return key in self._frames
+
+    @property
+    def max_bytes(self) -> int:
+        """Get the byte budget.
+
+        Returns:
+            Byte budget of all cached frames
+        """
+        return self._max_bytes
+
+    @property
+    def size(self) -> int:
+        """Get the summed size of the cached frames.
+
+        Returns:
+            Estimated size of all cached frames in bytes
+        """
+        return self._size
+
+    def resize(self, max_bytes: int) -> None:
+        """Change the byte budget, evicting entries that no longer fit.
+
+        Args:
+            max_bytes: New byte budget. ``0`` disables caching.
+        """
+        self._max_bytes = max_bytes
+        self._evict()
+
+    def get(self, key: Hashable) -> pl.DataFrame | None:
+        """Get a cached frame and mark it as most recently used.
+
+        Args:
+            key: Cache key of the frame
+
+        Returns:
+            The cached frame, or None if it is not cached
+        """
+        df = self._frames.get(key)
+        if df is not None:
+            self._frames.move_to_end(key)
+        return df
+
+    def put(self, key: Hashable, df: pl.DataFrame) -> None:
+        """Cache a frame, evicting the least recently used frames if needed.
+
+        Args:
+            key: Cache key of the frame
+            df: Materialized frame to cache
+        """
+        size = df.estimated_size()
+        if size > self._max_bytes:
+            logger.debug("Not caching join table of %d bytes (budget %d bytes)", size, self._max_bytes)
+            return
+
+        self.pop(key)
+        self._frames[key] = df
+        self._size += size
+        self._evict()
+
+    def pop(self, key: Hashable) -> pl.DataFrame | None:
+        """Remove a frame from the cache.
+
+        Args:
+            key: Cache key of the frame
+
+        Returns:
+            The removed frame, or None if it was not cached
+        """
+        df = self._frames.pop(key, None)
+        if df is not None:
+            self._size -= df.estimated_size()
+        return df
+
+    def clear(self) -> None:
+        """Remove all cached frames."""
+        self._frames.clear()
+        self._size = 0
+
+    def _evict(self) -> None:
+        while self._frames and self._size > self._max_bytes:
+            _, df = self._frames.popitem(last=False)
+            self._size -= df.estimated_size()
+            logger.debug("Evicted join table of %d bytes from cache", df.estimated_size())
+
+
+join_table_cache = JoinTableCache()
+"""Process-wide cache of materialized join tables used by the extraction step.
+
+It is cleared at the end of :meth:`~open_icu.steps.extraction.step.ExtractionStep.extract`;
+worker processes release it when the pool shuts down.
+"""
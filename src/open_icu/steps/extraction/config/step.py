@@ -6,9 +6,9 @@ including dataset path specifications and custom extraction settings.
 
 from pathlib import Path
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ByteSize, Field
 
-from open_icu.steps.base.config import BaseStepConfig
+from open_icu.steps.base.config import BaseStepConfig, ExecutionConfig
 
 
 class DatasetConfig(BaseModel):
@@ -42,12 +42,44 @@ class ExtractionSettings(BaseModel):
             "default. Individual table configs may override this setting."
         ),
     )
+    fan_out_events: bool = Field(
+        default=True,
+        description=(
+            "Whether all events of a table are written from a single scan of the "
+            "source table. If disabled, the table is re-read for every event."
+        ),
+    )
+    source_cache: bool = Field(
+        default=True,
+        description=(
+            "Whether the configured columns of CSV sources are cached as Parquet "
+            "in the project's cache directory, so later runs skip CSV parsing."
+        ),
+    )
+    join_cache_size: ByteSize = Field(
+        default=ByteSize(512 * 1024**2),
+        description=(
+            "In-memory budget (e.g. '512MB') for materialized join tables that are "
+            "reused by all tables joining the same source. Applies per worker "
+            "process. Set to 0 to disable the cache."
+        ),
+    )
+    hash_sources: bool = Field(
+        default=False,
+        description=(
+            "Whether the fingerprints used to skip unchanged tables on a rerun "
+            "include a hash of the source file contents. By default only the "
+            "size and modification time of the sources are compared."
+        ),
+    )
 
 
 class CustomConfig(BaseModel):
     """Custom configuration specific to the extraction step.
 
     Attributes:
+        settings: Global extraction settings
+        execution: Parallel execution settings
         data: List of source datasets to process
     """
 
@@ -55,6 +87,10 @@ class CustomConfig(BaseModel):
         default_factory=ExtractionSettings,
         description="Global extraction settings.",
     )
+    execution: ExecutionConfig = Field(
+        default_factory=ExecutionConfig,
+        description="Settings for extracting tables in parallel worker processes.",
+    )
     data: list[DatasetConfig] = Field(
         default_factory=list,
         description="List of datasets to be extracted.",
@@ -243,7 +243,5 @@ class TableConfig(BaseDatasetConfig, BaseTableConfig):
 
         super().__init__(**data)
 
-    @computed_field
-    @property
-    def identifier_tuple(self) -> tuple[str, ...]:
+    def _identifier_components(self) -> tuple[str, ...]:
         return self.__open_icu_config_type__, self.dataset, self.version, self.name
@@ -6,31 +6,84 @@ joins, and outputs MEDS-compliant Parquet files.
 """
 
 import gc
+import hashlib
+import json
+import shutil
 from pathlib import Path
 
 import polars as pl
 from polars import LazyFrame
 
-from open_icu.callbacks.interpreter import parse_expr
+from open_icu.callbacks.plan import PlanBuilder
 from open_icu.logging import get_logger
+from open_icu.steps.base.executor import Task, run_tasks
 from open_icu.steps.base.step import ConfigurableBaseStep
+from open_icu.steps.extraction.cache import join_table_cache
 from open_icu.steps.extraction.config.event import EventConfig
 from open_icu.steps.extraction.config.step import ExtractionStepConfig
-from open_icu.steps.extraction.config.table import BaseTableConfig, TableConfig, TableType
+from open_icu.steps.extraction.config.table import BaseTableConfig, JoinTableConfig, TableConfig, TableType
 from open_icu.steps.extraction.registry import dataset_config_registry
+from open_icu.storage.partitioned import PartitionedParquet, data_files
 from open_icu.storage.project import OpenICUProject
 
 logger = get_logger(__name__)
 
 
+# File recording the fingerprint of a table's output, next to its events in the
+# workspace and, once collected, in the step's dataset.
+FINGERPRINT_FILE = "_fingerprint.json"
+
+# Settings that only affect how tables are extracted, not the extracted events.
+_PERFORMANCE_SETTINGS = {"fan_out_events", "source_cache", "join_cache_size", "hash_sources"}
+
+
+def _extract_tables(step: "ExtractionStep", units: list[tuple[TableConfig, Path]]) -> None:
+    """Extract a group of tables sharing an output directory, in order.
+
+    The group is skipped if its output was extracted from the same sources with
+    the same configuration before (see :meth:`ExtractionStep.fingerprint`).
+    Otherwise its previous output is removed and the tables are extracted again.
+    """
+    join_table_cache.resize(step._config.config.settings.join_cache_size)
+
+    table = units[0][0]
+    fingerprint = step.fingerprint(units)
+    if step.recorded_fingerprint(table) == fingerprint:
+        logger.info(
+            "Table %s of dataset %s (version %s) is up to date, skipping",
+            table.name,
+            table.dataset,
+            table.version,
+        )
+        return
+    step.clear_output(table)
+
+    for table, path in units:
+        logger.info(
+            "Extracting table %s from dataset %s (version %s)",
+            table.name,
+            table.dataset,
+            table.version,
+        )
+        step._extract(table, path)
+
+    step.record_fingerprint(units[0][0], fingerprint)
+
+
 class ExtractionStep(ConfigurableBaseStep[ExtractionStepConfig, TableConfig]):
     """Data extraction step for transforming source ICU data to MEDS format.
 
     Reads CSV files specified in TableConfig objects, applies pre/post callbacks,
     performs table joins, extracts events with column mappings, and writes
     MEDS-compliant Parquet files to the workspace directory.
+
+    The step is incremental: the output of every table records a fingerprint
+    of its sources and configuration (see :meth:`fingerprint`), and re-running
+    the step only extracts tables whose fingerprint changed.
     """
 
+    incremental = True
+
     @classmethod
     def load(cls, project: OpenICUProject, config_path: Path) -> "ExtractionStep":
         """Load an extraction step from a configuration file.
@@ -45,6 +98,15 @@ class ExtractionStep(ConfigurableBaseStep[ExtractionStepConfig, TableConfig]):
         config = ExtractionStepConfig.load(config_path)
         return cls(project, config, dataset_config_registry)
 
+    @property
+    def registry_scopes(self) -> list[tuple[str, ...]]:
+        """Get the dataset versions whose tables are in use.
+
+        Returns:
+            (dataset name, version) pairs of the configured data sources
+        """
+        return [(cfg.name, cfg.version) for cfg in self._config.config.data]
+
     def extract(self) -> None:
         """Execute the data extraction workflow.
 
@@ -55,8 +117,22 @@ class ExtractionStep(ConfigurableBaseStep[ExtractionStepConfig, TableConfig]):
         4. Extract events with column mappings
         5. Write MEDS-compliant Parquet files
 
-        The extracted data is written to workspace_dir/dataset/table/event.parquet
+        The extracted data is written to workspace_dir/dataset/version/table/event/,
+        one part file per contribution (see :meth:`_write_events`).
+
+        Tables are independent units of work. With ``execution.jobs > 1`` they
+        are extracted in worker processes, scheduled by their estimated memory
+        cost (see :meth:`_estimate_cost`) within ``execution.memory_budget``.
+        The registry holds each table once, but a dataset may be listed several
+        times in ``config.data`` (e.g. the same dataset split over two
+        directories), in which case its tables are extracted once per entry and
+        appended to the same event files. Such repeated tables are grouped into
+        a single task, so appends to an event file never run concurrently.
+
+        Join tables cached while extracting in the current process are released
+        once all tables are extracted.
         """
+        groups: dict[tuple[str, ...], list[tuple[TableConfig, Path]]] = {}
         for cfg in self._config.config.data:
             for table in self._registry.filter(
                 cfg.name,
@@ -64,17 +140,199 @@ class ExtractionStep(ConfigurableBaseStep[ExtractionStepConfig, TableConfig]):
                 includes=cfg.includes,
                 excludes=cfg.excludes,
             ):
-                logger.info(
-                    "Extracting table %s from dataset %s (version %s)",
-                    table.name,
-                    cfg.name,
-                    cfg.version,
-                )
-                self._extract(table, cfg.path)
+                groups.setdefault(table.identifier_tuple[1:], []).append((table, cfg.path))
+
+        tasks = [
+            Task(
+                key=output,
+                args=(units,),
+                cost=sum(self._estimate_cost(table, path) for table, path in units),
+            )
+            for output, units in groups.items()
+        ]
+        try:
+            run_tasks(_extract_tables, tasks, self, self._config.config.execution)
+        finally:
+            join_table_cache.clear()
+
+    def table_output_dir(self, table: TableConfig) -> Path:
+        """Return the workspace directory the events of a table are written to.
+
+        Args:
+            table: Configuration of the table
+
+        Returns:
+            Path of the form ``<workspace>/<dataset>/<version>/<table>``
+        """
+        assert self._workspace_dir is not None
+        return Path(self._workspace_dir.path, *table.identifier_tuple[1:])
+
+    def _source_fingerprint(self, source_table: BaseTableConfig, path: Path) -> list | None:
+        try:
+            source = self._resolve_source(source_table, path)
+        except FileNotFoundError:
+            return None
+
+        fingerprint = []
+        for file in source if isinstance(source, list) else [source]:
+            stat = file.stat()
+            entry = [str(file.resolve()), stat.st_size, stat.st_mtime_ns]
+            if self._config.config.settings.hash_sources:
+                with open(file, "rb") as f:
+                    entry.append(hashlib.file_digest(f, "sha256").hexdigest())
+            fingerprint.append(entry)
+        return fingerprint
+
+    def fingerprint(self, units: list[tuple[TableConfig, Path]]) -> str:
+        """Compute the fingerprint of the output of a group of tables.
+
+        The fingerprint covers the resolved table configurations (including
+        joins, callbacks, filters and events), the output-relevant extraction
+        settings, the cohort, and the source files of the tables and their
+        joins (path, size, modification time and, with
+        ``settings.hash_sources``, a hash of their contents). Missing sources are part of the fingerprint as well,
+        so a table is extracted once its source appears.
+
+        Args:
+            units: Tables sharing an output directory and the data directories
+                they are read from
+
+        Returns:
+            Hex digest identifying the output
+        """
+        payload = {
+            "settings": self._config.config.settings.model_dump(mode="json", exclude=_PERFORMANCE_SETTINGS),
+            "cohort": self.cohort_hash,
+            "tables": [
+                {
+                    "config": table.model_dump(),
+                    "sources": [self._source_fingerprint(source_table, path) for source_table in [table, *table.join]],
+                }
+                for table, path in units
+            ],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _fingerprint_path(self, table: TableConfig) -> Path:
+        return self.table_output_dir(table) / FINGERPRINT_FILE
+
+    def recorded_fingerprint(self, table: TableConfig) -> str | None:
+        """Get the fingerprint recorded for the output of a table.
+
+        Args:
+            table: Configuration of the table
+
+        Returns:
+            The fingerprint of the existing output, or None if there is none
+        """
+        path = self._fingerprint_path(table)
+        if not path.exists():
+            return None
+        with open(path, "r") as f:
+            return json.load(f)["fingerprint"]
+
+    def record_fingerprint(self, table: TableConfig, fingerprint: str) -> None:
+        """Record the fingerprint of a table output that has been written.
+
+        Args:
+            table: Configuration of the table
+            fingerprint: The fingerprint the output was computed with
+        """
+        path = self._fingerprint_path(table)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"fingerprint": fingerprint}, f, indent=4)
+        tmp_path.replace(path)
+
+    def clear_output(self, table: TableConfig) -> None:
+        """Remove the output of a table before it is extracted again.
+
+        Removes the table's events and fingerprint from the workspace, and the
+        events collected into the step's dataset, so no outdated part files
+        remain next to the new ones.
+
+        Args:
+            table: Configuration of the table
+        """
+        output_dirs = [self.table_output_dir(table)]
+        if self._dataset is not None:
+            output_dirs.append(Path(self._dataset.data_path, *table.identifier_tuple[1:]))
+
+        for output_dir in output_dirs:
+            if output_dir.exists():
+                logger.info("Removing outdated output of table %s at %s", table.name, output_dir)
+                shutil.rmtree(output_dir)
+
+    def collect(self) -> None:
+        """Collect the tables extracted in this run into the step's dataset.
+
+        A table is collected if the fingerprint recorded in the workspace
+        differs from the one collected with its events into the dataset. The
+        fingerprint is copied last, so an interrupted collection is repeated.
+        If no table changed, the dataset, including its code vocabulary, is
+        left untouched.
+        """
+        if self._workspace_dir is None or self._dataset is None:
+            super().collect()
+            return
+
+        changed = [
+            fingerprint.parent
+            for fingerprint in sorted(self._workspace_dir.path.rglob(FINGERPRINT_FILE))
+            if not self._is_collected(fingerprint)
+        ]
+        if not changed and (self._dataset.metadata_path / "codes.parquet").exists():
+            logger.info("All tables of step '%s' are collected, skipping collection", self._step_name)
+            return
+
+        logger.info(
+            "Collecting %d table(s) of step '%s' into dataset at %s",
+            len(changed),
+            self._step_name,
+            self._dataset.data_path,
+        )
+        for table_dir in changed:
+            self.collect_files([*data_files(table_dir), table_dir / FINGERPRINT_FILE])
+
+        self._dataset.write_metadata(self._config.dataset.metadata)
+        self._dataset.write_codes()
+
+    def _is_collected(self, fingerprint: Path) -> bool:
+        """Check whether a table's recorded fingerprint has been collected into the dataset."""
+        assert self._workspace_dir is not None and self._dataset is not None
+        collected = self._dataset.data_path / fingerprint.relative_to(self._workspace_dir.path)
+        return collected.is_file() and collected.read_bytes() == fingerprint.read_bytes()
+
+    def _estimate_cost(self, table: TableConfig, path: Path) -> int:
+        """Estimate the peak memory needed to extract a table.
+
+        The estimate is the on-disk size of the table's source files, including
+        all joined tables, scaled by ``execution.memory_factor``. Missing sources
+        count as zero, since the table is skipped in that case.
+
+        Args:
+            table: Configuration of the table
+            path: Base path to the data directory
+
+        Returns:
+            Estimated memory in bytes
+        """
+        size = 0
+        for source_table in [table, *table.join]:
+            try:
+                source = self._resolve_source(source_table, path)
+            except FileNotFoundError:
+                continue
+
+            sources = source if isinstance(source, list) else [source]
+            size += sum(file.stat().st_size for file in sources)
+
+        return int(size * self._config.config.execution.memory_factor)
 
     def _extract(self, table: TableConfig, path: Path) -> None:
         try:
-            lf = self._read_table(table, path)
+            plan = self._read_table(table, path)
 
             for join_table in table.join:
                 # Use broadcast join with small right table
@@ -83,22 +341,24 @@ class ExtractionStep(ConfigurableBaseStep[ExtractionStepConfig, TableConfig]):
                     table.name,
                     join_table.path,
                 )
-                join_lf = self._read_table(join_table, path)
-
-                lf = lf.join(
-                    join_lf,
-                    how=join_table.how,  # ty: ignore[invalid-argument-type]
-                    coalesce=True,  # Reduces memory by coalescing join keys
-                    **join_table.join_params,  # ty: ignore[invalid-argument-type]
+                join_lf = self._read_join_table(join_table, path)
+
+                plan = plan.pipe(
+                    plan.lf.join(
+                        join_lf,
+                        how=join_table.how,  # ty: ignore[invalid-argument-type]
+                        coalesce=True,  # Reduces memory by coalescing join keys
+                        **join_table.join_params,  # ty: ignore[invalid-argument-type]
+                    )
                 )
 
-                lf = self._apply_callbacks(
-                    lf,
+                plan = self._apply_callbacks(
+                    plan,
                     join_table.post_join_callbacks,
                     callback_type="Post-join callback",
                 )
-                lf = self._apply_filters(
-                    lf,
+                plan = self._apply_filters(
+                    plan,
                     join_table.post_join_filters,
                     callback_type="Post-join filter",
                 )
@@ -109,155 +369,214 @@ class ExtractionStep(ConfigurableBaseStep[ExtractionStepConfig, TableConfig]):
 
         logger.info("Processing table %s", table.name)
 
-        lf = self._apply_callbacks(
-            lf,
+        plan = self._apply_callbacks(
+            plan,
             table.post_join_callbacks,
             callback_type="Table post-join callback",
         )
-        lf = self._apply_filters(
-            lf,
+        plan = self._apply_filters(
+            plan,
             table.post_join_filters,
             callback_type="Table post-join filter",
         )
-        lf = self._apply_transformations(
-            lf,
+        plan = self._apply_transformations(
+            plan,
             table.transformations,
             callback_type="Table transformation",
         )
+        # Events are built on top of the table plan, which must not be merged
+        # into their batches to remain a subplan shared by all of them.
+        plan = plan.flush()
 
-        for event in table.events:
-            logger.debug(
-                "Processing event %s for table %s",
-                event.name,
-                table.name,
-            )
+        if self._config.config.settings.fan_out_events:
+            self._write_events_fan_out(plan, table)
+        else:
+            for event in table.events:
+                self._write_events(table, [(event, self._build_event(plan, table, event))])
 
-            event_identifier: tuple[str, ...] = table.identifier_tuple[1:] + (event.name,)
-            event_lf = lf
+        del plan
+        gc.collect()
 
-            event_lf = self._apply_callbacks(
-                event_lf,
-                event.pre_callbacks,
-                callback_type="Event pre-callback",
-            )
+    def _build_event(self, plan: PlanBuilder, table: TableConfig, event: EventConfig) -> LazyFrame:
+        """Build the MEDS plan of one event on top of the shared table plan.
 
-            # Add missing columns
-            if event.columns.text_value is None:
-                event_lf = event_lf.with_columns(pl.lit(None, dtype=pl.String).alias("text_value"))
-            if event.columns.numeric_value is None:
-                event_lf = event_lf.with_columns(pl.lit(None, dtype=pl.Float32).alias("numeric_value"))
-
-            # Rename columns
-            columns = event.columns.model_dump()
-            extension = columns.pop("extension")
-            columns.pop("code", None)
-
-            for col_name, col_expr in columns.items():
-                if col_expr is not None:
-                    event_lf = event_lf.with_columns(
-                        self._parse_expr(
-                            event_lf,
-                            col_expr,
-                            callback_type="Event column mapping",
-                        ).alias(col_name)
-                    )
+        With a cohort, the event is restricted to the cohort's subjects.
 
-            for col_name, col_expr in extension.items():
-                if col_expr is not None:
-                    event_lf = event_lf.with_columns(
-                        self._parse_expr(
-                            event_lf,
-                            col_expr,
-                            callback_type="Event extension mapping",
-                        ).alias(col_name)
-                    )
+        Args:
+            plan: The table plan after joins, post-join callbacks/filters and
+                transformations
+            table: Configuration of the table the event belongs to
+            event: Configuration of the event to build
 
-            # Create code column.
-            #
-            # Event-specific code structure:
-            # code_prefix // [event_name //] columns.code // code_suffix
-            #
-            # The event name is included by default and can be disabled through
-            # the global extraction settings or a table-specific override.
-            code_expr = self._build_code_expr(event_lf, table, event)
-
-            # Add constructed MEDS code column
-            event_lf = event_lf.with_columns(code_expr)
-
-            # Apply event callbacks
-            event_lf = self._apply_callbacks(
-                event_lf,
-                event.callbacks,
-                callback_type="Event callback",
-            )
+        Returns:
+            LazyFrame with the MEDS columns and the event's extension columns
+        """
+        logger.debug(
+            "Processing event %s for table %s",
+            event.name,
+            table.name,
+        )
 
-            event_lf = self._apply_filters(
-                event_lf,
-                event.filters,
-                callback_type="Event filter",
-            )
+        event_plan = self._apply_callbacks(
+            plan,
+            event.pre_callbacks,
+            callback_type="Event pre-callback",
+        )
 
-            event_lf = self._apply_transformations(
-                event_lf,
-                event.transformations,
-                callback_type="Event transformation",
-            )
+        # Add missing columns
+        if event.columns.text_value is None:
+            event_plan = event_plan.with_columns(pl.lit(None, dtype=pl.String).alias("text_value"))
+        if event.columns.numeric_value is None:
+            event_plan = event_plan.with_columns(pl.lit(None, dtype=pl.Float32).alias("numeric_value"))
+
+        # Rename columns
+        columns = event.columns.model_dump()
+        extension = columns.pop("extension")
+        columns.pop("code", None)
+
+        for col_name, col_expr in columns.items():
+            if col_expr is not None:
+                event_plan = event_plan.with_columns(
+                    self._parse_expr(
+                        event_plan,
+                        col_expr,
+                        callback_type="Event column mapping",
+                    ).alias(col_name)
+                )
 
-            # Reorder columns
-            event_lf = event_lf.select(
-                [
-                    pl.col("subject_id").cast(pl.Int64),
-                    pl.col("time").cast(pl.Datetime(time_unit="us")),
-                    pl.col("code").cast(pl.String),
-                    pl.col("numeric_value").cast(pl.Float32, strict=False),
-                    pl.col("text_value").cast(pl.String),
-                ]
-                + [pl.col(col) for col in event.columns.extension.keys()]
-            )
+        for col_name, col_expr in extension.items():
+            if col_expr is not None:
+                event_plan = event_plan.with_columns(
+                    self._parse_expr(
+                        event_plan,
+                        col_expr,
+                        callback_type="Event extension mapping",
+                    ).alias(col_name)
+                )
 
-            event_lf = self._apply_filters(
-                event_lf,
-                event.output_filters,
-                callback_type="Event output filter",
-            )
+        # Create code column.
+        #
+        # Event-specific code structure:
+        # code_prefix // [event_name //] columns.code // code_suffix
+        #
+        # The event name is included by default and can be disabled through
+        # the global extraction settings or a table-specific override.
+        code_expr = self._build_code_expr(event_plan, table, event)
+
+        # Add constructed MEDS code column
+        event_plan = event_plan.with_columns(code_expr)
+
+        # Apply event callbacks
+        event_plan = self._apply_callbacks(
+            event_plan,
+            event.callbacks,
+            callback_type="Event callback",
+        )
 
-            # Ensure output directory exists
-            assert self._workspace_dir is not None
-            output_data_path = Path(self._workspace_dir.path, *event_identifier[:-1])
-            output_data_path.mkdir(parents=True, exist_ok=True)
+        event_plan = self._apply_filters(
+            event_plan,
+            event.filters,
+            callback_type="Event filter",
+        )
 
-            # Write to parquet with streaming
-            output_file = output_data_path / f"{event.name}.parquet"
-            logger.info(
-                "Writing event %s for table %s to %s",
-                event.name,
+        event_plan = self._apply_transformations(
+            event_plan,
+            event.transformations,
+            callback_type="Event transformation",
+        )
+
+        # Reorder columns
+        event_plan = event_plan.select(
+            pl.col("subject_id").cast(pl.Int64),
+            pl.col("time").cast(pl.Datetime(time_unit="us")),
+            pl.col("code").cast(pl.String),
+            pl.col("numeric_value").cast(pl.Float32, strict=False),
+            pl.col("text_value").cast(pl.String),
+            *[pl.col(col) for col in event.columns.extension.keys()],
+        )
+
+        event_plan = self._apply_filters(
+            event_plan,
+            event.output_filters,
+            callback_type="Event output filter",
+        )
+
+        cohort = self.cohort_predicate()
+        if cohort is not None:
+            event_plan = event_plan.filter(cohort)
+
+        return event_plan.lf
+
+    def _write_events_fan_out(self, plan: PlanBuilder, table: TableConfig) -> None:
+        """Write all events of a table from a single evaluation of the table plan.
+
+        The event sinks are executed together with ``pl.collect_all``, which
+        caches the subplan they share (reading, joins, post-join callbacks,
+        filters and transformations), so the source is parsed once per table
+        instead of once per event. Events writing to the same output dataset are
+        spread over consecutive passes, so that each pass reserves its part file
+        after the previous part has been committed.
+        """
+        passes: list[list[EventConfig]] = []
+        for event in table.events:
+            for events in passes:
+                if all(other.name != event.name for other in events):
+                    events.append(event)
+                    break
+            else:
+                passes.append([event])
+
+        for events in passes:
+            logger.debug(
+                "Writing %d event(s) of table %s in a single pass",
+                len(events),
                 table.name,
-                output_file,
             )
+            self._write_events(table, [(event, self._build_event(plan, table, event)) for event in events])
+
+    def _write_events(self, table: TableConfig, events: list[tuple[EventConfig, LazyFrame]]) -> None:
+        """Sink event plans to new part files in one ``collect_all`` call.
+
+        Every event is stored as a partitioned dataset (see
+        :class:`~open_icu.storage.partitioned.PartitionedParquet`). Each call
+        adds one immutable part file per event, so appending to an event that
+        already exists (e.g. several table configs write to the same event) only
+        writes the new rows. Parts are committed once all sinks have finished.
 
-            if output_file.exists():
+        Args:
+            table: Configuration of the table the events belong to
+            events: Pairs of event configuration and event plan; the output
+                datasets must be distinct
+        """
+        assert self._workspace_dir is not None
+
+        sinks: list[LazyFrame] = []
+        parts: list[tuple[PartitionedParquet, Path]] = []
+        for event, event_lf in events:
+            event_identifier: tuple[str, ...] = table.identifier_tuple[1:] + (event.name,)
+            output = PartitionedParquet(Path(self._workspace_dir.path, *event_identifier))
+
+            if output.exists():
                 logger.info(
                     "Existing output found for event %s, appending to it",
                     event.name,
                 )
 
-                existing_lf = pl.scan_parquet(output_file)
-
-                event_lf = pl.concat(
-                    [existing_lf, event_lf],
-                    how="vertical",
-                )
-                tmp_output_file = output_data_path / f"{event.name}.tmp.parquet"
+            part = output.new_part()
+            logger.info(
+                "Writing event %s for table %s to %s",
+                event.name,
+                table.name,
+                part,
+            )
 
-                event_lf.sink_parquet(tmp_output_file)
-                tmp_output_file.replace(output_file)
-            else:
-                event_lf.sink_parquet(output_file)
+            sinks.append(event_lf.sink_parquet(part, lazy=True))
+            parts.append((output, part))
 
-            del event_lf
+        pl.collect_all(sinks, engine="streaming")
 
-        del lf
-        gc.collect()
+        for output, part in parts:
+            output.commit(part)
 
     @staticmethod
     def _resolve_source(table: BaseTableConfig, path: Path) -> Path | list[Path]:
@@ -280,19 +599,65 @@ class ExtractionStep(ConfigurableBaseStep[ExtractionStepConfig, TableConfig]):
             raise FileNotFoundError(f"file not found ({file_path})")
         return file_path
 
-    def _read_table(self, table: BaseTableConfig, path: Path) -> pl.LazyFrame:
+    def _read_join_table(self, table: JoinTableConfig, path: Path) -> pl.LazyFrame:
+        """Read a join table through the process-wide join table cache.
+
+        Join tables are usually small dimension tables joined by many tables.
+        They are materialized once and kept in
+        :data:`~open_icu.steps.extraction.cache.join_table_cache`, keyed by the
+        source files (path, size and modification time) and the configuration
+        that determines the read result: columns, dtypes, callbacks and filters.
+
+        Args:
+            table: Configuration of the join table
+            path: Base path to the data directory
+
+        Returns:
+            LazyFrame with the transformed join table data
+        """
+        if not join_table_cache.max_bytes:
+            return self._read_table(table, path).lf
+
+        source = self._resolve_source(table, path)
+        sources = source if isinstance(source, list) else [source]
+        fingerprint = tuple((str(file.resolve()), file.stat().st_size, file.stat().st_mtime_ns) for file in sources)
+        signature = table.model_dump(
+            include={"type", "columns", "pre_callbacks", "pre_filters", "callbacks", "filters"}
+        )
+        key = (fingerprint, json.dumps(signature, sort_keys=True, default=str))
+
+        df = join_table_cache.get(key)
+        if df is None:
+            df = self._read_table(table, path).lf.collect()
+            join_table_cache.put(key, df)
+        else:
+            logger.debug("Reusing cached join table %s", table.path)
+
+        return df.lazy()
+
+    def _read_table(self, table: BaseTableConfig, path: Path) -> PlanBuilder:
         """Read and transform a table from CSV.
 
         Scans the CSV file, applies schema overrides, executes pre-callbacks,
         applies pre-filters, converts datetime columns, executes callbacks, and
         applies filters.
 
+        With ``settings.source_cache`` enabled, CSV sources are read through the
+        project's :class:`~open_icu.storage.cache.SourceCache`: the configured
+        columns are parsed once and later runs scan the cached Parquet file as
+        long as the source file and the declared dtypes are unchanged.
+
+        With a cohort (see :attr:`cohort`), the rows of a table whose events all
+        take their subject ID from the same source column are restricted to
+        the cohort here, before any join. The events are restricted to the
+        cohort as well (see :meth:`_build_event`).
+
         Args:
             table: Configuration for the table to read
             path: Base path to the data directory
 
         Returns:
-            LazyFrame with the transformed table data
+            Plan of the transformed table data
         """
         source = self._resolve_source(table, path)
 
@@ -305,6 +670,11 @@ class ExtractionStep(ConfigurableBaseStep[ExtractionStepConfig, TableConfig]):
             casts = [pl.col(col.name).cast(col.dtype, strict=False) for col in table.columns if col.type != "datetime"]
             if casts:
                 lf = lf.with_columns(casts)
+        elif self._config.config.settings.source_cache:
+            sources = source if isinstance(source, list) else [source]
+            cache = self._project.source_cache
+            hash_contents = self._config.config.settings.hash_sources
+            lf = pl.concat([cache.scan_csv(file, table.dtypes, hash_contents) for file in sources])
         else:
             lf = pl.scan_csv(
                 source,
@@ -314,13 +684,14 @@ class ExtractionStep(ConfigurableBaseStep[ExtractionStepConfig, TableConfig]):
             )
             lf = lf.select(table.dtypes.keys())
 
-        lf = self._apply_callbacks(
-            lf,
+        plan = PlanBuilder(lf, table.dtypes)
+        plan = self._apply_callbacks(
+            plan,
             table.pre_callbacks,
             callback_type="Table pre-callback",
         )
-        lf = self._apply_filters(
-            lf,
+        plan = self._apply_filters(
+            plan,
             table.pre_filters,
             callback_type="Table pre-filter",
         )
@@ -329,29 +700,55 @@ class ExtractionStep(ConfigurableBaseStep[ExtractionStepConfig, TableConfig]):
         if datetime_cols:
             # CSV reads datetimes as strings; Parquet may store them either as
             # native temporal types or as strings, so branch on the actual dtype.
-            schema = lf.collect_schema()
+            schema = plan.lf.collect_schema()
             for col in datetime_cols:
                 if schema.get(col.name) == pl.String:
-                    lf = lf.with_columns(pl.col(col.name).str.to_datetime(**col.params).alias(col.name))
+                    plan = plan.with_columns(pl.col(col.name).str.to_datetime(**col.params).alias(col.name))
                 else:
-                    lf = lf.with_columns(pl.col(col.name).cast(pl.Datetime("us"), strict=False).alias(col.name))
+                    plan = plan.with_columns(pl.col(col.name).cast(pl.Datetime("us"), strict=False).alias(col.name))
 
-        lf = self._apply_callbacks(
-            lf,
+        plan = self._apply_callbacks(
+            plan,
             table.callbacks,
             callback_type="Table callback",
         )
-        lf = self._apply_filters(
-            lf,
+        plan = self._apply_filters(
+            plan,
             table.filters,
             callback_type="Table filter",
         )
 
-        return lf
+        # Restrict the table to the cohort before it is joined, if all of its
+        # events take the subject ID from the same column of the table.
+        if self.cohort is not None and isinstance(table, TableConfig):
+            subject_column = self._subject_column(plan, table)
+            if subject_column is not None:
+                plan = plan.filter(pl.col(subject_column).cast(pl.Int64, strict=False).is_in(self.cohort))
+
+        return plan
+
+    def _subject_column(self, plan: PlanBuilder, table: TableConfig) -> str | None:
+        """Get the column of a table all of its events take their subject ID from.
+
+        Args:
+            plan: Plan of the table before any join
+            table: Configuration of the table
+
+        Returns:
+            The column name, or None if the events map different columns or
+            expressions other than a column of the table
+        """
+        columns = set()
+        for event in table.events:
+            expr = self._parse_expr(plan, event.columns.subject_id, callback_type="Event column mapping")
+            if not expr.meta.is_column():
+                return None
+            columns.add(expr.meta.output_name())
+        return columns.pop() if len(columns) == 1 else None
 
     def _build_code_expr(
         self,
-        lf: LazyFrame,
+        plan: PlanBuilder,
         table: TableConfig,
         event: EventConfig,
     ) -> pl.Expr:
@@ -372,7 +769,7 @@ class ExtractionStep(ConfigurableBaseStep[ExtractionStepConfig, TableConfig]):
 
         prefix_parts = [
             self._parse_expr(
-                lf,
+                plan,
                 expr,
                 callback_type="Event code prefix",
             )
@@ -381,7 +778,7 @@ class ExtractionStep(ConfigurableBaseStep[ExtractionStepConfig, TableConfig]):
 
         event_code_parts = [
             self._parse_expr(
-                lf,
+                plan,
                 expr,
                 callback_type="Event code part",
             )
@@ -390,7 +787,7 @@ class ExtractionStep(ConfigurableBaseStep[ExtractionStepConfig, TableConfig]):
 
         suffix_parts = [
             self._parse_expr(
-                lf,
+                plan,
                 expr,
                 callback_type="Event code suffix",
             )
@@ -427,9 +824,9 @@ class ExtractionStep(ConfigurableBaseStep[ExtractionStepConfig, TableConfig]):
         ).alias("code")
 
     @staticmethod
-    def _parse_expr(lf: LazyFrame, expr: str, callback_type: str) -> pl.Expr:
+    def _parse_expr(plan: PlanBuilder, expr: str, callback_type: str) -> pl.Expr:
         """Parse a configured expression and validate that it returns a Polars expression."""
-        result = parse_expr(lf, expr)
+        result = plan.parse(expr)
 
         if not isinstance(result, pl.Expr):
             raise TypeError(f"{callback_type} {expr!r} must return a Polars Expr, got {type(result).__name__}")
@@ -438,53 +835,53 @@ class ExtractionStep(ConfigurableBaseStep[ExtractionStepConfig, TableConfig]):
 
     def _apply_callbacks(
         self,
-        lf: LazyFrame,
+        plan: PlanBuilder,
         callbacks: list[str],
         callback_type: str,
-    ) -> LazyFrame:
+    ) -> PlanBuilder:
         """Apply expression callbacks with LazyFrame.with_columns."""
         for expr in callbacks:
-            lf = lf.with_columns(
+            plan = plan.with_columns(
                 self._parse_expr(
-                    lf,
+                    plan,
                     expr,
                     callback_type=callback_type,
                 )
             )
 
-        return lf
+        return plan
 
     def _apply_filters(
         self,
-        lf: LazyFrame,
+        plan: PlanBuilder,
         filters: list[str],
         callback_type: str,
-    ) -> LazyFrame:
+    ) -> PlanBuilder:
         """Apply expression filters with LazyFrame.filter."""
         for expr in filters:
-            lf = lf.filter(
+            plan = plan.filter(
                 self._parse_expr(
-                    lf,
+                    plan,
                     expr,
                     callback_type=callback_type,
                 )
             )
 
-        return lf
+        return plan
 
     @staticmethod
     def _apply_transformations(
-        lf: LazyFrame,
+        plan: PlanBuilder,
         transformations: list[str],
         callback_type: str,
-    ) -> LazyFrame:
+    ) -> PlanBuilder:
         """Apply frame transformations that return LazyFrame objects."""
         for expr in transformations:
-            result = parse_expr(lf, expr)
+            result = plan.parse(expr)
 
             if not isinstance(result, LazyFrame):
                 raise TypeError(f"{callback_type} {expr!r} must return a LazyFrame, got {type(result).__name__}")
 
-            lf = result
+            plan = plan.pipe(result)
 
-        return lf
+        return plan
@@ -3,7 +3,8 @@
 The persistence step uses an extraction configuration to determine which
 source CSV columns are required and writes those columns as Parquet files.
 The generated files are independent artifacts and are not used by the
-extraction step.
+extraction step. A source already converted by the project's source cache is
+read from there instead of parsing the CSV file again.
 """
 
 from pathlib import Path
@@ -49,6 +50,15 @@ class PersistenceStep(
             dataset_config_registry,
         )
 
+    @property
+    def registry_scopes(self) -> list[tuple[str, ...]]:
+        """Get the dataset versions whose tables are in use.
+
+        Returns:
+            (dataset name, version) pairs of the configured data sources
+        """
+        return [(cfg.name, cfg.version) for cfg in self._config.config.data]
+
     def extract(self) -> None:
         """Persist the source columns selected by the extraction configuration."""
         assert self._workspace_dir is not None
@@ -126,12 +136,20 @@ class PersistenceStep(
             output_file,
         )
 
-        pl.scan_csv(
-            source_file,
-            schema_overrides=dtypes,
-            infer_schema=False,
-            low_memory=True,
-        ).select(
+        # Write the persisted table once: reuse an existing cache entry, but do
+        # not fill the cache here, extraction converts the sources it reads.
+        entry = self._project.source_cache.get(source_file, dtypes)
+        if entry is not None:
+            source = pl.scan_parquet(entry)
+        else:
+            source = pl.scan_csv(
+                source_file,
+                schema_overrides=dtypes,
+                infer_schema=False,
+                low_memory=True,
+            )
+
+        source.select(
             list(dtypes),
         ).sink_parquet(
             output_file,
@@ -1,8 +1,10 @@
 """Configuration models for the sharding step."""
 
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
-from open_icu.steps.base.config import BaseStepConfig
+from open_icu.steps.base.config import BaseStepConfig, ExecutionConfig
 
 
 class CustomConfig(BaseModel):
@@ -22,7 +24,16 @@ class CustomConfig(BaseModel):
         subjects: Subject IDs to include. An empty list includes all available
             subjects.
         subjects_per_shard: Maximum number of subjects written to each shard
-            file.
+            file when balancing by subjects.
+        balance_by: Whether shards hold an equal number of subjects
+            (``subjects``) or about an equal number of rows (``rows``).
+        rows_per_shard: Targeted number of rows per shard file when balancing
+            by rows.
+        single_pass: Whether to route all rows to their shards in a single scan
+            of the concept files instead of scanning them once per shard.
+        row_group_size: Number of rows per row group of a shard file. The
+            rows of a subject may span several row groups.
+        execution: Settings for writing shards in parallel worker processes
     """
 
     concept_step: str = Field(
@@ -49,6 +60,30 @@ class CustomConfig(BaseModel):
         gt=0,
         description="Number of subjects written per shard file.",
     )
+    balance_by: Literal["subjects", "rows"] = Field(
+        default="subjects",
+        description=(
+            "Balance shards by their number of subjects, or pack subjects into shards with about equal row counts."
+        ),
+    )
+    rows_per_shard: int = Field(
+        default=10_000_000,
+        gt=0,
+        description="Targeted number of rows per shard file when balancing by rows.",
+    )
+    single_pass: bool = Field(
+        default=True,
+        description="Scan the concept files once and bucket rows by shard instead of scanning them per shard.",
+    )
+    row_group_size: int = Field(
+        default=100_000,
+        gt=0,
+        description="Number of rows per row group of a shard file.",
+    )
+    execution: ExecutionConfig = Field(
+        default_factory=ExecutionConfig,
+        description="Settings for sorting and writing independent shards in parallel worker processes.",
+    )
 
 
 class ShardingStepConfig(BaseStepConfig[CustomConfig]):
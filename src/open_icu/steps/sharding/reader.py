@@ -0,0 +1,158 @@
+"""Subject index and random access to sharding step output.
+
+The sharding step writes every shard sorted by subject and records for every
+subject the shard file and the range of row groups holding its rows in a
+subject index (``metadata/subject_shards.parquet``). The
+ShardReader uses the index to read the timeline of a single subject from the
+footer and the relevant row groups of one shard, instead of scanning all
+shards.
+"""
+
+from pathlib import Path
+
+import polars as pl
+import pyarrow.parquet as pq
+
+from open_icu.logging import get_logger
+from open_icu.storage.meds import MEDSDataset
+
+logger = get_logger(__name__)
+
+SUBJECT_INDEX_FILE = "subject_shards.parquet"
+"""Name of the subject index file in the metadata directory of the sharding output."""
+
+SUBJECT_INDEX_SCHEMA = {
+    "subject_id": pl.Int64,
+    "shard": pl.String,
+    "row_group_start": pl.Int64,
+    "row_group_end": pl.Int64,
+    "min_time": pl.Datetime(time_unit="us"),
+    "max_time": pl.Datetime(time_unit="us"),
+}
+
+
+def subject_index(shard_file: Path) -> pl.DataFrame:
+    """Build the subject index entries of a shard file.
+
+    Reads the row group sizes from the footer and the ``subject_id`` and
+    ``time`` columns of the shard.
+
+    Args:
+        shard_file: Path to a shard file sorted by subject
+
+    Returns:
+        One row per subject with the shard file name, the half-open range of
+        row groups holding its rows and its first and last event time
+    """
+    metadata = pq.read_metadata(shard_file)
+    row_group_ends = pl.Series(
+        [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)], dtype=pl.Int64
+    ).cum_sum()
+
+    df = (
+        pl.scan_parquet(shard_file)
+        .select("subject_id", "time")
+        .with_row_index("row")
+        .group_by("subject_id")
+        .agg(
+            pl.col("row").min().alias("first_row"),
+            pl.col("row").max().alias("last_row"),
+            pl.col("time").min().alias("min_time"),
+            pl.col("time").max().alias("max_time"),
+        )
+        .collect()
+    )
+
+    return (
+        df.with_columns(
+            pl.lit(shard_file.name).alias("shard"),
+            row_group_ends.search_sorted(df["first_row"], side="right").cast(pl.Int64).alias("row_group_start"),
+            (row_group_ends.search_sorted(df["last_row"], side="right") + 1).cast(pl.Int64).alias("row_group_end"),
+        )
+        .select(list(SUBJECT_INDEX_SCHEMA))
+        .cast(SUBJECT_INDEX_SCHEMA)
+        .sort("subject_id")
+    )
+
+
+class ShardReader:
+    """Random access to the subjects of a sharding step's output.
+
+    The subject index is read once. Footers of the shard files are cached
+    after their first use, so reading a subject afterwards only reads the row
+    groups holding its rows.
+
+    Example:
+        >>> reader = ShardReader(project.datasets["sharding"])
+        >>> reader.read_subject(10002428)
+    """
+
+    def __init__(self, dataset: MEDSDataset) -> None:
+        """Initialize the reader.
+
+        Args:
+            dataset: Output dataset of a sharding step
+
+        Raises:
+            FileNotFoundError: If the dataset has no subject index
+        """
+        self._data_path = dataset.data_path
+        index_path = dataset.metadata_path / SUBJECT_INDEX_FILE
+        if not index_path.exists():
+            raise FileNotFoundError(f"Subject index {index_path} not found")
+
+        self._index = pl.read_parquet(index_path)
+        self._locations = {
+            row["subject_id"]: (row["shard"], row["row_group_start"], row["row_group_end"])
+            for row in self._index.iter_rows(named=True)
+        }
+        self._footers: dict[str, pq.FileMetaData] = {}
+
+    @property
+    def index(self) -> pl.DataFrame:
+        """Get the subject index.
+
+        Returns:
+            One row per subject with its shard file, row group range and first
+            and last event time
+        """
+        return self._index
+
+    @property
+    def subject_ids(self) -> list[int]:
+        """Get the IDs of all subjects in the output.
+
+        Returns:
+            Sorted subject IDs
+        """
+        return self._index["subject_id"].to_list()
+
+    def read_subject(self, subject_id: int, columns: list[str] | None = None) -> pl.DataFrame:
+        """Read the rows of a single subject.
+
+        Args:
+            subject_id: ID of the subject
+            columns: Columns to read. Reads all columns if not set.
+
+        Returns:
+            The rows of the subject, sorted by time
+
+        Raises:
+            KeyError: If the subject is not in the output
+        """
+        if subject_id not in self._locations:
+            raise KeyError(f"Subject {subject_id} not found in sharding output {self._data_path}")
+
+        shard, row_group_start, row_group_end = self._locations[subject_id]
+        shard_path = self._data_path / shard
+
+        read_columns = None if columns is None else list(dict.fromkeys(["subject_id", *columns]))
+        logger.debug("Reading row groups %d-%d of %s for subject %s", row_group_start, row_group_end, shard, subject_id)
+        with pq.ParquetFile(shard_path, metadata=self._footers.get(shard)) as parquet_file:
+            self._footers[shard] = parquet_file.metadata
+            table = parquet_file.read_row_groups(range(row_group_start, row_group_end), columns=read_columns)
+
+        df = pl.from_arrow(table)
+        assert isinstance(df, pl.DataFrame)
+        df = df.filter(pl.col("subject_id") == subject_id)
+        return df if columns is None else df.select(columns)
@@ -4,21 +4,51 @@ The sharding step takes the long-format concept output produced by the concept
 step and rewrites it into subject-oriented Parquet shard files. It deliberately
 keeps the output long-format; wide exports such as YAIB belong in separate
 export/adapter tooling.
+
+By default all shards are written in a single pass: every subject is assigned
+to a shard up front, the selected concept files are scanned once and each row
+is routed to a per-shard bucket on disk, and the buckets are then sorted
+independently into the final shard files. Shards are independent of each other
+and are sorted and written in worker processes with ``execution.jobs > 1``.
+
+Shard files are streamed to disk in row groups of a fixed size and are indexed
+by subject, so single subjects can be read without scanning all shards (see
+:class:`~open_icu.steps.sharding.reader.ShardReader`).
 """
 
+import heapq
+import shutil
 from pathlib import Path
 
 import polars as pl
 
 from open_icu.logging import get_logger
+from open_icu.steps.base.executor import Task, run_tasks
 from open_icu.steps.base.step import ConfigurableBaseStep
 from open_icu.steps.sharding.config.sharding import ShardingConfig
 from open_icu.steps.sharding.config.step import ShardingStepConfig
+from open_icu.steps.sharding.reader import SUBJECT_INDEX_FILE, SUBJECT_INDEX_SCHEMA, subject_index
 from open_icu.steps.sharding.registry import sharding_config_registry
+from open_icu.storage.partitioned import data_files, find_sources, scan_source, source_name
 from open_icu.storage.project import OpenICUProject
 
 logger = get_logger(__name__)
 
+# Shard rows are sorted by all columns, so shard files are deterministic.
+SORT_COLUMNS = ["subject_id", "time", "code", "numeric_value", "text_value"]
+
+
+def _write_shard(step: "ShardingStep", shard_idx: int, shard_subjects: list[int], sources: list[Path]) -> None:
+    """Write a single shard file (see :meth:`ShardingStep.write_shard`)."""
+    step.write_shard(shard_idx, shard_subjects, sources)
+
+
+def _source_size(path: Path) -> int:
+    """Get the on-disk size of a Parquet file or partitioned dataset in bytes."""
+    if path.is_file():
+        return path.stat().st_size
+    return sum(file_path.stat().st_size for file_path in data_files(path))
+
 
 class ShardingStep(ConfigurableBaseStep[ShardingStepConfig, ShardingConfig]):
     """Create subject-oriented long-format shards from concept Parquet files."""
@@ -53,36 +83,159 @@ class ShardingStep(ConfigurableBaseStep[ShardingStepConfig, ShardingConfig]):
 
         logger.info("Sharding %d concept file(s)", len(concept_files))
 
-        subject_ids = self._subject_ids(concept_files)
-        if not subject_ids:
+        shards = self._shard_subjects(concept_files)
+        if not shards:
             logger.warning("Skipping sharding step: no subjects found in selected concept files")
             return
 
-        written_files = 0
-        for shard_idx, shard_subjects in enumerate(self._chunks(subject_ids, self._config.config.subjects_per_shard)):
-            output_file = self._workspace_dir.path / f"shard_{shard_idx:05d}.parquet"
-            logger.info(
-                "Writing shard %s with %d subject(s) to %s",
-                shard_idx,
-                len(shard_subjects),
-                output_file,
+        if self._config.config.single_pass:
+            written_files = self._write_shards_single_pass(concept_files, shards)
+        else:
+            written_files = self._write_shards_per_scan(concept_files, shards)
+
+        logger.info("Finished sharding step: wrote %d shard file(s)", written_files)
+
+    def _shard_file(self, shard_idx: int) -> Path:
+        assert self._workspace_dir is not None
+        return self._workspace_dir.path / f"shard_{shard_idx:05d}.parquet"
+
+    def write_shard(self, shard_idx: int, shard_subjects: list[int], sources: list[Path]) -> None:
+        """Sort the rows of a shard and write its shard file.
+
+        Rows are sorted by all long-format columns, so the shard file does not
+        depend on the order in which its rows were routed or scanned.
+
+        Args:
+            shard_idx: Index of the shard
+            shard_subjects: Subject IDs of the shard
+            sources: Bucket files holding exactly the rows of the shard, or
+                the concept files to filter the rows of the shard from
+        """
+        output_file = self._shard_file(shard_idx)
+        logger.info(
+            "Writing shard %s with %d subject(s) to %s",
+            shard_idx,
+            len(shard_subjects),
+            output_file,
+        )
+
+        if self._config.config.single_pass:
+            lf = pl.scan_parquet(sources) if sources else self._empty_shard()
+        else:
+            lf = self._scan_core_columns(sources).filter(pl.col("subject_id").is_in(shard_subjects))
+
+        # The shard is streamed to disk instead of being materialized; the rows
+        # of a subject may span several row groups, which the subject index
+        # built from the written file records (see :meth:`collect`).
+        lf.sort(SORT_COLUMNS).sink_parquet(
+            output_file,
+            compression="zstd",
+            row_group_size=self._config.config.row_group_size,
+            engine="streaming",
+        )
+
+    def collect(self) -> None:
+        """Collect the shard files and write the subject index.
+
+        The subject index (see :mod:`open_icu.steps.sharding.reader`) maps every
+        subject to its shard file and row groups and is written to the metadata
+        directory of the output dataset.
+        """
+        super().collect()
+        if self._dataset is None:
+            return
+
+        shard_files = sorted(self._dataset.data_path.glob("shard_*.parquet"))
+        index = pl.concat(
+            [pl.DataFrame(schema=SUBJECT_INDEX_SCHEMA), *(subject_index(shard_file) for shard_file in shard_files)]
+        )
+
+        index_path = self._dataset.metadata_path / SUBJECT_INDEX_FILE
+        logger.info("Writing subject index of %d subject(s) to %s", len(index), index_path)
+        index.write_parquet(index_path)
+
+    def _write_shards(self, tasks: list[Task]) -> int:
+        """Write the shards of the tasks, in parallel with ``execution.jobs > 1``."""
+        run_tasks(_write_shard, tasks, self, self._config.config.execution)
+        return len(tasks)
+
+    def _write_shards_per_scan(self, concept_files: list[Path], shards: list[list[int]]) -> int:
+        """Write each shard with its own scan of all concept files."""
+        total_size = sum(_source_size(file_path) for file_path in concept_files)
+        num_subjects = sum(map(len, shards))
+
+        tasks = [
+            Task(
+                key=shard_idx,
+                args=(shard_idx, shard_subjects, concept_files),
+                cost=self._estimate_cost(total_size * len(shard_subjects) // num_subjects),
             )
+            for shard_idx, shard_subjects in enumerate(shards)
+        ]
+        return self._write_shards(tasks)
 
-            lf = self._scan_core_columns(concept_files).filter(pl.col("subject_id").is_in(shard_subjects))
-            lf = lf.sort(["subject_id", "time", "code"])
-            lf.sink_parquet(output_file)
-            written_files += 1
+    def _write_shards_single_pass(self, concept_files: list[Path], shards: list[list[int]]) -> int:
+        """Route all rows to their shard in one scan, then sort each shard.
 
-        logger.info("Finished sharding step: wrote %d shard file(s)", written_files)
+        Rows are joined with the subject to shard assignment and written to a
+        hive-partitioned bucket directory in the workspace with a partitioned
+        sink. Each bucket is sorted and written to its shard file afterwards,
+        so the concept files are read once regardless of the number of shards.
+        The bucket directory is removed when done.
+        """
+        assert self._workspace_dir is not None
+
+        bucket_dir = self._workspace_dir.path / "_buckets"
+        shutil.rmtree(bucket_dir, ignore_errors=True)
+
+        assignment = pl.LazyFrame(
+            {
+                "subject_id": [subject_id for shard_subjects in shards for subject_id in shard_subjects],
+                "_shard": [shard_idx for shard_idx, shard_subjects in enumerate(shards) for _ in shard_subjects],
+            },
+            schema={"subject_id": pl.Int64, "_shard": pl.UInt32},
+        )
+
+        try:
+            logger.info("Routing rows of %d subject(s) to %d shard bucket(s)", sum(map(len, shards)), len(shards))
+            self._scan_core_columns(concept_files).join(assignment, on="subject_id", how="inner").sink_parquet(
+                pl.PartitionBy(bucket_dir, key="_shard", include_key=False),
+                mkdir=True,
+            )
+
+            tasks = []
+            for shard_idx, shard_subjects in enumerate(shards):
+                bucket_files = sorted((bucket_dir / f"_shard={shard_idx}").glob("*.parquet"))
+                cost = self._estimate_cost(sum(_source_size(file_path) for file_path in bucket_files))
+                tasks.append(Task(key=shard_idx, args=(shard_idx, shard_subjects, bucket_files), cost=cost))
+
+            return self._write_shards(tasks)
+        finally:
+            shutil.rmtree(bucket_dir, ignore_errors=True)
+
+    def _estimate_cost(self, size: int) -> int:
+        """Estimate the peak memory needed to sort and write a shard.
+
+        Args:
+            size: On-disk size of the rows of the shard in bytes
+
+        Returns:
+            Estimated memory in bytes, ``size`` scaled by ``execution.memory_factor``
+        """
+        return int(size * self._config.config.execution.memory_factor)
 
     def _selected_concept_files(self, concept_data_path: Path) -> list[Path]:
-        """Find concept Parquet files matching the configured dataset/concept filters."""
+        """Find concept Parquet files matching the configured dataset/concept filters.
+
+        Concept outputs stored as partitioned datasets are returned as a whole
+        (the dataset directory) and read with their committed parts.
+        """
         datasets = set(self._config.config.datasets)
         concept_filters = self._normalize_concept_filters(self._config.config.concepts)
 
         concept_files: list[Path] = []
-        for file_path in sorted(concept_data_path.rglob("*.parquet")):
-            if datasets and file_path.stem not in datasets:
+        for file_path in find_sources(concept_data_path):
+            if datasets and source_name(file_path) not in datasets:
                 continue
 
             relative_file_path = file_path.relative_to(concept_data_path)
@@ -117,22 +270,81 @@ class ShardingStep(ConfigurableBaseStep[ShardingStepConfig, ShardingConfig]):
         concept_name = concept_path.name.lower()
         return concept_path_str in concept_filters or concept_name in concept_filters
 
-    def _subject_ids(self, concept_files: list[Path]) -> list[int]:
-        """Collect selected subject IDs from the selected concept files."""
-        lfs = [pl.scan_parquet(file_path).select(pl.col("subject_id").cast(pl.Int64)) for file_path in concept_files]
-        lf = pl.concat(lfs, how="vertical").unique().sort("subject_id")
+    def _shard_subjects(self, concept_files: list[Path]) -> list[list[int]]:
+        """Assign the selected subjects to shards.
+
+        With ``balance_by: subjects`` the sorted subject IDs are split into
+        chunks of ``subjects_per_shard`` subjects. With ``balance_by: rows``
+        the subjects are packed into shards of about ``rows_per_shard`` rows.
+
+        Returns:
+            Sorted subject IDs of every shard, in shard order
+        """
+        if self._config.config.balance_by == "rows":
+            row_counts = self._subject_row_counts(concept_files)
+            return self._balanced_chunks(row_counts, self._config.config.rows_per_shard)
+
+        subject_ids = self._subject_ids(concept_files)
+        return list(self._chunks(subject_ids, self._config.config.subjects_per_shard))
+
+    def _subject_lf(self, concept_files: list[Path]) -> pl.LazyFrame:
+        """Scan the subject IDs of all rows of the selected concept files."""
+        lfs = [scan_source(file_path).select(pl.col("subject_id").cast(pl.Int64)) for file_path in concept_files]
+        lf = self.filter_cohort(pl.concat(lfs, how="vertical"))
 
         configured_subjects = self._config.config.subjects
         if configured_subjects:
             lf = lf.filter(pl.col("subject_id").is_in(configured_subjects))
 
+        return lf
+
+    def _subject_ids(self, concept_files: list[Path]) -> list[int]:
+        """Collect selected subject IDs from the selected concept files."""
+        lf = self._subject_lf(concept_files).unique().sort("subject_id")
         return lf.collect(engine="streaming")["subject_id"].to_list()
 
+    def _subject_row_counts(self, concept_files: list[Path]) -> dict[int, int]:
+        """Count the rows of every selected subject in one streaming pass."""
+        lf = self._subject_lf(concept_files).group_by("subject_id").len(name="rows")
+        df = lf.collect(engine="streaming")
+        return dict(zip(df["subject_id"].to_list(), df["rows"].to_list(), strict=True))
+
+    @staticmethod
+    def _balanced_chunks(row_counts: dict[int, int], rows_per_shard: int) -> list[list[int]]:
+        """Pack subjects into shards with about equal row counts.
+
+        The number of shards is the total row count divided by the target,
+        rounded up. Subjects are assigned in descending order of their row
+        count to the shard with the fewest rows so far (longest processing
+        time first), ties broken by subject ID and shard index, so the
+        assignment is deterministic.
+
+        Args:
+            row_counts: Number of rows of every subject
+            rows_per_shard: Targeted number of rows per shard
+
+        Returns:
+            Sorted subject IDs of every shard
+        """
+        if not row_counts:
+            return []
+
+        num_shards = min(len(row_counts), -(-sum(row_counts.values()) // rows_per_shard))
+        loads = [(0, shard_idx) for shard_idx in range(num_shards)]
+        shards: list[list[int]] = [[] for _ in range(num_shards)]
+
+        for subject_id, rows in sorted(row_counts.items(), key=lambda item: (-item[1], item[0])):
+            load, shard_idx = heapq.heappop(loads)
+            shards[shard_idx].append(subject_id)
+            heapq.heappush(loads, (load + rows, shard_idx))
+
+        return [sorted(shard_subjects) for shard_subjects in shards]
+
     @staticmethod
     def _scan_core_columns(concept_files: list[Path]) -> pl.LazyFrame:
         """Scan all selected concept files using the stable long-format columns."""
         lfs = [
-            pl.scan_parquet(file_path).select(
+            scan_source(file_path).select(
                 [
                     pl.col("subject_id").cast(pl.Int64),
                     pl.col("time").cast(pl.Datetime(time_unit="us")),
@@ -145,6 +357,19 @@ class ShardingStep(ConfigurableBaseStep[ShardingStepConfig, ShardingConfig]):
         ]
         return pl.concat(lfs, how="vertical")
 
+    @staticmethod
+    def _empty_shard() -> pl.LazyFrame:
+        """Create an empty frame with the long-format columns."""
+        return pl.LazyFrame(
+            schema={
+                "subject_id": pl.Int64,
+                "time": pl.Datetime(time_unit="us"),
+                "code": pl.String,
+                "numeric_value": pl.Float32,
+                "text_value": pl.String,
+            }
+        )
+
     @staticmethod
     def _chunks(values: list[int], chunk_size: int):
         for start in range(0, len(values), chunk_size):
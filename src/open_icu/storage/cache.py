@@ -0,0 +1,152 @@
+"""Columnar cache for parsed CSV source tables.
+
+This module provides the SourceCache class, which stores the configured columns
+of CSV source files as Parquet, so that repeated extraction runs scan Parquet
+instead of parsing (gzipped) CSV again.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from uuid import uuid4
+
+import polars as pl
+from polars.datatypes import DataTypeClass
+
+from open_icu.logging import get_logger
+from open_icu.storage.base import FileStorage
+
+logger = get_logger(__name__)
+
+
+def _hash(value: object) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class SourceCache(FileStorage):
+    """Cache of CSV source files converted to Parquet.
+
+    Entries are keyed by the resolved source path, its size and modification
+    time (optionally a hash of its contents), and the declared column dtypes. An entry holding a superset of the
+    requested columns with identical dtypes is a hit as well, so a source read
+    by several tables (or persisted by the persistence step with the union of
+    their columns) is only parsed once.
+
+    Directory structure:
+        <path hash>/<fingerprint hash>-<dtypes hash>.parquet
+        <path hash>/<fingerprint hash>-<dtypes hash>.json
+
+    Entries of a source whose size or modification time changed are removed
+    when the source is cached again.
+    """
+
+    @staticmethod
+    def _fingerprint(source: Path, hash_contents: bool = False) -> dict:
+        stat = source.stat()
+        fingerprint = {"path": str(source.resolve()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if hash_contents:
+            with open(source, "rb") as f:
+                fingerprint["sha256"] = hashlib.file_digest(f, "sha256").hexdigest()
+        return fingerprint
+
+    @staticmethod
+    def _dtype_names(dtypes: dict[str, DataTypeClass]) -> dict[str, str]:
+        return {name: str(dtype) for name, dtype in dtypes.items()}
+
+    def _source_dir(self, fingerprint: dict) -> Path:
+        return self._path / _hash(fingerprint["path"])
+
+    def get(self, source: Path, dtypes: dict[str, DataTypeClass], hash_contents: bool = False) -> Path | None:
+        """Look up the cached Parquet file for a source.
+
+        Args:
+            source: Path to the CSV source file
+            dtypes: Declared dtypes of the columns to read
+            hash_contents: Whether entries are also keyed by a hash of the
+                source contents, which detects changes that keep the size and
+                modification time
+
+        Returns:
+            Path to a cached Parquet file containing at least the requested
+            columns, or None on a cache miss
+        """
+        fingerprint = self._fingerprint(source, hash_contents)
+        requested = self._dtype_names(dtypes)
+
+        for meta_path in sorted(self._source_dir(fingerprint).glob(f"{_hash(fingerprint)}-*.json")):
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+
+            entry = meta_path.with_suffix(".parquet")
+            if entry.exists() and requested.items() <= meta["dtypes"].items():
+                return entry
+
+        return None
+
+    def put(self, source: Path, dtypes: dict[str, DataTypeClass], hash_contents: bool = False) -> Path:
+        """Parse a CSV source and store the declared columns as Parquet.
+
+        The entry is written to a temporary file first and moved into place, so
+        concurrent writers of the same entry (e.g. parallel extraction workers)
+        never expose a partially written file. Entries of an outdated version of
+        the source are removed.
+
+        Args:
+            source: Path to the CSV source file
+            dtypes: Declared dtypes of the columns to read
+            hash_contents: Whether the entry is also keyed by a hash of the
+                source contents
+
+        Returns:
+            Path to the cached Parquet file
+        """
+        fingerprint = self._fingerprint(source, hash_contents)
+        dtype_names = self._dtype_names(dtypes)
+
+        source_dir = self._source_dir(fingerprint)
+        source_dir.mkdir(parents=True, exist_ok=True)
+        entry = source_dir / f"{_hash(fingerprint)}-{_hash(dtype_names)}.parquet"
+
+        logger.info("Caching %d column(s) of source %s as %s", len(dtypes), source, entry)
+
+        tmp_entry = entry.with_suffix(f".{uuid4().hex}.tmp")
+        pl.scan_csv(
+            source,
+            schema_overrides=dtypes,
+            infer_schema=False,
+            low_memory=True,
+        ).select(list(dtypes)).sink_parquet(tmp_entry)
+        os.replace(tmp_entry, entry)
+
+        tmp_meta = entry.with_suffix(f".{uuid4().hex}.tmp")
+        with open(tmp_meta, "w") as f:
+            json.dump({**fingerprint, "dtypes": dtype_names}, f, indent=4)
+        os.replace(tmp_meta, entry.with_suffix(".json"))
+
+        for stale in source_dir.iterdir():
+            if not stale.name.startswith(_hash(fingerprint)) and not stale.name.endswith(".tmp"):
+                logger.debug("Removing outdated cache entry %s", stale)
+                stale.unlink(missing_ok=True)
+
+        return entry
+
+    def scan_csv(self, source: Path, dtypes: dict[str, DataTypeClass], hash_contents: bool = False) -> pl.LazyFrame:
+        """Lazily read the declared columns of a CSV source through the cache.
+
+        Args:
+            source: Path to the CSV source file
+            dtypes: Declared dtypes of the columns to read
+            hash_contents: Whether entries are also keyed by a hash of the
+                source contents
+
+        Returns:
+            LazyFrame over the cached Parquet file with the requested columns
+        """
+        entry = self.get(source, dtypes, hash_contents)
+        if entry is None:
+            entry = self.put(source, dtypes, hash_contents)
+        else:
+            logger.debug("Reading source %s from cache %s", source, entry)
+
+        return pl.scan_parquet(entry).select(list(dtypes))
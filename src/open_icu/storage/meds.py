@@ -15,6 +15,7 @@ from meds.schema import DatasetMetadataSchema
 
 from open_icu.logging import get_logger
 from open_icu.storage.base import FileStorage
+from open_icu.storage.partitioned import find_sources, scan_source
 
 logger = get_logger(__name__)
 
@@ -99,16 +100,16 @@ class MEDSDataset(FileStorage):
     def write_codes(self) -> None:
         """Extract and write the code vocabulary to codes.parquet.
 
-        Scans all Parquet files in the data directory, extracts unique codes,
-        and writes them to metadata/codes.parquet with description and
-        parent_codes columns (set to null). This creates the MEDS-required
-        code vocabulary file.
+        Scans all Parquet files and partitioned datasets in the data directory,
+        extracts unique codes, and writes them to metadata/codes.parquet with
+        description and parent_codes columns (set to null). This creates the
+        MEDS-required code vocabulary file.
         """
         logger.debug("Extracting code vocabulary from parquet files in %s", self.data_path)
 
         dfs = []
-        for file_path in self.data_path.rglob("*.parquet"):
-            _df = pl.scan_parquet(file_path).select(pl.col("code")).unique().collect(engine="streaming")
+        for source in find_sources(self.data_path):
+            _df = scan_source(source).select(pl.col("code")).unique().collect(engine="streaming")
             dfs.append(_df)
 
         codes_df = pl.DataFrame(
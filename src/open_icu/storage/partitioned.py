@@ -0,0 +1,258 @@
+"""Append-only Parquet datasets made of immutable part files.
+
+This module provides the PartitionedParquet class for Parquet outputs that are
+written in several contributions, e.g. an event file that is produced by more
+than one table configuration. Each contribution is written as a separate part
+file, so appending costs O(new rows) instead of rewriting all previous data.
+
+Directory layout:
+    <name>/part-00000.parquet
+    <name>/part-00001.parquet
+    <name>/_manifest.json
+
+The manifest lists the committed part files with their row counts. Part files
+that are not listed (e.g. left behind by an interrupted write) are ignored.
+"""
+
+import json
+from pathlib import Path
+
+import polars as pl
+
+from open_icu.logging import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_FILE = "_manifest.json"
+
+
+class PartitionedParquet:
+    """A Parquet dataset stored as a directory of immutable part files.
+
+    Attributes:
+        path: The dataset directory
+        manifest_path: Path to the manifest of committed part files
+        parts: Committed part files in the order they were written
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the partitioned dataset.
+
+        Args:
+            path: Directory containing the part files and the manifest
+        """
+        self._path = path
+
+    def __repr__(self) -> str:
+        """Return string representation of the dataset."""
+        return f"{self.__class__.__name__}(path={self._path!r}, parts={len(self.parts)})"
+
+    @property
+    def path(self) -> Path:
+        """Get the dataset directory.
+
+        Returns:
+            The directory containing the part files
+        """
+        return self._path
+
+    @property
+    def manifest_path(self) -> Path:
+        """Get the manifest path.
+
+        Returns:
+            Path to the manifest listing the committed part files
+        """
+        return self._path / MANIFEST_FILE
+
+    def exists(self) -> bool:
+        """Check whether the dataset has been committed at least once.
+
+        Returns:
+            True if the manifest exists
+        """
+        return self.manifest_path.is_file()
+
+    def _read_manifest(self) -> list[dict]:
+        if not self.exists():
+            return []
+
+        with open(self.manifest_path, "r") as f:
+            return json.load(f)["parts"]
+
+    @property
+    def parts(self) -> list[Path]:
+        """Get the committed part files.
+
+        Returns:
+            List of committed part files in the order they were written
+        """
+        return [self._path / part["file"] for part in self._read_manifest()]
+
+    @property
+    def num_rows(self) -> int:
+        """Get the total number of rows of all committed parts.
+
+        Returns:
+            Number of rows in the dataset
+        """
+        return sum(part["rows"] for part in self._read_manifest())
+
+    def new_part(self) -> Path:
+        """Reserve the path of the next part file.
+
+        The part only becomes visible to readers after :meth:`commit`. Only one
+        part can be reserved per dataset until it is committed.
+
+        Returns:
+            Path the new part file should be written to
+        """
+        self._path.mkdir(parents=True, exist_ok=True)
+        return self._path / f"part-{len(self._read_manifest()):05d}.parquet"
+
+    def commit(self, part: Path) -> None:
+        """Add a written part file to the manifest.
+
+        The manifest is replaced atomically, so readers see either the previous
+        or the new list of parts.
+
+        Args:
+            part: Part file returned by :meth:`new_part` that has been written
+        """
+        parts = self._read_manifest()
+        rows = pl.scan_parquet(part).select(pl.len()).collect().item()
+        parts.append({"file": part.name, "rows": rows})
+
+        logger.debug("Committing part %s (%d rows) to %s", part.name, rows, self._path)
+
+        tmp_manifest_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_manifest_path, "w") as f:
+            json.dump({"parts": parts}, f, indent=4)
+        tmp_manifest_path.replace(self.manifest_path)
+
+    def scan(self, **kwargs) -> pl.LazyFrame:
+        """Lazily read all committed parts.
+
+        Args:
+            **kwargs: Additional keyword arguments for ``pl.scan_parquet``
+
+        Returns:
+            LazyFrame over the concatenated parts
+
+        Raises:
+            FileNotFoundError: If no part has been committed
+        """
+        parts = self.parts
+        if not parts:
+            raise FileNotFoundError(f"no committed parts ({self._path})")
+        return pl.scan_parquet(parts, **kwargs)
+
+
+def is_partitioned(path: Path) -> bool:
+    """Check whether a path is a partitioned Parquet dataset.
+
+    Args:
+        path: Path to check
+
+    Returns:
+        True if the path is a directory with a manifest
+    """
+    return (path / MANIFEST_FILE).is_file()
+
+
+def source_name(path: Path) -> str:
+    """Get the name of a Parquet source (file or partitioned dataset).
+
+    Args:
+        path: A Parquet file or a partitioned dataset directory
+
+    Returns:
+        The dataset directory name or the file name without extension
+    """
+    return path.name if is_partitioned(path) else path.stem
+
+
+def resolve_source(path: Path, name: str) -> Path:
+    """Resolve a named Parquet source below a directory.
+
+    Args:
+        path: Directory containing the source
+        name: Name of the source
+
+    Returns:
+        The partitioned dataset ``path/name`` if it exists, otherwise the plain
+        Parquet file ``path/name.parquet`` (which may not exist either)
+    """
+    if is_partitioned(path / name):
+        return path / name
+    return path / f"{name}.parquet"
+
+
+def list_sources(path: Path) -> list[Path]:
+    """List the Parquet sources directly below a directory.
+
+    Args:
+        path: Directory to search
+
+    Returns:
+        Sorted Parquet files and partitioned dataset directories
+    """
+    if not path.is_dir():
+        return []
+
+    return sorted(p for p in path.iterdir() if is_partitioned(p) or (p.is_file() and p.suffix == ".parquet"))
+
+
+def find_sources(path: Path) -> list[Path]:
+    """Recursively find all Parquet sources below a directory.
+
+    Part files of a partitioned dataset are not returned individually; the
+    dataset directory is returned instead.
+
+    Args:
+        path: Directory to search
+
+    Returns:
+        Sorted Parquet files and partitioned dataset directories
+    """
+    sources: set[Path] = set()
+    for file_path in path.rglob("*.parquet"):
+        sources.add(file_path.parent if is_partitioned(file_path.parent) else file_path)
+    return sorted(sources)
+
+
+def scan_source(path: Path, **kwargs) -> pl.LazyFrame:
+    """Lazily read a Parquet file or a partitioned dataset.
+
+    Args:
+        path: A Parquet file or a partitioned dataset directory
+        **kwargs: Additional keyword arguments for ``pl.scan_parquet``
+
+    Returns:
+        LazyFrame over the source
+    """
+    if is_partitioned(path):
+        return PartitionedParquet(path).scan(**kwargs)
+    return pl.scan_parquet(path, **kwargs)
+
+
+def data_files(path: Path) -> list[Path]:
+    """Recursively list the files making up the Parquet sources below a directory.
+
+    Includes plain Parquet files as well as the committed parts and the manifest
+    of every partitioned dataset, but no uncommitted part files.
+
+    Args:
+        path: Directory to search
+
+    Returns:
+        Sorted list of files
+    """
+    files: list[Path] = []
+    for source in find_sources(path):
+        if is_partitioned(source):
+            dataset = PartitionedParquet(source)
+            files.extend([*dataset.parts, dataset.manifest_path])
+        else:
+            files.append(source)
+    return sorted(files)
@@ -9,6 +9,7 @@ from pathlib import Path
 
 from open_icu.logging import get_logger
 from open_icu.storage.base import FileStorage
+from open_icu.storage.cache import SourceCache
 from open_icu.storage.meds import MEDSDataset
 from open_icu.storage.workspace import WorkspaceDir
 
@@ -27,11 +28,14 @@ class OpenICUProject(FileStorage):
         - datasets/: MEDS format output datasets
         - workspace/: Intermediate processing files
         - configs/: Configuration YAML files
+        - cache/: Caches that can be deleted at any time (e.g. parsed sources)
 
     Attributes:
         datasets_path: Path to the datasets directory
         workspace_path: Path to the workspace directory
         configs_path: Path to the configs directory
+        cache_path: Path to the cache directory
+        source_cache: Cache of CSV sources converted to Parquet
         datasets: Dictionary of managed MEDS datasets
         workspace: Dictionary of managed workspace directories
     """
@@ -108,6 +112,24 @@ class OpenICUProject(FileStorage):
         """
         return self._path / "configs"
 
+    @property
+    def cache_path(self) -> Path:
+        """Get the cache directory path.
+
+        Returns:
+            Path to the cache subdirectory
+        """
+        return self._path / "cache"
+
+    @property
+    def source_cache(self) -> SourceCache:
+        """Get the cache of CSV sources converted to Parquet.
+
+        Returns:
+            SourceCache stored in the ``cache/sources`` subdirectory
+        """
+        return SourceCache(self.cache_path / "sources")
+
     @property
     def workspace(self) -> dict[str, WorkspaceDir]:
         """Get the dictionary of managed workspace directories.
@@ -7,6 +7,7 @@ directories used to store intermediate processing results.
 from pathlib import Path
 
 from open_icu.storage.base import FileStorage
+from open_icu.storage.partitioned import data_files
 
 
 class WorkspaceDir(FileStorage):
@@ -18,9 +19,12 @@ class WorkspaceDir(FileStorage):
 
     @property
     def content(self) -> list[Path]:
-        """Get all Parquet files in the workspace.
+        """Get all Parquet data files in the workspace.
+
+        Partitioned datasets contribute their committed part files and their
+        manifest; uncommitted part files are left out.
 
         Returns:
-            List of Path objects for all .parquet files in the workspace
+            List of Path objects for all data files in the workspace
         """
-        return list(self._path.rglob("*.parquet"))  # TODO: make more informative
+        return data_files(self._path)  # TODO: make more informative
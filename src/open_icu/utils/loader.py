@@ -2,20 +2,26 @@ import sys
 from importlib.resources import files
 from pathlib import Path
 
-from open_icu.config.registry import load_configs
-from open_icu.steps.concept.config.concept import ConceptConfig
-from open_icu.steps.concept.registry import concept_config_registry
+from open_icu.config.cache import ConfigCache
+from open_icu.config.registry import ConfigSource
+from open_icu.steps.concept.registry import ConceptMappingSource, concept_config_registry
 from open_icu.steps.extraction.registry import dataset_config_registry
+from open_icu.utils.process import is_worker_process
 
 
 def auto_load_configs():
     """
-    Automatically load concept and dataset configurations from the package's
-    'configs' directory. This function searches for concept and dataset
-    configuration files in the package's 'configs' directory and registers
-    them with the appropriate registries.
+    Automatically register concept and dataset configurations from the package's
+    'configs' directory. This function searches for the dataset versions in the
+    package's 'configs' directory and adds their tables and concept mappings as
+    sources of the appropriate registries. No configuration file is read here;
+    the sources of a dataset version are loaded when a step first queries the
+    registries for it.
+
+    Nothing is loaded in the worker processes of parallel steps, which receive
+    their configurations from the parent process.
     """
-    if "pytest" in sys.modules:
+    if "pytest" in sys.modules or is_worker_process():
         return
 
     module_path = Path(str(files("open_icu")))
@@ -28,17 +34,12 @@ def auto_load_configs():
         else:
             return
 
-    mapping_paths = []
-    for dataset_path in (config_path / "datasets").iterdir():
-        for version_path in dataset_path.iterdir():
+    cache = ConfigCache()
+    concept_config_registry.add_source(ConfigSource((), config_path / "concepts", cache))
+    for dataset_path in sorted((config_path / "datasets").iterdir()):
+        for version_path in sorted(dataset_path.iterdir()):
             if version_path.is_dir():
-                dataset_config_registry.load(version_path / "tables")
-                mapping_paths.append(version_path / "mappings")
-
-    concepts = load_configs(
-        config_path / "concepts",
-        config_type=ConceptConfig,
-        dataset_paths=mapping_paths,
-    )
-    for concept in concepts:
-        concept_config_registry.register(concept)
+                dataset_config_registry.add_source(
+                    ConfigSource((dataset_path.name, version_path.name), version_path / "tables", cache)
+                )
+                concept_config_registry.add_source(ConceptMappingSource(version_path / "mappings", cache))
@@ -0,0 +1,19 @@
+import os
+
+# Environment variable marking the worker processes started by parallel steps.
+# It holds the PID of the process that started the workers, so the parent
+# itself is never mistaken for a worker while the variable is set.
+WORKER_ENV = "OPEN_ICU_WORKER_OF"
+
+
+def is_worker_process() -> bool:
+    """Check whether the current process is a worker of a parallel step.
+
+    Workers inherit the environment of the parent when they are started, so
+    this already holds while the worker imports ``open_icu``, before any pool
+    initializer runs.
+
+    Returns:
+        True if the current process was started by the step task scheduler.
+    """
+    return os.environ.get(WORKER_ENV) == str(os.getppid())
@@ -4,8 +4,9 @@ import polars as pl
 import pytest
 from polars.testing import assert_frame_equal
 
-from open_icu.callbacks.interpreter import ExprInterpreter, parse_expr
+from open_icu.callbacks.interpreter import ExprInterpreter, compile_expr, parse_expr
 from open_icu.callbacks.proto import CallbackProtocol
+from open_icu.callbacks.registry import register_callback_cls, registry
 
 
 @pytest.fixture
@@ -150,3 +151,34 @@ class TestParseExpr:
     def test_filter_usage(self, lf: pl.LazyFrame) -> None:
         filtered = collect(lf.filter(parse_expr(lf, "col(a) >= 2")))
         assert_frame_equal(filtered, collect(lf).filter(pl.col("a") >= 2))
+
+
+class TestCompileExpr:
+    def test_compiled_tree_is_reused(self) -> None:
+        assert compile_expr("col(a) + col(b)") is compile_expr("col(a) + col(b)")
+
+    def test_compiled_tree_binds_per_frame(self) -> None:
+        # the second evaluation reuses the compiled tree of the first
+        assert evaluate(pl.LazyFrame({"a": [1.0]}), "col(a)").to_list() == [1.0]
+        # "a" is not a column of this frame, so it falls back to a literal
+        assert evaluate(pl.LazyFrame({"b": [1.0]}), "col(a)").to_list() == ["a"]
+
+    def test_registering_a_callback_invalidates_compiled_trees(self) -> None:
+        with pytest.raises(ValueError, match="Unknown callback"):
+            compile_expr("late_test_only_callback()")
+
+        @register_callback_cls
+        class LateTestOnlyCallback:
+            def __init__(self) -> None:
+                pass
+
+            def __call__(self, lf: pl.LazyFrame) -> pl.Expr:
+                return pl.lit(1)
+
+        try:
+            before = compile_expr("col(a)")
+            assert isinstance(compile_expr("late_test_only_callback()"), CallbackProtocol)
+        finally:
+            registry.unregister("late_test_only_callback")
+
+        assert compile_expr("col(a)") is not before
@@ -0,0 +1,122 @@
+"""Tests for the schema-propagating plan builder (open_icu.callbacks.plan)."""
+
+import polars as pl
+import pytest
+
+from open_icu.callbacks.plan import PlanBuilder
+from open_icu.callbacks.proto import frame_columns
+
+
+@pytest.fixture
+def schema_calls(monkeypatch: pytest.MonkeyPatch) -> list[pl.LazyFrame]:
+    """Record every schema resolution requested from Polars."""
+    calls = []
+    collect_schema = pl.LazyFrame.collect_schema
+
+    def counting_collect_schema(self: pl.LazyFrame) -> pl.Schema:
+        calls.append(self)
+        return collect_schema(self)
+
+    monkeypatch.setattr(pl.LazyFrame, "collect_schema", counting_collect_schema)
+    return calls
+
+
+@pytest.fixture
+def lf() -> pl.LazyFrame:
+    return pl.LazyFrame({"a": [1.0, 2.0], "b": [10.0, 20.0]})
+
+
+class TestPlanBuilder:
+    def test_columns_are_propagated(self, lf: pl.LazyFrame, schema_calls: list[pl.LazyFrame]) -> None:
+        plan = PlanBuilder(lf, ["a", "b"])
+        plan = plan.with_columns((pl.col("a") * 2).alias("c"), pl.lit(1).alias("d"))
+        plan = plan.filter(pl.col("c") > 2)
+
+        assert plan.columns == {"a", "b", "c", "d"}
+        assert plan.select(pl.col("c"), pl.col("a").alias("e")).columns == {"c", "e"}
+        assert schema_calls == []
+
+    def test_planning_resolves_schema_at_most_once(self, lf: pl.LazyFrame, schema_calls: list[pl.LazyFrame]) -> None:
+        plan = PlanBuilder(lf)
+        for i in range(50):
+            plan = plan.with_columns(plan.parse(f"add(a, b, output=c{i})"))
+            plan = plan.filter(plan.parse(f"c{i} > 0"))
+
+        assert len(schema_calls) == 1
+        df = plan.lf.collect()
+        assert df["c49"].to_list() == [11.0, 22.0]
+
+    def test_parse_distinguishes_columns_and_literals(self, lf: pl.LazyFrame) -> None:
+        plan = PlanBuilder(lf, ["a", "b"]).with_columns(pl.col("a").alias("new"))
+
+        df = plan.lf.select(plan.parse("col(new)").alias("x"), plan.parse("col(missing)").alias("y")).collect()
+        assert df["x"].to_list() == [1.0, 2.0]
+        assert df["y"].to_list() == ["missing", "missing"]
+
+    def test_wildcard_expressions_resolve_schema(self, lf: pl.LazyFrame, schema_calls: list[pl.LazyFrame]) -> None:
+        plan = PlanBuilder(lf, ["a", "b"]).with_columns(pl.all().name.suffix("_x"))
+
+        assert plan.columns == {"a", "b", "a_x", "b_x"}
+        assert len(schema_calls) == 1
+
+    def test_pipe_resolves_schema_of_derived_frame(self, lf: pl.LazyFrame) -> None:
+        plan = PlanBuilder(lf, ["a", "b"])
+        plan = plan.pipe(plan.lf.with_columns(pl.col("a").alias("c")).drop("b"))
+
+        assert plan.columns == {"a", "c"}
+
+
+def plan_nodes(lf: pl.LazyFrame, node: str) -> int:
+    return lf.explain(optimizations=pl.QueryOptFlags.none()).count(node)
+
+
+class TestBatching:
+    def test_independent_columns_share_one_node(self, lf: pl.LazyFrame) -> None:
+        plan = PlanBuilder(lf, ["a", "b"])
+        for i in range(5):
+            plan = plan.with_columns((pl.col("a") + i).alias(f"c{i}"))
+
+        assert plan_nodes(plan.lf, "WITH_COLUMNS") == 1
+        assert plan.lf.collect()["c4"].to_list() == [5.0, 6.0]
+
+    def test_read_after_write_starts_new_batch(self, lf: pl.LazyFrame) -> None:
+        plan = PlanBuilder(lf, ["a", "b"]).with_columns((pl.col("a") * 2).alias("c"))
+        plan = plan.with_columns((pl.col("c") + 1).alias("d"), (pl.col("b") + 1).alias("e"))
+
+        assert plan_nodes(plan.lf, "WITH_COLUMNS") == 2
+        assert plan.lf.collect()["d"].to_list() == [3.0, 5.0]
+
+    def test_overwriting_a_batch_column_starts_new_batch(self, lf: pl.LazyFrame) -> None:
+        plan = PlanBuilder(lf, ["a", "b"]).with_columns(pl.lit(1.0).alias("c")).with_columns(pl.lit(2.0).alias("c"))
+
+        assert plan_nodes(plan.lf, "WITH_COLUMNS") == 2
+        assert plan.lf.collect()["c"].to_list() == [2.0, 2.0]
+
+    def test_filters_are_combined(self, lf: pl.LazyFrame) -> None:
+        plan = PlanBuilder(lf, ["a", "b"]).with_columns((pl.col("a") * 2).alias("c"))
+        plan = plan.filter(pl.col("a") > 0).filter(pl.col("c") < 4).filter(pl.col("b") > 0)
+
+        assert plan_nodes(plan.lf, "FILTER") == 1
+        assert plan.lf.collect()["a"].to_list() == [1.0]
+
+    def test_columns_after_filter_see_filtered_rows(self, lf: pl.LazyFrame) -> None:
+        plan = PlanBuilder(lf, ["a", "b"]).filter(pl.col("a") > 1)
+        plan = plan.with_columns(pl.col("a").sum().alias("total"))
+
+        assert plan.lf.collect()["total"].to_list() == [2.0]
+
+    def test_flush_applies_pending_work(self, lf: pl.LazyFrame) -> None:
+        plan = PlanBuilder(lf, ["a", "b"]).with_columns(pl.lit(1).alias("c"))
+        shared = plan.flush()
+        first = shared.with_columns(pl.lit(2).alias("d"))
+        second = shared.with_columns(pl.lit(3).alias("e"))
+
+        assert first.lf.collect().columns == ["a", "b", "c", "d"]
+        assert second.lf.collect().columns == ["a", "b", "c", "e"]
+        assert shared.flush() is shared
+
+
+def test_frame_columns_are_memoized(lf: pl.LazyFrame, schema_calls: list[pl.LazyFrame]) -> None:
+    assert frame_columns(lf) == {"a", "b"}
+    assert frame_columns(lf) == {"a", "b"}
+    assert len(schema_calls) == 1
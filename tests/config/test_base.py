@@ -36,6 +36,34 @@ class TestIdentity:
         assert DemoConfig.ensure_prefix("foo") == "openicu.config.demo.foo"
         assert DemoConfig.ensure_prefix("openicu.config.demo.foo") == "openicu.config.demo.foo"
 
+    def test_identity_is_computed_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        calls = []
+        compute = DemoConfig._compute_identity
+        monkeypatch.setattr(DemoConfig, "_compute_identity", lambda self: calls.append(self) or compute(self))
+
+        config = DemoConfig(name="x", version="1")
+        for _ in range(3):
+            assert config.identifier == "openicu.config.demo.x.1"
+            assert config.identifier_tuple == ("demo", "x", "1")
+            assert config.uuid is config.uuid
+        assert len(calls) == 1
+
+    def test_identity_follows_mutation(self) -> None:
+        config = DemoConfig(name="x", version="1")
+        config.name = "y"
+        assert config.identifier == "openicu.config.demo.y.1"
+        assert config.uuid == DemoConfig(name="y", version="1").uuid
+        assert config == DemoConfig(name="y", version="1")
+
+        copied = config.model_copy(update={"version": "2"})
+        assert copied.identifier_tuple == ("demo", "y", "2")
+        assert config.identifier_tuple == ("demo", "y", "1")
+
+    def test_dataset_identity(self) -> None:
+        config = DemoDatasetConfig(name="t", version="1.0", dataset="db")
+        assert config.identifier_tuple == ("demo", "t", "1.0")
+        assert "_identity" not in config.model_dump()
+
 
 class TestSerialization:
     def test_save_load_round_trip(self, tmp_path: Path) -> None:
@@ -0,0 +1,109 @@
+"""Tests for the persistent configuration cache."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from open_icu.config.cache import CACHE_DIR_ENV, ConfigCache, _model_fingerprint, _source_hash, default_cache_path
+from open_icu.config.registry import ConfigSource
+from open_icu.steps.extraction.config.table import TableConfig
+from tests.config.test_inheritance import make_version
+
+
+@pytest.fixture
+def reads(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    """Record every source read from the YAML files."""
+    calls = []
+    read = ConfigSource.read
+
+    def counting_read(self: ConfigSource, config_type: type) -> list:
+        calls.append(self.path)
+        return read(self, config_type)
+
+    monkeypatch.setattr(ConfigSource, "read", counting_read)
+    return calls
+
+
+def touch(path: Path, content: str) -> None:
+    stat = path.stat()
+    path.write_text(content)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestConfigCache:
+    def test_warm_load_skips_yaml(self, tmp_path: Path, reads: list[Path]) -> None:
+        version_dir = make_version(tmp_path, "db", "1.0", {"t": "path: t.csv\n"})
+        cache = ConfigCache(tmp_path / "cache")
+
+        cold = ConfigSource(("db", "1.0"), version_dir / "tables", cache).load(TableConfig)
+        warm = ConfigSource(("db", "1.0"), version_dir / "tables", cache).load(TableConfig)
+
+        assert len(reads) == 1
+        assert warm == cold
+        assert warm[0].identifier == "openicu.config.table.db.1.0.t"
+
+    def test_changed_file_invalidates(self, tmp_path: Path, reads: list[Path]) -> None:
+        version_dir = make_version(tmp_path, "db", "1.0", {"t": "path: t.csv\n"})
+        cache = ConfigCache(tmp_path / "cache")
+        ConfigSource(("db", "1.0"), version_dir / "tables", cache).load(TableConfig)
+
+        touch(version_dir / "tables" / "t.yml", "path: changed.csv\n")
+        configs = ConfigSource(("db", "1.0"), version_dir / "tables", cache).load(TableConfig)
+
+        assert len(reads) == 2
+        assert configs[0].path == "changed.csv"
+        assert len(list(cache.path.glob("*.pickle"))) == 1
+
+    def test_changed_base_version_invalidates(self, tmp_path: Path, reads: list[Path]) -> None:
+        base_dir = make_version(tmp_path, "db", "1.0", {"t": "path: t.csv\n"})
+        version_dir = make_version(tmp_path, "db-demo", "1.0", {}, extends=("db", "1.0"))
+        cache = ConfigCache(tmp_path / "cache")
+        ConfigSource(("db-demo", "1.0"), version_dir / "tables", cache).load(TableConfig)
+
+        (base_dir / "tables" / "u.yml").write_text("path: u.csv\n")
+        configs = ConfigSource(("db-demo", "1.0"), version_dir / "tables", cache).load(TableConfig)
+
+        assert len(reads) == 2
+        assert sorted(config.name for config in configs) == ["t", "u"]
+
+    def test_unreadable_entry_is_a_miss(self, tmp_path: Path, reads: list[Path]) -> None:
+        version_dir = make_version(tmp_path, "db", "1.0", {"t": "path: t.csv\n"})
+        cache = ConfigCache(tmp_path / "cache")
+        ConfigSource(("db", "1.0"), version_dir / "tables", cache).load(TableConfig)
+
+        for entry in cache.path.glob("*.pickle"):
+            entry.write_bytes(b"corrupt")
+        configs = ConfigSource(("db", "1.0"), version_dir / "tables", cache).load(TableConfig)
+
+        assert len(reads) == 2
+        assert [config.name for config in configs] == ["t"]
+
+    def test_changed_model_code_invalidates(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        package = tmp_path / "custom_configs"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        model = package / "model.py"
+        model.write_text("from open_icu.config.base import BaseConfig\n\n\nclass CustomConfig(BaseConfig):\n    pass\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        from custom_configs.model import CustomConfig  # type: ignore[import-not-found]
+
+        def key() -> str:
+            _model_fingerprint.cache_clear()
+            _source_hash.cache_clear()
+            return ConfigCache.key(CustomConfig, "source", [])
+
+        before = key()
+        assert key() == before
+
+        # e.g. a new validator, which does not change the schema
+        model.write_text(model.read_text() + "\n\ndef helper() -> None:\n    pass\n")
+        assert key() != before
+
+    def test_default_path_from_environment(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+        assert default_cache_path() == tmp_path / "configs"
+
+        monkeypatch.delenv(CACHE_DIR_ENV)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+        assert default_cache_path() == tmp_path / "xdg" / "open_icu" / "configs"
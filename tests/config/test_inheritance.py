@@ -7,6 +7,7 @@ import pytest
 from open_icu.config.inheritance import (
     deep_merge,
     has_extends,
+    resolve_config_files,
     resolve_effective_configs,
     resolve_version_chain,
 )
@@ -128,6 +129,24 @@ class TestEffectiveConfigs:
         assert resolve_effective_configs(version_dir / "tables") == {"t": {"path": "t.csv"}}
 
 
+class TestConfigFiles:
+    def test_chain_files_and_markers_base_first(self, tmp_path: Path) -> None:
+        base_dir = make_version(tmp_path, "db", "1.0", {"a": "path: a.csv\n"})
+        version_dir = make_version(tmp_path, "db-demo", "1.0", {"b": "path: b.csv\n"}, extends=("db", "1.0"))
+
+        assert resolve_config_files(version_dir / "tables") == [
+            base_dir / "tables" / "a.yml",
+            version_dir / "extends.yml",
+            version_dir / "tables" / "b.yml",
+        ]
+
+    def test_without_marker_returns_own_files(self, tmp_path: Path) -> None:
+        version_dir = make_version(tmp_path, "db", "1.0", {"a": "path: a.csv\n"})
+
+        assert resolve_config_files(version_dir / "tables") == [version_dir / "tables" / "a.yml"]
+        assert resolve_config_files(version_dir / "mappings") == []
+
+
 class TestLoadConfigsWithInheritance:
     def test_identity_comes_from_extending_version(self, tmp_path: Path) -> None:
         make_version(tmp_path, "db", "1.0", {"t": "path: t.csv\n"})
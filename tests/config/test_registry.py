@@ -4,7 +4,7 @@ from pathlib import Path
 from typing import ClassVar
 
 from open_icu.config.base import BaseConfig
-from open_icu.config.registry import BaseConfigRegistry, load_configs
+from open_icu.config.registry import BaseConfigRegistry, ConfigSource, load_configs
 
 
 class RegConfig(BaseConfig):
@@ -79,6 +79,32 @@ class TestRegistry:
             "openicu.config.regtest.c.1.0",
         ]
 
+    def test_filter_matches_components_exactly(self) -> None:
+        registry = RegConfigRegistry()
+        for name, version in [("a", "1"), ("a", "1.1"), ("ab", "1")]:
+            registry.register(RegConfig(name=name, version=version))
+
+        assert [(c.name, c.version) for c in registry.filter("a")] == [("a", "1"), ("a", "1.1")]
+        assert [(c.name, c.version) for c in registry.filter("A", "1")] == [("a", "1")]
+        assert registry.filter("a", "1.") == []
+        assert len(registry.filter()) == 3
+        assert [c.name for c in registry.filter(excludes=["a.1", "a.1.1"])] == ["ab"]
+        assert [c.name for c in registry.filter("a", includes=["a.1.1"])] == ["a"]
+
+    def test_filter_index_follows_unregister_and_overwrite(self) -> None:
+        registry = RegConfigRegistry()
+        first = RegConfig(name="a", version="1")
+        registry.register(first)
+        registry.register(RegConfig(name="b", version="1"))
+
+        second = RegConfig(name="a", version="1")
+        registry.register(second, overwrite=True)
+        assert registry.filter("a") == [second]
+
+        registry.unregister(second.identifier)
+        assert registry.filter("a") == []
+        assert [c.name for c in registry.filter()] == ["b"]
+
     def test_save_round_trip(self, tmp_path: Path) -> None:
         registry = RegConfigRegistry()
         registry.register(RegConfig(name="a", version="1"))
@@ -90,6 +116,58 @@ class TestRegistry:
         assert sorted(reloaded.keys()) == sorted(registry.keys())
 
 
+class TestSources:
+    def sources(self, tmp_path: Path) -> RegConfigRegistry:
+        registry = RegConfigRegistry()
+        for name in ["a", "b"]:
+            (tmp_path / name).mkdir()
+            make_config_dir(tmp_path / name, [name])
+            registry.add_source(ConfigSource((name,), tmp_path / name / "configs"))
+        return registry
+
+    def test_sources_are_loaded_on_demand(self, tmp_path: Path) -> None:
+        registry = self.sources(tmp_path)
+
+        assert registry.get("a.1.0") is not None
+        assert [source.scope for source in registry.sources] == [("b",)]
+
+        assert [config.name for config in registry.filter("b")] == ["b"]
+        assert registry.sources == []
+
+    def test_listing_loads_all_sources(self, tmp_path: Path) -> None:
+        registry = self.sources(tmp_path)
+
+        assert len(registry) == 2
+        assert registry.sources == []
+
+    def test_registered_configs_take_precedence(self, tmp_path: Path) -> None:
+        registry = self.sources(tmp_path)
+        config = RegConfig(name="a", version="1.0")
+        registry.register(config)
+
+        registry.load_scope()
+        assert registry.get("a.1.0") is config
+
+    def test_save_and_clear_skip_pending_sources(self, tmp_path: Path) -> None:
+        registry = self.sources(tmp_path)
+        registry.load_scope("a")
+        registry.save(tmp_path / "out")
+        assert [path.name for path in (tmp_path / "out").rglob("*.yml")] == ["1.0.yml"]
+
+        registry.clear()
+        assert registry.sources == []
+        assert registry.get("b.1.0") is None
+
+    def test_scopes_match_dotted_components(self, tmp_path: Path) -> None:
+        source = ConfigSource(("mimic-iv", "2.2"), tmp_path)
+
+        assert source.matches(("mimic-iv.2.2.admissions",))
+        assert source.matches(("mimic-iv",))
+        assert source.matches(())
+        assert not source.matches(("mimic-iv-demo",))
+        assert not source.matches(("mimic-iv", "3.1"))
+
+
 class TestLoadConfigs:
     def test_skips_invalid_yaml_files(self, tmp_path: Path) -> None:
         config_dir = make_config_dir(tmp_path, ["good"])
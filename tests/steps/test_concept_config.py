@@ -4,8 +4,10 @@ from pathlib import Path
 
 import pytest
 
+from open_icu.steps.concept.config import mapping
 from open_icu.steps.concept.config.concept import ConceptConfig
 from open_icu.steps.concept.config.derived import DerivedDatasetConceptConfig
+from open_icu.steps.concept.config.mapping import MappingIndex
 from open_icu.steps.concept.config.simple import MappingConfig, SimpleDatasetConceptConfig
 
 
@@ -49,7 +51,70 @@ class TestConceptConfig:
         (mapping_dir / "heart_rate.yml").write_text("type: nonsense\n")
 
         concept = ConceptConfig.load(concept_file, dataset_paths=[mapping_dir])
-        assert concept.dataset_concepts == []
+        assert concept.dataset_concepts == ()
+
+    def test_dataset_concepts_are_indexed(self) -> None:
+        def simple(dataset: str) -> dict:
+            return {"type": "simple", "dataset": dataset, "version": "1.0", "name": "hr", "mappings": []}
+
+        concept = ConceptConfig.model_validate(
+            {"name": "hr", "version": "1.0.0", "unit": "bpm", "dataset_concepts": [simple("a")]}
+        )
+        assert concept.get_dataset_concept("a", "1.0") is concept.dataset_concepts[0]
+        assert concept.get_dataset_concept("a", "2.0") is None
+
+        added = SimpleDatasetConceptConfig.model_validate(simple("b"))
+        concept.add_dataset_concept(added)
+        assert concept.get_dataset_concept("b", "1.0") is added
+
+        assigned = SimpleDatasetConceptConfig.model_validate(simple("c"))
+        concept.dataset_concepts = (assigned,)
+        assert concept.get_dataset_concept("c", "1.0") is assigned
+        assert concept.get_dataset_concept("a", "1.0") is None
+
+        copied = concept.model_copy(update={"dataset_concepts": (added,)})
+        assert copied.get_dataset_concept("b", "1.0") is added
+        assert copied.get_dataset_concept("c", "1.0") is None
+
+    def test_load_shares_mapping_index(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        base_dir = tmp_path / "db" / "1.0" / "mappings"
+        base_dir.mkdir(parents=True)
+        demo_dir = tmp_path / "db-demo" / "1.0" / "mappings"
+        demo_dir.mkdir(parents=True)
+        (demo_dir.parent / "extends.yml").write_text("dataset: db\nversion: '1.0'\n")
+
+        concept_files = []
+        for name in ["heart_rate", "sodium"]:
+            concept_file = tmp_path / f"{name}.yml"
+            concept_file.write_text(f"name: {name}\nversion: 1.0.0\nunit: x\n")
+            concept_files.append(concept_file)
+            (base_dir / f"{name}.yml").write_text("type: simple\nmappings: []\n")
+
+        resolved = []
+        resolve = mapping.resolve_effective_configs
+        monkeypatch.setattr(mapping, "resolve_effective_configs", lambda path: resolved.append(path) or resolve(path))
+
+        index = MappingIndex(demo_dir)
+        concepts = [ConceptConfig.load(file, dataset_paths=[index]) for file in concept_files]
+
+        assert resolved == [demo_dir]
+        assert index.names == ["heart_rate", "sodium"]
+        for concept in concepts:
+            dataset_concept = concept.get_dataset_concept("db-demo", "1.0")
+            assert isinstance(dataset_concept, SimpleDatasetConceptConfig)
+            assert dataset_concept.name == concept.name
+
+    def test_mapping_index_returns_copies(self, tmp_path: Path) -> None:
+        mapping_dir = tmp_path / "db" / "1.0" / "mappings"
+        mapping_dir.mkdir(parents=True)
+        (mapping_dir / "heart_rate.yml").write_text("type: simple\nmappings: []\n")
+
+        index = MappingIndex(mapping_dir)
+        index.get("heart_rate")["type"] = "derived"  # type: ignore[index]
+
+        assert index.get("heart_rate") == {"type": "simple", "mappings": []}
+        assert "heart_rate" in index and "sodium" not in index
+        assert (index.dataset, index.version) == ("db", "1.0")
 
     def test_regex_built_from_pattern_parts(self) -> None:
         mapping = MappingConfig.model_validate(
@@ -61,7 +126,15 @@ class TestConceptConfig:
         assert mapping.pattern.code == "(220045//Heart Rate)"
 
     def test_regex_uses_wildcards_for_missing_parts(self) -> None:
-        mapping = MappingConfig.model_validate({"pattern": {"table": "example", "code": "(220045)", }, "columns": {}})
+        mapping = MappingConfig.model_validate(
+            {
+                "pattern": {
+                    "table": "example",
+                    "code": "(220045)",
+                },
+                "columns": {},
+            }
+        )
         assert mapping.pattern.code == "(220045)"
 
 
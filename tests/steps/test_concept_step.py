@@ -1,11 +1,22 @@
 """End-to-end tests for the concept step on synthetic fixture data."""
 
+import os
+import shutil
+import warnings
 from pathlib import Path
 
 import polars as pl
 import pytest
 
 from open_icu import ConceptStep, ExtractionStep, OpenICUProject
+from open_icu.steps.base.executor import Task, run_task_graph
+from open_icu.steps.concept.config.concept import ConceptConfig
+from open_icu.config.base import BaseDatasetConfig
+from open_icu.config.cache import ConfigCache
+from open_icu.config.registry import ConfigSource
+from open_icu.steps.concept.registry import ConceptMappingSource, concept_config_registry
+from open_icu.steps.extraction.registry import dataset_config_registry
+from open_icu.storage.partitioned import PartitionedParquet, scan_source
 from tests.steps.conftest import load_concept_config, load_extracation_config
 
 
@@ -74,6 +85,344 @@ class TestDerivedConcepts:
             assert expected in code_list
 
 
+class TestCodeResolution:
+    def test_pattern_is_resolved_against_code_vocabulary(self, project: OpenICUProject, concept_config: Path) -> None:
+        step = ConceptStep.load(project, concept_config)
+        event_path = project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "vitals" / "CHART"
+        # the tiny fixture files may share the vocabulary's timestamp
+        codes_path = project.datasets_path / "extraction" / "metadata" / "codes.parquet"
+        mtime = codes_path.stat().st_mtime_ns + 10**9
+        os.utime(codes_path, ns=(mtime, mtime))
+
+        codes = step.matching_codes("^220045//Heart Rate", event_path)
+        assert codes is not None
+        # matched after removing the event name from CHART//220045//Heart Rate//bpm
+        assert codes.to_list() == ["CHART//220045//Heart Rate//bpm"]
+        assert step.matching_codes("^no match$", event_path).to_list() == []
+
+    def test_resolved_codes_filter_events(self, project: OpenICUProject, concept_config: Path) -> None:
+        step = ConceptStep.load(project, concept_config)
+        event_path = project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "vitals" / "CHART"
+        codes_path = project.datasets_path / "extraction" / "metadata" / "codes.parquet"
+        mtime = codes_path.stat().st_mtime_ns + 10**9
+        os.utime(codes_path, ns=(mtime, mtime))
+
+        patterns = ["^220045//Heart Rate", "^220050//"]
+        assert all(step.matching_codes(pattern, event_path) is not None for pattern in patterns)
+        # Polars reports deprecations raised in its engine instead of raising
+        # them, so -W error alone would not fail here
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            df = scan_source(event_path).filter(step._code_filter(patterns, event_path)).collect()
+
+        assert df.height == 3
+        assert not [warning for warning in caught if issubclass(warning.category, DeprecationWarning)]
+
+    def test_modified_event_file_falls_back_to_pattern(self, project: OpenICUProject, concept_config: Path) -> None:
+        step = ConceptStep.load(project, concept_config)
+        event_path = project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "vitals" / "CHART"
+        part = PartitionedParquet(event_path).parts[0]
+        pl.read_parquet(part).write_parquet(part)
+
+        assert step.matching_codes("^220045//Heart Rate", event_path) is None
+
+
+class TestGroupedExtraction:
+    def test_event_file_is_scanned_once_for_all_concepts(
+        self, tmp_path: Path, extraction_config: Path, concept_config: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        (tmp_path / "config" / "concepts" / "systolic_bp.yml").write_text(
+            "name: systolic_bp\nversion: 1.0.0\nunit: mmHg\nlimits:\n  max: 100\n"
+        )
+        mapping_dir = tmp_path / "config" / "testdb" / "1.0" / "mappings"
+        (mapping_dir / "systolic_bp.yml").write_text(
+            """\
+type: simple
+mappings:
+  - pattern:
+      table: vitals
+      event: CHART
+      code: (220050//Systolic BP)
+    columns:
+      numeric_value: col(numeric_value)
+"""
+        )
+
+        project = OpenICUProject(tmp_path / "project")
+        load_extracation_config(tmp_path / "config" / "testdb" / "1.0" / "tables")
+        load_concept_config(tmp_path / "config" / "concepts", [mapping_dir])
+        ExtractionStep.load(project, extraction_config).run()
+
+        scans: dict[str, int] = {}
+
+        def counting_scan_source(path: Path) -> pl.LazyFrame:
+            def count(series: pl.Series) -> pl.Series:
+                scans[path.name] = scans.get(path.name, 0) + 1
+                return series
+
+            return scan_source(path).with_columns(pl.col("subject_id").map_batches(count, return_dtype=pl.Int64))
+
+        monkeypatch.setattr("open_icu.steps.concept.step.scan_source", counting_scan_source)
+        ConceptStep.load(project, concept_config).run()
+
+        assert scans["CHART"] == 1
+        heart_rate = pl.read_parquet(concept_path(project, "heart_rate")).sort("time")
+        assert heart_rate["numeric_value"].to_list() == [80.0, 82.0]
+        systolic_bp = pl.read_parquet(concept_path(project, "systolic_bp"))
+        assert systolic_bp["code"].to_list() == ["systolic_bp//mmHg"]
+        assert systolic_bp["numeric_value"].to_list() == [None]  # above the concept's limit
+
+    def test_concept_with_several_mappings_is_written_once(
+        self, tmp_path: Path, extraction_config: Path, concept_config: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        mapping_dir = tmp_path / "config" / "testdb" / "1.0" / "mappings"
+        (mapping_dir / "patient_weight.yml").write_text(
+            """\
+type: simple
+mappings:
+  - pattern:
+      table: measurements
+      event: WEIGHT
+      code: kg
+    columns:
+      numeric_value: col(numeric_value)
+  - pattern:
+      table: vitals
+      event: CHART
+      code: (220045//Heart Rate)
+    columns:
+      numeric_value: col(numeric_value)
+"""
+        )
+
+        project = OpenICUProject(tmp_path / "project")
+        load_extracation_config(tmp_path / "config" / "testdb" / "1.0" / "tables")
+        load_concept_config(tmp_path / "config" / "concepts", [mapping_dir])
+        ExtractionStep.load(project, extraction_config).run()
+
+        sinks: list[Path] = []
+        sink_parquet = pl.LazyFrame.sink_parquet
+
+        def recording_sink_parquet(self: pl.LazyFrame, path: Path, **kwargs) -> pl.LazyFrame | None:
+            sinks.append(Path(path))
+            return sink_parquet(self, path, **kwargs)
+
+        monkeypatch.setattr(pl.LazyFrame, "sink_parquet", recording_sink_parquet)
+        ConceptStep.load(project, concept_config).run()
+
+        weight_sinks = [path for path in sinks if "patient_weight" in path.parts]
+        assert [path.name for path in weight_sinks] == ["testdb.parquet"]
+        weight = pl.read_parquet(concept_path(project, "patient_weight"))
+        assert sorted(weight["numeric_value"].to_list()) == [60.0, 80.0, 80.0, 82.0]
+
+
+class TestParallelExecution:
+    def test_parallel_extraction_matches_sequential(self, project: OpenICUProject, concept_config: Path) -> None:
+        text = concept_config.read_text()
+        concept_config.write_text(text.replace("config:\n", "config:\n  execution:\n    jobs: 2\n", 1))
+        parallel_project = OpenICUProject(project.path.parent / "parallel")
+        ExtractionStep.load(parallel_project, concept_config.parent / "extraction.yml").run()
+        ConceptStep.load(parallel_project, concept_config).run()
+
+        for name in ["heart_rate", "patient_weight", "patient_height", "bmi"]:
+            expected = pl.read_parquet(concept_path(project, name)).sort(pl.all())
+            assert pl.read_parquet(concept_path(parallel_project, name)).sort(pl.all()).equals(expected)
+
+    def test_datasets_share_one_task_graph(
+        self, tmp_path: Path, extraction_config: Path, concept_config: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        project = OpenICUProject(tmp_path / "project")
+        load_extracation_config(tmp_path / "config" / "testdb" / "1.0" / "tables")
+        ExtractionStep.load(project, extraction_config).run()
+
+        # a second dataset with the same extracted data and mappings
+        data_path = project.datasets_path / "extraction" / "data"
+        shutil.copytree(data_path / "testdb", data_path / "otherdb")
+        mapping_dirs = [tmp_path / "config" / name / "1.0" / "mappings" for name in ["testdb", "otherdb"]]
+        shutil.copytree(mapping_dirs[0], mapping_dirs[1])
+        load_concept_config(tmp_path / "config" / "concepts", mapping_dirs)
+        concept_config.write_text(
+            concept_config.read_text().replace("config:\n", "config:\n  execution:\n    jobs: 2\n", 1)
+            + '    - name: otherdb\n      version: "1.0"\n'
+        )
+
+        graphs: list[list[Task]] = []
+
+        def recording_run_task_graph(func, tasks, *args) -> None:
+            graphs.append(list(tasks))
+            run_task_graph(func, graphs[-1], *args)
+
+        monkeypatch.setattr("open_icu.steps.concept.step.run_task_graph", recording_run_task_graph)
+        ConceptStep.load(project, concept_config).run()
+
+        assert len(graphs) == 1
+        assert {task.key[0] for task in graphs[0]} == {"otherdb", "testdb"}
+        for name in ["heart_rate", "bmi"]:
+            expected = pl.read_parquet(concept_path(project, name)).drop("dataset", strict=False).sort(pl.all())
+            other = pl.read_parquet(concept_path(project, name).with_name("otherdb.parquet"))
+            assert other.drop("dataset", strict=False).sort(pl.all()).equals(expected)
+
+
+class TestIncrementalRecomputation:
+    @staticmethod
+    def mtimes(project: OpenICUProject) -> dict[str, int]:
+        workspace = project.workspace_path / "concept"
+        return {path.parent.parent.name: path.stat().st_mtime_ns for path in workspace.rglob("testdb.parquet")}
+
+    def test_unchanged_concepts_are_not_recomputed(self, project: OpenICUProject, concept_config: Path) -> None:
+        before = self.mtimes(project)
+        ConceptStep.load(project, concept_config).run()
+
+        assert set(before) == {"heart_rate", "patient_weight", "patient_height", "bmi"}
+        assert self.mtimes(project) == before
+
+    def test_noop_rerun_rewrites_nothing(self, project: OpenICUProject, tmp_path: Path, concept_config: Path) -> None:
+        def files() -> dict[Path, int]:
+            return {
+                path: path.stat().st_mtime_ns
+                for root in [project.workspace_path, project.datasets_path]
+                for path in root.rglob("*")
+                if path.is_file()
+            }
+
+        before = files()
+        ExtractionStep.load(project, tmp_path / "extraction.yml").run()
+        ConceptStep.load(project, concept_config).run()
+
+        after = files()
+        assert set(self.mtimes(project)) == {"heart_rate", "patient_weight", "patient_height", "bmi"}
+        # neither events, concepts nor code vocabularies are written again
+        assert {path.name for path in after if after[path] != before.get(path)} == {"dataset.json"}
+
+    @pytest.mark.parametrize("collected_fingerprint", [True, False])
+    def test_copied_extraction_files_are_not_recomputed(
+        self, project: OpenICUProject, concept_config: Path, collected_fingerprint: bool
+    ) -> None:
+        extraction = project.datasets_path / "extraction" / "data"
+        if not collected_fingerprint:
+            # falls back to hashing the contents of the table files
+            for fingerprint in extraction.rglob("_fingerprint.json"):
+                fingerprint.unlink()
+            ConceptStep.load(project, concept_config).run()
+
+        before = self.mtimes(project)
+        for path in extraction.rglob("*.parquet"):
+            os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+        ConceptStep.load(project, concept_config).run()
+
+        assert self.mtimes(project) == before
+
+    def test_changed_concept_and_dependents_are_recomputed(self, project: OpenICUProject, concept_config: Path) -> None:
+        before = self.mtimes(project)
+        height = concept_config_registry.get(ConceptConfig.ensure_prefix("patient_height.1.0.0"))
+        assert height is not None
+        height.limits.max = 1.8  # drops the 2.0 m height of subject 1
+        ConceptStep.load(project, concept_config).run()
+
+        after = self.mtimes(project)
+        assert {name for name in before if after[name] != before[name]} == {"patient_height", "bmi"}
+        bmi = pl.read_parquet(concept_path(project, "bmi")).sort("subject_id")
+        assert bmi["numeric_value"].to_list()[0] is None
+
+    def test_missing_output_is_recomputed(self, project: OpenICUProject, concept_config: Path) -> None:
+        output = project.workspace_path / "concept" / "heart_rate" / "1.0.0" / "testdb.parquet"
+        output.unlink()
+        ConceptStep.load(project, concept_config).run()
+
+        assert pl.read_parquet(output).height == 2
+
+
+class TestCohort:
+    def test_cohort_restricts_concept_inputs(self, project: OpenICUProject, concept_config: Path) -> None:
+        text = concept_config.read_text()
+        concept_config.write_text(text.replace("config:\n", "cohort:\n  subjects:\n    - 2\nconfig:\n", 1))
+        ConceptStep.load(project, concept_config).run()
+
+        assert pl.read_parquet(concept_path(project, "heart_rate")).is_empty()
+        assert pl.read_parquet(concept_path(project, "patient_weight"))["subject_id"].to_list() == [2]
+        assert pl.read_parquet(concept_path(project, "bmi"))["subject_id"].to_list() == [2]
+
+
+class TestLazyConfigs:
+    def test_steps_load_sources_of_their_datasets(
+        self, tmp_path: Path, extraction_config: Path, concept_config: Path
+    ) -> None:
+        config_dir = tmp_path / "config"
+        shutil.copytree(config_dir / "testdb" / "1.0", config_dir / "otherdb" / "1.0")
+        concept_config_registry.add_source(ConfigSource((), config_dir / "concepts"))
+        for dataset in ["testdb", "otherdb"]:
+            version_dir = config_dir / dataset / "1.0"
+            dataset_config_registry.add_source(ConfigSource((dataset, "1.0"), version_dir / "tables"))
+            concept_config_registry.add_source(ConceptMappingSource(version_dir / "mappings"))
+
+        project = OpenICUProject(tmp_path / "project")
+        ExtractionStep.load(project, extraction_config).run()
+        ConceptStep.load(project, concept_config).run()
+
+        assert concept_path(project, "heart_rate").exists()
+        assert [source.scope for source in dataset_config_registry.sources] == [("otherdb", "1.0")]
+        assert [source.scope for source in concept_config_registry.sources] == [("otherdb", "1.0")]
+
+    def test_sources_add_mappings_to_loaded_concepts(
+        self, tmp_path: Path, extraction_config: Path, concept_config: Path
+    ) -> None:
+        config_dir = tmp_path / "config"
+        shutil.copytree(config_dir / "testdb" / "1.0", config_dir / "otherdb" / "1.0")
+        concept_config_registry.add_source(ConfigSource((), config_dir / "concepts"))
+        for dataset in ["testdb", "otherdb"]:
+            concept_config_registry.add_source(ConceptMappingSource(config_dir / dataset / "1.0" / "mappings"))
+
+        concept_config_registry.load_dataset("testdb", "1.0")
+        height = concept_config_registry.get(ConceptConfig.ensure_prefix("patient_height.1.0.0"))
+        assert height is not None
+        assert height.get_dataset_concept("otherdb", "1.0") is None
+
+        concept_config_registry.load_dataset("otherdb", "1.0")
+        assert concept_config_registry.get(ConceptConfig.ensure_prefix("patient_height.1.0.0")) is height
+        assert height.get_dataset_concept("otherdb", "1.0") is not None
+
+    def test_mappings_apply_regardless_of_load_order(
+        self, tmp_path: Path, extraction_config: Path, concept_config: Path
+    ) -> None:
+        config_dir = tmp_path / "config"
+        concept_config_registry.add_source(ConceptMappingSource(config_dir / "testdb" / "1.0" / "mappings"))
+        concept_config_registry.add_source(ConfigSource((), config_dir / "concepts"))
+
+        concept_config_registry.load_dataset("testdb", "1.0")
+        height = concept_config_registry.get(ConceptConfig.ensure_prefix("patient_height.1.0.0"))
+        assert height is not None
+        assert height.get_dataset_concept("testdb", "1.0") is not None
+
+    def test_get_only_loads_concepts(self, tmp_path: Path, extraction_config: Path, concept_config: Path) -> None:
+        config_dir = tmp_path / "config"
+        shutil.copytree(config_dir / "testdb" / "1.0", config_dir / "otherdb" / "1.0")
+        concept_config_registry.add_source(ConfigSource((), config_dir / "concepts"))
+        for dataset in ["testdb", "otherdb"]:
+            concept_config_registry.add_source(ConceptMappingSource(config_dir / dataset / "1.0" / "mappings"))
+
+        height = concept_config_registry.get(ConceptConfig.ensure_prefix("patient_height.1.0.0"))
+        assert height is not None
+        assert height.dataset_concepts == ()
+        assert [source.scope for source in concept_config_registry.sources] == [("testdb", "1.0"), ("otherdb", "1.0")]
+
+        concept_config_registry.load_scope()
+        assert concept_config_registry.get(ConceptConfig.ensure_prefix("patient_height.1.0.0")) is height
+        assert {(dc.dataset, dc.version) for dc in height.dataset_concepts} == {("testdb", "1.0"), ("otherdb", "1.0")}
+
+    def test_mapping_sources_are_cached(self, tmp_path: Path, extraction_config: Path, concept_config: Path) -> None:
+        mapping_dir = tmp_path / "config" / "testdb" / "1.0" / "mappings"
+        cache = ConfigCache(tmp_path / "cache")
+
+        cold = ConceptMappingSource(mapping_dir, cache).load(BaseDatasetConfig)
+        warm = ConceptMappingSource(mapping_dir, cache).load(BaseDatasetConfig)
+        assert sorted(dc.name for dc in warm) == sorted(dc.name for dc in cold)
+        assert "heart_rate" in {dc.name for dc in warm}
+
+        (mapping_dir / "heart_rate.yml").unlink()
+        updated = ConceptMappingSource(mapping_dir, cache).load(BaseDatasetConfig)
+        assert "heart_rate" not in {dc.name for dc in updated}
+
+
 class TestConceptStepRobustness:
     def test_mapping_ignores_event_name_after_code_prefix(
         self, tmp_path: Path, extraction_config: Path, concept_config: Path
@@ -101,23 +450,16 @@ mappings:
 
         ExtractionStep.load(project, extraction_config).run()
 
-        event_path = (
-            project.datasets_path
-            / "extraction"
-            / "data"
-            / "testdb"
-            / "1.0"
-            / "vitals"
-            / "CHART.parquet"
-        )
-        df = pl.read_parquet(event_path).with_columns(
+        event_path = project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "vitals" / "CHART"
+        part = PartitionedParquet(event_path).parts[0]
+        df = pl.read_parquet(part).with_columns(
             pl.concat_str(
                 pl.lit("PREFIX"),
                 pl.col("code"),
                 separator="//",
             ).alias("code")
         )
-        df.write_parquet(event_path)
+        df.write_parquet(part)
 
         ConceptStep.load(project, concept_config).run()
 
@@ -0,0 +1,162 @@
+"""Tests for the process-based task scheduler shared by the steps."""
+
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+import pytest
+
+from open_icu.steps.base import executor
+from open_icu.steps.base.config import ExecutionConfig
+from open_icu.steps.base.executor import Task, _select_task, run_task_graph, run_tasks
+from open_icu.utils.process import is_worker_process
+
+
+def write_marker(directory: Path, name: str) -> None:
+    (directory / name).write_text(name)
+
+
+def write_worker_info(directory: Path, name: str) -> None:
+    (directory / name).write_text(f"{pl.thread_pool_size()} {is_worker_process()}")
+
+
+def append_name(names: list[str], name: str) -> None:
+    names.append(name)
+
+
+def fail(directory: Path, name: str) -> None:
+    raise ValueError(name)
+
+
+class FakePool:
+    """In-process stand-in for the process pool recording when tasks start and finish.
+
+    Tasks never run; ``wait`` finishes the oldest running task, so the schedule
+    only depends on the scheduler and not on timing.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.events: list[tuple[str, str]] = []
+        self.running: list[tuple[Future[Any], str]] = []
+
+    def __enter__(self) -> "FakePool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+    def submit(self, fn: Callable[..., Any], func: Callable[..., Any], args: tuple[Any, ...]) -> Future[Any]:
+        future: Future[Any] = Future()
+        self.events.append(("start", args[0]))
+        self.running.append((future, args[0]))
+        return future
+
+    def wait(self, futures: Iterable[Future[Any]], return_when: str) -> tuple[set[Future[Any]], set[Future[Any]]]:
+        future, name = self.running.pop(0)
+        self.events.append(("finish", name))
+        future.set_result(None)
+        return {future}, set()
+
+
+@pytest.fixture
+def fake_pool(monkeypatch: pytest.MonkeyPatch) -> FakePool:
+    pool = FakePool()
+    monkeypatch.setattr(executor, "ProcessPoolExecutor", lambda **kwargs: pool)
+    monkeypatch.setattr(executor, "wait", pool.wait)
+    return pool
+
+
+class TestSelectTask:
+    def test_picks_largest_task_within_budget(self) -> None:
+        pending = [Task("big", (), 80), Task("medium", (), 30), Task("small", (), 10)]
+        assert _select_task(pending, available=50, running=1) is pending[1]
+
+    def test_waits_if_nothing_fits_while_tasks_run(self) -> None:
+        assert _select_task([Task("big", (), 80)], available=50, running=1) is None
+
+    def test_oversized_task_runs_alone(self) -> None:
+        pending = [Task("big", (), 80)]
+        assert _select_task(pending, available=50, running=0) is pending[0]
+
+    def test_unlimited_budget(self) -> None:
+        pending = [Task("big", (), 80)]
+        assert _select_task(pending, available=None, running=3) is pending[0]
+
+
+class TestRunTasks:
+    def test_sequential(self, tmp_path: Path) -> None:
+        tasks = [Task(name, (name,), 1) for name in ["a", "b"]]
+        run_tasks(write_marker, tasks, tmp_path, ExecutionConfig())
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a", "b"]
+
+    def test_parallel_within_budget(self, fake_pool: FakePool) -> None:
+        costs = {"a": 70, "b": 60, "c": 20, "d": 10}
+        tasks = [Task(name, (name,), cost) for name, cost in costs.items()]
+        run_tasks(write_marker, tasks, None, ExecutionConfig(jobs=3, memory_budget="100B"))
+
+        # the largest task starts first and the small ones fill the remaining
+        # budget instead of queueing behind the medium task, which only starts
+        # once enough budget is released
+        assert fake_pool.events == [
+            ("start", "a"),
+            ("start", "c"),
+            ("start", "d"),
+            ("finish", "a"),
+            ("start", "b"),
+            ("finish", "c"),
+            ("finish", "d"),
+            ("finish", "b"),
+        ]
+
+    def test_parallel_limits_jobs(self, fake_pool: FakePool) -> None:
+        tasks = [Task(name, (name,), 1) for name in ["a", "b", "c"]]
+        run_tasks(write_marker, tasks, None, ExecutionConfig(jobs=2))
+
+        assert fake_pool.events == [
+            ("start", "a"),
+            ("start", "b"),
+            ("finish", "a"),
+            ("start", "c"),
+            ("finish", "b"),
+            ("finish", "c"),
+        ]
+
+    def test_workers(self, tmp_path: Path) -> None:
+        tasks = [Task(name, (name,)) for name in ["a", "b"]]
+        run_tasks(write_worker_info, tasks, tmp_path, ExecutionConfig(jobs=2, threads_per_job=2))
+        assert [(tmp_path / name).read_text() for name in ["a", "b"]] == ["2 True", "2 True"]
+        assert not is_worker_process()
+
+    def test_parallel_propagates_errors(self, tmp_path: Path) -> None:
+        tasks = [Task(name, (name,)) for name in ["a", "b"]]
+        with pytest.raises(ValueError):
+            run_tasks(fail, tasks, tmp_path, ExecutionConfig(jobs=2))
+
+
+class TestRunTaskGraph:
+    def test_sequential_topological_order(self) -> None:
+        names: list[str] = []
+        tasks = [Task(name, (name,)) for name in ["c", "b", "a"]]
+        run_task_graph(append_name, tasks, {"c": ["b"], "b": ["a"]}, names, ExecutionConfig())
+        assert names == ["a", "b", "c"]
+
+    def test_parallel_respects_dependencies(self, fake_pool: FakePool) -> None:
+        tasks = [Task(name, (name,)) for name in ["a", "b", "c"]]
+        run_task_graph(write_marker, tasks, {"c": ["a", "b", "missing"]}, None, ExecutionConfig(jobs=3))
+
+        # independent tasks run concurrently, the dependent task after both
+        assert fake_pool.events == [
+            ("start", "a"),
+            ("start", "b"),
+            ("finish", "a"),
+            ("finish", "b"),
+            ("start", "c"),
+            ("finish", "c"),
+        ]
+
+    def test_parallel_propagates_errors(self, tmp_path: Path) -> None:
+        tasks = [Task(name, (name,)) for name in ["a", "b", "c"]]
+        with pytest.raises(ValueError):
+            run_task_graph(fail, tasks, {"c": ["a"]}, tmp_path, ExecutionConfig(jobs=2))
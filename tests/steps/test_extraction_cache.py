@@ -0,0 +1,62 @@
+"""Tests for the in-memory join table cache."""
+
+import polars as pl
+
+from open_icu.steps.extraction.cache import JoinTableCache
+
+
+def frame(rows: int) -> pl.DataFrame:
+    return pl.DataFrame({"x": list(range(rows))}, schema={"x": pl.Int64})
+
+
+class TestJoinTableCache:
+    def test_get_returns_cached_frame(self) -> None:
+        cache = JoinTableCache(max_bytes=1024)
+        df = frame(10)
+        cache.put("a", df)
+
+        assert cache.get("a") is df
+        assert cache.get("b") is None
+        assert cache.size == df.estimated_size()
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = JoinTableCache(max_bytes=frame(10).estimated_size() * 2)
+        cache.put("a", frame(10))
+        cache.put("b", frame(10))
+        cache.get("a")
+        cache.put("c", frame(10))
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.size <= cache.max_bytes
+
+    def test_frames_over_budget_are_not_cached(self) -> None:
+        cache = JoinTableCache(max_bytes=frame(10).estimated_size())
+        cache.put("a", frame(10))
+        cache.put("b", frame(20))
+
+        assert "a" in cache
+        assert "b" not in cache
+
+    def test_replacing_a_key_updates_size(self) -> None:
+        cache = JoinTableCache(max_bytes=1024)
+        cache.put("a", frame(10))
+        cache.put("a", frame(5))
+
+        assert len(cache) == 1
+        assert cache.size == frame(5).estimated_size()
+
+    def test_resize_evicts_and_zero_disables(self) -> None:
+        cache = JoinTableCache(max_bytes=1024)
+        cache.put("a", frame(10))
+        cache.put("b", frame(10))
+
+        cache.resize(frame(10).estimated_size())
+        assert len(cache) == 1
+        assert "b" in cache
+
+        cache.resize(0)
+        cache.put("c", frame(1))
+        assert len(cache) == 0
+        assert cache.size == 0
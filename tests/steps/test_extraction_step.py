@@ -1,12 +1,19 @@
 """End-to-end tests for the extraction step on synthetic fixture data."""
 
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
 import polars as pl
 import pytest
 
-from open_icu import ExtractionStep, OpenICUProject
+from open_icu import ExtractionStep, OpenICUProject, PersistenceStep
+from open_icu.callbacks.registry import register_callback_cls, registry
+from open_icu.steps.extraction.cache import join_table_cache
+from open_icu.steps.extraction.registry import dataset_config_registry
+from open_icu.storage.partitioned import PartitionedParquet, scan_source
 from tests.steps.conftest import load_extracation_config
 
 
@@ -38,14 +45,41 @@ def run_extraction(
     return project
 
 
+def read_event(path: Path) -> pl.DataFrame:
+    return scan_source(path).collect()
+
+
+@contextmanager
+def count_scans() -> Iterator[list[int]]:
+    """Register a ``count_scans(<int column>)`` callback recording the size of every scanned batch."""
+    scans: list[int] = []
+
+    @register_callback_cls
+    class CountScans:
+        def __init__(self, column: str) -> None:
+            self.column = column
+
+        def __call__(self, lf: pl.LazyFrame) -> pl.Expr:
+            def count(series: pl.Series) -> pl.Series:
+                scans.append(series.len())
+                return series
+
+            return pl.col(self.column).map_batches(count, return_dtype=pl.Int64)
+
+    try:
+        yield scans
+    finally:
+        registry.unregister("count_scans")
+
+
 class TestExtractionStep:
     def test_writes_meds_parquet_per_event(self, tmp_path: Path, extraction_config: Path) -> None:
         project = run_extraction(tmp_path, extraction_config)
 
-        output = project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "vitals" / "CHART.parquet"
+        output = project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "vitals" / "CHART"
         assert output.exists()
 
-        df = pl.read_parquet(output)
+        df = read_event(output)
         assert df.height == 4
         assert df.schema["subject_id"] == pl.Int64
         assert df.schema["time"] == pl.Datetime(time_unit="us")
@@ -87,17 +121,15 @@ class TestExtractionStep:
             extraction_config,
             include_event_name_in_code=include_event_name,
         )
-        df = pl.read_parquet(
-            project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "vitals" / "CHART.parquet"
-        )
+        df = read_event(project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "vitals" / "CHART")
 
         assert set(df["code"].to_list()) == expected_codes
 
     def test_join_and_values(self, tmp_path: Path, extraction_config: Path) -> None:
         project = run_extraction(tmp_path, extraction_config)
-        df = pl.read_parquet(
-            project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "vitals" / "CHART.parquet"
-        ).sort("time")
+        df = read_event(project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "vitals" / "CHART").sort(
+            "time"
+        )
 
         heart_rates = df.filter(pl.col("code").str.contains("Heart Rate"))
         assert heart_rates["numeric_value"].to_list() == [80.0, 82.0]
@@ -129,8 +161,8 @@ class TestExtractionStep:
         )
         base = project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "measurements"
 
-        weight = pl.read_parquet(base / "WEIGHT.parquet")
-        height = pl.read_parquet(base / "HEIGHT.parquet")
+        weight = read_event(base / "WEIGHT")
+        height = read_event(base / "HEIGHT")
 
         assert weight["code"].unique().to_list() == [weight_code]
         assert height["code"].unique().to_list() == [height_code]
@@ -165,7 +197,7 @@ class TestExtractionStep:
 
     def test_rerun_is_skipped_without_overwrite(self, tmp_path: Path, extraction_config: Path) -> None:
         project = run_extraction(tmp_path, extraction_config)
-        output = project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "vitals" / "CHART.parquet"
+        output = project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "vitals" / "CHART"
         first_mtime = output.stat().st_mtime_ns
 
         load_extracation_config(tmp_path / "config" / "testdb" / "1.0" / "tables")
@@ -207,8 +239,8 @@ config:
 
         data_path = project.datasets_path / "extraction" / "data"
         # measurements still processed, vitals skipped
-        assert (data_path / "testdb" / "1.0" / "measurements" / "WEIGHT.parquet").exists()
-        assert not (data_path / "testdb" / "1.0" / "vitals" / "CHART.parquet").exists()
+        assert (data_path / "testdb" / "1.0" / "measurements" / "WEIGHT").exists()
+        assert not (data_path / "testdb" / "1.0" / "vitals" / "CHART").exists()
 
     def test_config_snapshot_saved_to_project(self, tmp_path: Path, extraction_config: Path) -> None:
         project = run_extraction(tmp_path, extraction_config)
@@ -272,10 +304,10 @@ config:
         load_extracation_config(config_dir)
         ExtractionStep.load(project, config_file).run()
 
-        output = project.datasets_path / "extraction" / "data" / "pqdb" / "1.0" / "vitals" / "CHART.parquet"
+        output = project.datasets_path / "extraction" / "data" / "pqdb" / "1.0" / "vitals" / "CHART"
         assert output.exists()
 
-        df = pl.read_parquet(output).sort("subject_id")
+        df = read_event(output).sort("subject_id")
         assert df.schema["time"] == pl.Datetime(time_unit="us")  # native timestamp handled
         assert df["time"].to_list() == [datetime(2024, 1, 1, 8, 0), datetime(2024, 1, 2, 10, 0)]
         assert df["numeric_value"].to_list() == [80.0, 120.0]
@@ -337,8 +369,277 @@ config:
         load_extracation_config(tmp_path / "config" / "partdb" / "1.0" / "tables")
         ExtractionStep.load(project, config_file).run()
 
-        output = project.datasets_path / "extraction" / "data" / "partdb" / "1.0" / "observations" / "OBS.parquet"
-        df = pl.read_parquet(output).sort("subject_id")
+        output = project.datasets_path / "extraction" / "data" / "partdb" / "1.0" / "observations" / "OBS"
+        df = read_event(output).sort("subject_id")
         # both part files are read and concatenated
         assert df.height == 2
         assert df["numeric_value"].to_list() == [80.0, 120.0]
+
+    def test_fan_out_matches_per_event_extraction(self, tmp_path: Path, extraction_config: Path) -> None:
+        """Writing all events from one shared scan yields the same files as one scan per event."""
+        fan_out_project = run_extraction(tmp_path, extraction_config)
+
+        text = extraction_config.read_text()
+        extraction_config.write_text(text.replace("config:\n", "config:\n  settings:\n    fan_out_events: false\n", 1))
+        sequential_project = OpenICUProject(tmp_path / "sequential")
+        ExtractionStep.load(sequential_project, extraction_config).run()
+
+        fan_out_path = fan_out_project.datasets_path / "extraction" / "data"
+        sequential_path = sequential_project.datasets_path / "extraction" / "data"
+        fan_out_files = sorted(p.relative_to(fan_out_path) for p in fan_out_path.rglob("*.parquet"))
+        sequential_files = sorted(p.relative_to(sequential_path) for p in sequential_path.rglob("*.parquet"))
+
+        assert fan_out_files == sequential_files
+        assert len(fan_out_files) == 3
+        for relative in fan_out_files:
+            expected = pl.read_parquet(sequential_path / relative).sort(pl.all())
+            actual = pl.read_parquet(fan_out_path / relative).sort(pl.all())
+            assert actual.equals(expected)
+
+    @pytest.mark.parametrize(("fan_out_events", "expected_scans"), [(True, 1), (False, 2)])
+    def test_fan_out_evaluates_table_plan_once(
+        self,
+        tmp_path: Path,
+        extraction_config: Path,
+        table_config_dir: Path,
+        fan_out_events: bool,
+        expected_scans: int,
+    ) -> None:
+        """The measurements table has two events; fanning out evaluates its plan once."""
+        with count_scans() as scans:
+            measurements = table_config_dir / "measurements.yml"
+            measurements.write_text(measurements.read_text() + "\ncallbacks:\n  - count_scans(subject_id)\n")
+
+            text = extraction_config.read_text()
+            extraction_config.write_text(
+                text.replace(
+                    "config:\n",
+                    f"config:\n  settings:\n    fan_out_events: {str(fan_out_events).lower()}\n",
+                    1,
+                )
+            )
+            run_extraction(tmp_path, extraction_config)
+
+        assert scans == [2] * expected_scans
+
+    def test_fan_out_appends_events_with_the_same_name(
+        self, tmp_path: Path, extraction_config: Path, table_config_dir: Path
+    ) -> None:
+        """Events sharing an output file are written in consecutive passes."""
+        measurements = table_config_dir / "measurements.yml"
+        measurements.write_text(measurements.read_text().replace("  - name: HEIGHT\n", "  - name: WEIGHT\n"))
+
+        project = run_extraction(tmp_path, extraction_config, include_event_name_in_code=False)
+
+        base = project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "measurements"
+        assert sorted(p.name for p in base.iterdir() if p.is_dir()) == ["WEIGHT"]
+        assert len(PartitionedParquet(base / "WEIGHT").parts) == 2
+
+        df = read_event(base / "WEIGHT")
+        assert sorted(zip(df["code"].to_list(), df["numeric_value"].to_list())) == [
+            ("PRE//kg//POST", 60.0),
+            ("PRE//kg//POST", 80.0),
+            ("m", 1.5),
+            ("m", 2.0),
+        ]
+
+    def test_repeated_dataset_appends_part_files(self, tmp_path: Path, extraction_config: Path, data_dir: Path) -> None:
+        """A second contribution to an event is written as a new part, not merged into the first."""
+        text = extraction_config.read_text()
+        extraction_config.write_text(text + f'    - name: testdb\n      version: "1.0"\n      path: {data_dir}\n')
+
+        project = run_extraction(tmp_path, extraction_config)
+
+        output = PartitionedParquet(
+            project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "vitals" / "CHART"
+        )
+        assert [part.name for part in output.parts] == ["part-00000.parquet", "part-00001.parquet"]
+        assert [pl.read_parquet(part).height for part in output.parts] == [4, 4]
+        assert output.num_rows == 8
+
+    def test_source_cache_is_reused_until_source_changes(
+        self, tmp_path: Path, extraction_config: Path, data_dir: Path
+    ) -> None:
+        project = run_extraction(tmp_path, extraction_config)
+        output = project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "vitals" / "CHART"
+
+        # Tamper with the cached vitals table: a rerun must read it instead of the CSV.
+        entry = project.source_cache.get(data_dir / "vitals.csv", {"valueuom": pl.String})
+        assert entry is not None
+        pl.read_parquet(entry).with_columns(pl.col("valueuom").str.to_uppercase()).write_parquet(entry)
+
+        text = extraction_config.read_text()
+        extraction_config.write_text(text.replace("config:\n", "overwrite: true\n\nconfig:\n", 1))
+        load_extracation_config(tmp_path / "config" / "testdb" / "1.0" / "tables")
+        ExtractionStep.load(project, extraction_config).run()
+        assert "CHART//220045//Heart Rate//BPM" in read_event(output)["code"].to_list()
+
+        # A modified source invalidates its entry.
+        with open(data_dir / "vitals.csv", "a") as f:
+            f.write("3,300,2024-01-03 10:00:00,220045,90,bpm,\n")
+        load_extracation_config(tmp_path / "config" / "testdb" / "1.0" / "tables")
+        ExtractionStep.load(project, extraction_config).run()
+        assert sorted(read_event(output)["subject_id"].unique().to_list()) == [1, 2, 3]
+
+    def test_source_cache_can_be_disabled(self, tmp_path: Path, extraction_config: Path) -> None:
+        text = extraction_config.read_text()
+        extraction_config.write_text(text.replace("config:\n", "config:\n  settings:\n    source_cache: false\n", 1))
+
+        project = run_extraction(tmp_path, extraction_config)
+
+        assert not (project.cache_path / "sources").exists()
+
+    def test_persistence_writes_tables_once(self, tmp_path: Path, extraction_config: Path) -> None:
+        project = OpenICUProject(tmp_path / "project")
+        load_extracation_config(tmp_path / "config" / "testdb" / "1.0" / "tables")
+        PersistenceStep.load(project, extraction_config).run()
+
+        persisted = project.workspace_path / "persistence" / "testdb" / "1.0" / "vitals.parquet"
+        assert pl.read_parquet(persisted).height == 4
+        # the cache is filled by extraction, not by persistence
+        assert not list((project.cache_path / "sources").rglob("*.parquet"))
+
+    @pytest.mark.parametrize(("join_cache_size", "expected_scans"), [("1MB", 1), (0, 2)])
+    def test_join_table_cache_reuses_parsed_join_tables(
+        self,
+        tmp_path: Path,
+        extraction_config: Path,
+        table_config_dir: Path,
+        join_cache_size: str | int,
+        expected_scans: int,
+    ) -> None:
+        """Tables joining the same items table reuse it within a run; the cache is emptied afterwards."""
+        join_table_cache.clear()
+        with count_scans() as scans:
+            vitals = table_config_dir / "vitals.yml"
+            vitals.write_text(
+                vitals.read_text().replace(
+                    "    both_on:\n", "    callbacks:\n      - count_scans(itemid)\n    both_on:\n", 1
+                )
+            )
+            (table_config_dir / "more_vitals.yml").write_text(vitals.read_text())
+
+            text = extraction_config.read_text()
+            extraction_config.write_text(
+                text.replace("config:\n", f"config:\n  settings:\n    join_cache_size: {join_cache_size}\n", 1)
+            )
+            project = run_extraction(tmp_path, extraction_config)
+
+        assert scans == [2] * expected_scans
+        assert len(join_table_cache) == 0
+        output = project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "more_vitals" / "CHART"
+        assert "CHART//220045//Heart Rate//bpm" in read_event(output)["code"].to_list()
+
+    def test_parallel_extraction_matches_sequential(self, tmp_path: Path, extraction_config: Path) -> None:
+        sequential_project = run_extraction(tmp_path, extraction_config)
+
+        text = extraction_config.read_text()
+        extraction_config.write_text(
+            text.replace("config:\n", "config:\n  execution:\n    jobs: 2\n    memory_budget: 1MB\n", 1)
+        )
+        parallel_project = OpenICUProject(tmp_path / "parallel")
+        ExtractionStep.load(parallel_project, extraction_config).run()
+
+        sequential_path = sequential_project.datasets_path / "extraction" / "data"
+        parallel_path = parallel_project.datasets_path / "extraction" / "data"
+        files = sorted(p.relative_to(sequential_path) for p in sequential_path.rglob("*.parquet"))
+
+        assert files == sorted(p.relative_to(parallel_path) for p in parallel_path.rglob("*.parquet"))
+        for relative in files:
+            expected = pl.read_parquet(sequential_path / relative).sort(pl.all())
+            assert pl.read_parquet(parallel_path / relative).sort(pl.all()).equals(expected)
+
+
+class TestIncrementalExtraction:
+    @staticmethod
+    def rerun(tmp_path: Path, project: OpenICUProject, extraction_config: Path) -> set[str]:
+        """Rerun the extraction and return the names of the tables whose parts were rewritten."""
+        workspace = project.workspace_path / "extraction"
+        before = {part: part.stat().st_mtime_ns for part in workspace.rglob("*.parquet")}
+
+        dataset_config_registry.clear()
+        load_extracation_config(tmp_path / "config" / "testdb" / "1.0" / "tables")
+        ExtractionStep.load(project, extraction_config).run()
+
+        after = {part: part.stat().st_mtime_ns for part in workspace.rglob("*.parquet")}
+        return {part.relative_to(workspace).parts[2] for part in after if before.get(part) != after[part]}
+
+    def test_unchanged_tables_are_skipped(self, tmp_path: Path, extraction_config: Path) -> None:
+        project = run_extraction(tmp_path, extraction_config)
+        assert self.rerun(tmp_path, project, extraction_config) == set()
+
+    def test_changed_source_is_extracted_again(self, tmp_path: Path, extraction_config: Path, data_dir: Path) -> None:
+        project = run_extraction(tmp_path, extraction_config)
+        with open(data_dir / "measurements.csv", "a") as f:
+            f.write("3,300,2024-01-03 10:00:00,70,1.7\n")
+
+        assert self.rerun(tmp_path, project, extraction_config) == {"measurements"}
+        output = project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "measurements" / "WEIGHT"
+        # the previous output is replaced, not appended to
+        assert sorted(read_event(output)["subject_id"].to_list()) == [1, 2, 3]
+
+    def test_changed_table_config_is_extracted_again(
+        self, tmp_path: Path, extraction_config: Path, table_config_dir: Path
+    ) -> None:
+        project = run_extraction(tmp_path, extraction_config)
+        config = table_config_dir / "measurements.yml"
+        config.write_text(config.read_text().replace("const(kg)", "const(KG)"))
+
+        assert self.rerun(tmp_path, project, extraction_config) == {"measurements"}
+        output = project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "measurements" / "WEIGHT"
+        assert all("//KG//" in code for code in read_event(output)["code"].to_list())
+
+    @pytest.mark.parametrize(("hash_sources", "expected"), [(False, set()), (True, {"measurements"})])
+    def test_hash_sources_detects_content_changes(
+        self, tmp_path: Path, extraction_config: Path, data_dir: Path, hash_sources: bool, expected: set[str]
+    ) -> None:
+        text = extraction_config.read_text()
+        extraction_config.write_text(
+            text.replace("config:\n", f"config:\n  settings:\n    hash_sources: {str(hash_sources).lower()}\n", 1)
+        )
+        project = run_extraction(tmp_path, extraction_config)
+
+        # same size and modification time, different content
+        source = data_dir / "measurements.csv"
+        stat = source.stat()
+        source.write_text(source.read_text().replace(",80,", ",81,"))
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert self.rerun(tmp_path, project, extraction_config) == expected
+        output = project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "measurements" / "WEIGHT"
+        assert (81.0 in read_event(output)["numeric_value"].to_list()) == hash_sources
+
+
+class TestCohort:
+    @staticmethod
+    def set_cohort(extraction_config: Path, cohort: str) -> None:
+        text = extraction_config.read_text()
+        extraction_config.write_text(text.replace("config:\n", f"cohort:\n{cohort}\nconfig:\n", 1))
+
+    def test_cohort_restricts_extracted_subjects(self, tmp_path: Path, extraction_config: Path) -> None:
+        self.set_cohort(extraction_config, "  subjects:\n    - 1")
+        project = run_extraction(tmp_path, extraction_config)
+
+        output = project.datasets_path / "extraction" / "data" / "testdb" / "1.0"
+        assert read_event(output / "vitals" / "CHART")["subject_id"].to_list() == [1, 1]
+        assert read_event(output / "measurements" / "WEIGHT")["subject_id"].to_list() == [1]
+
+    def test_cohort_is_pushed_into_table_read(self, tmp_path: Path, extraction_config: Path, data_dir: Path) -> None:
+        cohort_file = tmp_path / "cohort.parquet"
+        pl.DataFrame({"subject_id": [2]}).write_parquet(cohort_file)
+        self.set_cohort(extraction_config, f"  path: {cohort_file}")
+
+        load_extracation_config(tmp_path / "config" / "testdb" / "1.0" / "tables")
+        step = ExtractionStep.load(OpenICUProject(tmp_path / "project"), extraction_config)
+        (vitals,) = [table for table in dataset_config_registry.filter("testdb", "1.0") if table.name == "vitals"]
+
+        df = step._read_table(vitals, data_dir).lf.collect()
+        assert df["subject_id"].to_list() == [2, 2]
+
+    def test_changed_cohort_is_extracted_again(self, tmp_path: Path, extraction_config: Path) -> None:
+        project = run_extraction(tmp_path, extraction_config)
+        self.set_cohort(extraction_config, "  subjects:\n    - 2")
+
+        assert TestIncrementalExtraction.rerun(tmp_path, project, extraction_config) == {"vitals", "measurements"}
+        output = project.datasets_path / "extraction" / "data" / "testdb" / "1.0" / "measurements" / "WEIGHT"
+        assert read_event(output)["subject_id"].to_list() == [2]
@@ -13,6 +13,7 @@ import polars as pl
 import pytest
 
 from open_icu import ConceptStep, ExtractionStep, OpenICUProject
+from open_icu.storage.partitioned import scan_source
 from tests.steps.conftest import load_concept_config, load_extracation_config
 
 
@@ -86,10 +87,10 @@ def project(tmp_path: Path, demo_dirs: None) -> OpenICUProject:
 
 class TestInheritedExtraction:
     def test_inherited_table_with_path_override(self, project: OpenICUProject) -> None:
-        output = project.datasets_path / "extraction" / "data" / "testdb-demo" / "1.0" / "vitals" / "CHART.parquet"
+        output = project.datasets_path / "extraction" / "data" / "testdb-demo" / "1.0" / "vitals" / "CHART"
         assert output.exists()
 
-        df = pl.read_parquet(output)
+        df = scan_source(output).collect()
         assert df.height == 4
         assert "CHART//220045//Heart Rate//bpm" in df["code"].to_list()
 
@@ -99,8 +100,8 @@ class TestInheritedExtraction:
 
     def test_base_dataset_is_unaffected(self, project: OpenICUProject) -> None:
         base_data = project.datasets_path / "extraction" / "data" / "testdb" / "1.0"
-        assert (base_data / "vitals" / "CHART.parquet").exists()
-        assert (base_data / "measurements" / "WEIGHT.parquet").exists()
+        assert (base_data / "vitals" / "CHART").exists()
+        assert (base_data / "measurements" / "WEIGHT").exists()
 
 
 class TestInheritedConcepts:
@@ -3,8 +3,11 @@
 from pathlib import Path
 
 import polars as pl
+import pyarrow.parquet as pq
+import pytest
 
 from open_icu.steps.sharding.config.step import ShardingStepConfig
+from open_icu.steps.sharding.reader import ShardReader
 from open_icu.steps.sharding.step import ShardingStep
 from open_icu.storage.project import OpenICUProject
 
@@ -46,6 +49,8 @@ config:
     assert config.config.concepts == []
     assert config.config.subjects == []
     assert config.config.subjects_per_shard == 1000
+    assert config.config.single_pass is True
+    assert config.config.balance_by == "subjects"
 
 
 def test_sharding_writes_subject_grouped_long_format_shards(tmp_path: Path) -> None:
@@ -166,3 +171,205 @@ config:
     shard = pl.read_parquet(output_file)
 
     assert shard["code"].unique().to_list() == ["heart_rate//bpm"]
+
+
+def run_sharding(tmp_path: Path, single_pass: bool) -> list[pl.DataFrame]:
+    project_path = tmp_path / f"project_{single_pass}"
+    config_file = tmp_path / "sharding.yml"
+    config_file.write_text(
+        f"""\
+name: Sharding
+version: 1.0.0
+overwrite: true
+
+config:
+  concept_step: Concept
+  subjects_per_shard: 2
+  single_pass: {str(single_pass).lower()}
+"""
+    )
+
+    with OpenICUProject(project_path) as project:
+        concept_dataset = project.add_dataset("concept")
+        write_concept_file(
+            concept_dataset.data_path / "heart_rate" / "1.0.0" / "testdb.parquet",
+            [5, 3, 1, 4, 2],
+            "heart_rate//bpm",
+        )
+        write_concept_file(
+            concept_dataset.data_path / "lactate" / "1.0.0" / "testdb.parquet",
+            [2, 5, 1],
+            "lactate//mmol/l",
+        )
+
+        ShardingStep.load(project, config_file).run()
+
+    data_path = project_path / "datasets" / "sharding" / "data"
+    assert not (data_path / "_buckets").exists()
+    return [pl.read_parquet(file) for file in sorted(data_path.glob("*.parquet"))]
+
+
+def test_single_pass_sharding_matches_per_shard_scans(tmp_path: Path) -> None:
+    single_pass = run_sharding(tmp_path, single_pass=True)
+    per_scan = run_sharding(tmp_path, single_pass=False)
+
+    assert len(single_pass) == 3
+    assert [shard["subject_id"].to_list() for shard in single_pass] == [[1, 1, 2, 2], [3, 4], [5, 5]]
+    for left, right in zip(single_pass, per_scan, strict=True):
+        assert left.equals(right)
+
+
+def test_single_pass_sharding_scans_concept_files_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    scan_core_columns = ShardingStep._scan_core_columns
+
+    def counting_scan(concept_files: list[Path]) -> pl.LazyFrame:
+        calls.append(concept_files)
+        return scan_core_columns(concept_files)
+
+    monkeypatch.setattr(ShardingStep, "_scan_core_columns", staticmethod(counting_scan))
+    run_sharding(tmp_path, single_pass=True)
+
+    assert len(calls) == 1
+
+
+def test_balanced_chunks_pack_subjects_by_row_count() -> None:
+    row_counts = {1: 100, 2: 10, 3: 10, 4: 60, 5: 30, 6: 40}
+
+    shards = ShardingStep._balanced_chunks(row_counts, rows_per_shard=100)
+
+    assert shards == [[1], [2, 3, 4], [5, 6]]
+    assert [sum(row_counts[subject_id] for subject_id in shard) for shard in shards] == [100, 80, 70]
+    assert ShardingStep._balanced_chunks(row_counts, rows_per_shard=1) == [[i] for i in [1, 4, 6, 5, 2, 3]]
+    assert ShardingStep._balanced_chunks({}, rows_per_shard=100) == []
+
+
+def test_sharding_balances_shards_by_rows(tmp_path: Path) -> None:
+    project_path = tmp_path / "project"
+    config_file = tmp_path / "sharding.yml"
+    config_file.write_text(
+        """\
+name: Sharding
+version: 1.0.0
+overwrite: true
+
+config:
+  concept_step: Concept
+  balance_by: rows
+  rows_per_shard: 4
+"""
+    )
+
+    with OpenICUProject(project_path) as project:
+        concept_dataset = project.add_dataset("concept")
+        write_concept_file(
+            concept_dataset.data_path / "heart_rate" / "1.0.0" / "testdb.parquet",
+            [1, 1, 1, 1, 2, 3, 4, 4],
+            "heart_rate//bpm",
+        )
+
+        ShardingStep.load(project, config_file).run()
+
+    output_files = sorted((project_path / "datasets" / "sharding" / "data").glob("*.parquet"))
+    assert [file.name for file in output_files] == ["shard_00000.parquet", "shard_00001.parquet"]
+    assert [pl.read_parquet(file)["subject_id"].to_list() for file in output_files] == [
+        [1, 1, 1, 1],
+        [2, 3, 4, 4],
+    ]
+
+
+@pytest.mark.parametrize("single_pass", [True, False])
+def test_parallel_sharding_is_deterministic(tmp_path: Path, single_pass: bool) -> None:
+    outputs = []
+    for jobs in [1, 2]:
+        project_path = tmp_path / f"project_{jobs}"
+        config_file = tmp_path / "sharding.yml"
+        config_file.write_text(
+            f"""\
+name: Sharding
+version: 1.0.0
+overwrite: true
+
+config:
+  concept_step: Concept
+  subjects_per_shard: 2
+  single_pass: {str(single_pass).lower()}
+  execution:
+    jobs: {jobs}
+"""
+        )
+
+        with OpenICUProject(project_path) as project:
+            concept_dataset = project.add_dataset("concept")
+            # Both files contribute rows with equal subject, time, and code to every shard.
+            for name in ["heart_rate", "heart_rate_copy"]:
+                write_concept_file(
+                    concept_dataset.data_path / name / "1.0.0" / "testdb.parquet",
+                    [4, 1, 3, 2, 5, 1, 3],
+                    "heart_rate//bpm",
+                )
+
+            ShardingStep.load(project, config_file).run()
+
+        output_files = sorted((project_path / "datasets" / "sharding" / "data").glob("*.parquet"))
+        outputs.append({file.name: file.read_bytes() for file in output_files})
+
+    assert list(outputs[0]) == ["shard_00000.parquet", "shard_00001.parquet", "shard_00002.parquet"]
+    assert outputs[0] == outputs[1]
+
+
+def test_sharding_writes_subject_index_for_random_access(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    project_path = tmp_path / "project"
+    config_file = tmp_path / "sharding.yml"
+    config_file.write_text(
+        """\
+name: Sharding
+version: 1.0.0
+overwrite: true
+
+config:
+  concept_step: Concept
+  subjects_per_shard: 3
+  row_group_size: 3
+"""
+    )
+
+    with OpenICUProject(project_path) as project:
+        concept_dataset = project.add_dataset("concept")
+        write_concept_file(
+            concept_dataset.data_path / "heart_rate" / "1.0.0" / "testdb.parquet",
+            [1, 2, 2, 3, 3, 3, 3, 4, 5],
+            "heart_rate//bpm",
+        )
+
+        ShardingStep.load(project, config_file).run()
+        reader = ShardReader(project.datasets["sharding"])
+
+    shard_0 = project_path / "datasets" / "sharding" / "data" / "shard_00000.parquet"
+    metadata = pq.read_metadata(shard_0)
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [3, 3, 1]
+
+    index = reader.index
+    assert index["subject_id"].to_list() == [1, 2, 3, 4, 5]
+    assert index["shard"].to_list() == ["shard_00000.parquet"] * 3 + ["shard_00001.parquet"] * 2
+    # subject 3 spans the second and third row group of shard 0
+    assert index["row_group_start"].to_list() == [0, 0, 1, 0, 0]
+    assert index["row_group_end"].to_list() == [1, 1, 3, 1, 1]
+
+    read_row_groups = []
+    read = pq.ParquetFile.read_row_groups
+
+    def recording_read(self: pq.ParquetFile, row_groups, *args, **kwargs):
+        read_row_groups.append(list(row_groups))
+        return read(self, row_groups, *args, **kwargs)
+
+    monkeypatch.setattr(pq.ParquetFile, "read_row_groups", recording_read)
+
+    subject = reader.read_subject(3)
+    assert subject["subject_id"].to_list() == [3, 3, 3, 3]
+    assert subject.columns == ["subject_id", "time", "code", "numeric_value", "text_value"]
+    assert reader.read_subject(2, columns=["numeric_value"]).to_dict(as_series=False) == {"numeric_value": [2.0, 2.0]}
+    assert read_row_groups == [[1, 2], [0]]
+
+    with pytest.raises(KeyError):
+        reader.read_subject(6)
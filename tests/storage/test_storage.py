@@ -7,7 +7,9 @@ import polars as pl
 import pytest
 
 from open_icu.storage.base import FileStorage
+from open_icu.storage.cache import SourceCache
 from open_icu.storage.meds import MEDSDataset
+from open_icu.storage.partitioned import PartitionedParquet, find_sources, scan_source
 from open_icu.storage.project import OpenICUProject
 from open_icu.storage.workspace import WorkspaceDir
 
@@ -50,6 +52,93 @@ class TestWorkspaceDir:
 
         assert workspace.content == [nested / "data.parquet"]
 
+    def test_content_lists_committed_parts_and_manifest(self, tmp_path: Path) -> None:
+        workspace = WorkspaceDir(tmp_path / "ws")
+        dataset = PartitionedParquet(workspace.path / "event")
+        part = dataset.new_part()
+        pl.DataFrame({"x": [1]}).write_parquet(part)
+        dataset.commit(part)
+        pl.DataFrame({"x": [2]}).write_parquet(dataset.new_part())  # not committed
+
+        assert workspace.content == [dataset.manifest_path, part]
+
+
+class TestPartitionedParquet:
+    def test_append_writes_new_parts(self, tmp_path: Path) -> None:
+        dataset = PartitionedParquet(tmp_path / "event")
+        assert not dataset.exists()
+
+        for values in [[1, 2], [3]]:
+            part = dataset.new_part()
+            pl.DataFrame({"x": values}).write_parquet(part)
+            dataset.commit(part)
+
+        assert [part.name for part in dataset.parts] == ["part-00000.parquet", "part-00001.parquet"]
+        assert dataset.num_rows == 3
+        assert sorted(dataset.scan().collect()["x"].to_list()) == [1, 2, 3]
+
+    def test_uncommitted_parts_are_ignored(self, tmp_path: Path) -> None:
+        dataset = PartitionedParquet(tmp_path / "event")
+        part = dataset.new_part()
+        pl.DataFrame({"x": [1]}).write_parquet(part)
+        dataset.commit(part)
+        pl.DataFrame({"x": [2]}).write_parquet(dataset.new_part())
+
+        assert scan_source(dataset.path).collect()["x"].to_list() == [1]
+        # the interrupted part is overwritten by the next append
+        assert dataset.new_part().name == "part-00001.parquet"
+
+    def test_scan_without_parts_raises(self, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            PartitionedParquet(tmp_path / "event").scan()
+
+    def test_find_sources(self, tmp_path: Path) -> None:
+        dataset = PartitionedParquet(tmp_path / "table" / "EVENT")
+        part = dataset.new_part()
+        pl.DataFrame({"x": [1]}).write_parquet(part)
+        dataset.commit(part)
+        pl.DataFrame({"x": [2]}).write_parquet(tmp_path / "table" / "OTHER.parquet")
+
+        assert find_sources(tmp_path) == [dataset.path, tmp_path / "table" / "OTHER.parquet"]
+
+
+class TestSourceCache:
+    def test_miss_then_hit(self, tmp_path: Path) -> None:
+        source = tmp_path / "table.csv"
+        source.write_text("a,b,c\n1,x,2.5\n2,y,3.5\n")
+        cache = SourceCache(tmp_path / "cache")
+        dtypes = {"a": pl.Int64, "b": pl.String}
+
+        assert cache.get(source, dtypes) is None
+        df = cache.scan_csv(source, dtypes).collect()
+
+        assert df.schema == pl.Schema(dtypes)
+        assert df["a"].to_list() == [1, 2]
+        assert cache.get(source, dtypes) is not None
+
+    def test_superset_entry_is_a_hit(self, tmp_path: Path) -> None:
+        source = tmp_path / "table.csv"
+        source.write_text("a,b,c\n1,x,2.5\n")
+        cache = SourceCache(tmp_path / "cache")
+        entry = cache.put(source, {"a": pl.Int64, "b": pl.String, "c": pl.Float64})
+
+        assert cache.get(source, {"c": pl.Float64, "a": pl.Int64}) == entry
+        assert cache.scan_csv(source, {"c": pl.Float64}).collect().columns == ["c"]
+        # a different dtype for a cached column is a miss
+        assert cache.get(source, {"a": pl.Float64}) is None
+
+    def test_modified_source_invalidates_entries(self, tmp_path: Path) -> None:
+        source = tmp_path / "table.csv"
+        source.write_text("a\n1\n")
+        cache = SourceCache(tmp_path / "cache")
+        stale = cache.put(source, {"a": pl.Int64})
+
+        source.write_text("a\n1\n2\n")
+
+        assert cache.get(source, {"a": pl.Int64}) is None
+        assert cache.scan_csv(source, {"a": pl.Int64}).collect()["a"].to_list() == [1, 2]
+        assert not stale.exists()
+
 
 class TestOpenICUProject:
     def test_context_manager_and_paths(self, tmp_path: Path) -> None:
@@ -128,6 +217,19 @@ class TestMEDSDataset:
         assert sorted(codes["code"].to_list()) == ["a//1", "b//2", "c//3"]
         assert codes["description"].null_count() == 3
 
+    def test_write_codes_reads_partitioned_datasets(self, tmp_path: Path) -> None:
+        dataset = MEDSDataset(tmp_path / "ds")
+        event = PartitionedParquet(dataset.data_path / "table" / "EVENT")
+        for codes in [["a//1"], ["b//2", "a//1"]]:
+            part = event.new_part()
+            pl.DataFrame({"code": codes}).write_parquet(part)
+            event.commit(part)
+
+        dataset.write_codes()
+
+        codes = pl.read_parquet(dataset.metadata_path / "codes.parquet")
+        assert sorted(codes["code"].to_list()) == ["a//1", "b//2"]
+
     def test_write_codes_with_no_data(self, tmp_path: Path) -> None:
         dataset = MEDSDataset(tmp_path / "ds")
         dataset.write_codes()
@@ -18,6 +18,7 @@ from open_icu.callbacks.interpreter import ExprInterpreter
 from open_icu.config.inheritance import resolve_effective_configs
 from open_icu.steps.concept.config.concept import ConceptConfig
 from open_icu.steps.concept.config.derived import DerivedDatasetConceptConfig
+from open_icu.steps.concept.config.mapping import MappingIndex
 from open_icu.steps.concept.config.simple import SimpleDatasetConceptConfig
 from open_icu.steps.extraction.config.table import BaseTableConfig, TableConfig
 
@@ -33,6 +34,8 @@ CONCEPT_FILES = sorted(CONFIG_ROOT.glob("concepts/*/*.yml"))
 DATASET_CONCEPT_DIRS = [
     d / "mappings" for d in VERSION_DIRS if (d / "mappings").is_dir() or (d / "extends.yml").is_file()
 ]
+# Resolved once and shared by all concept tests.
+MAPPING_INDEXES = [MappingIndex(d) for d in DATASET_CONCEPT_DIRS]
 
 
 def relative_id(path: Path) -> str:
@@ -140,7 +143,7 @@ def test_table_config_expressions_are_valid(subdir: Path, name: str) -> None:
 
 @pytest.mark.parametrize("concept_file", CONCEPT_FILES, ids=relative_id)
 def test_concept_parses_with_all_dataset_mappings(concept_file: Path) -> None:
-    concept = ConceptConfig.load(concept_file, dataset_paths=DATASET_CONCEPT_DIRS)
+    concept = ConceptConfig.load(concept_file, dataset_paths=MAPPING_INDEXES)
 
     assert concept.name == concept_file.stem, (
         f"{relative_id(concept_file)}: file name and concept name differ ({concept.name})"
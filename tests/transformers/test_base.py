@@ -24,7 +24,7 @@ DATASET = "testdb"
 
 
 class Step:
-    """Minimal stand-in for the concept step: a registry and an output root."""
+    """Minimal stand-in for the concept step: a registry, an output root and no cohort."""
 
     def __init__(self, root: Path, *concepts: ConceptConfig) -> None:
         self._registry = {concept.identifier: concept for concept in concepts}
@@ -33,6 +33,9 @@ class Step:
     def concept_output_dir(self, concept: ConceptConfig) -> Path:
         return self._root / concept.name / concept.version
 
+    def filter_cohort(self, lf: pl.LazyFrame) -> pl.LazyFrame:
+        return lf
+
 
 class Recording(BaseConceptTransformer):
     """Records what was resolved and passes the first dependency through."""